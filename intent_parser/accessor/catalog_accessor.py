@@ -1,106 +1,270 @@
+from concurrent.futures import ThreadPoolExecutor
+import intent_parser.constants.intent_parser_constants as intent_parser_constants
 import json
+import logging
+import os
+import tempfile
+import threading
+import time
 import urllib.request
 
+CHALLENGE_PROBLEM_IDS = 'challenge_problem_id'
+CONTROL_TYPES = 'control_type'
+FILE_TYPES = 'filetype_label'
+FLUID_UNITS = 'fluid_unit'
+LAB_IDS = 'lab'
+MEASUREMENT_TYPES = 'measurement_type'
+TEMPERATURE_UNITS = 'temperature_unit'
+TIME_UNITS = 'time_unit'
+VOLUME_UNITS = 'volume_unit'
+
+CATALOG_SCHEMAS = [CHALLENGE_PROBLEM_IDS,
+                   CONTROL_TYPES,
+                   FILE_TYPES,
+                   FLUID_UNITS,
+                   LAB_IDS,
+                   MEASUREMENT_TYPES,
+                   TEMPERATURE_UNITS,
+                   TIME_UNITS,
+                   VOLUME_UNITS]
+
+class CatalogRegistry(object):
+    """
+    A process-wide cache of the enums published in sd2e's catalog schemas.
+    Enums are kept in a local file so that a restarted server does not wait on the catalog
+    and are fetched again in the background once they are older than ttl seconds.
+    """
+    _CATALOG_URL = 'https://schema.catalog.sd2e.org/schemas/%s.json'
+    _LOGGER = logging.getLogger('intent_parser_catalog_registry')
+
+    def __init__(self, cache_file=None, ttl=intent_parser_constants.CATALOG_CACHE_TTL_SECONDS):
+        if cache_file is None:
+            cache_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'catalog_schemas.json')
+        self._cache_file = cache_file
+        self._ttl = ttl
+        self._enums = {}
+        # frozensets of each enum, built once per fetch and shared by every table checking membership
+        self._enum_sets = {}
+        self._lowercase_enum_sets = {}
+        self._fetch_times = {}
+        self._loaded_cache_file = False
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._shutdown = False
+        self._event = threading.Event()
+        self._refresh_thread = None
+
+    def start_synchronizing_catalog(self):
+        """
+        Load enums from the cache file, fetch the ones that are missing or expired
+        concurrently, and keep refreshing them in the background.
+        Enums that can not be fetched now are fetched again when they are first requested.
+        """
+        self._load_cache_file()
+        stale_schemas = [schema for schema in CATALOG_SCHEMAS if self._is_expired(schema)]
+        try:
+            self._fetch_schemas(stale_schemas)
+        except Exception as err:
+            self._LOGGER.warning('Unable to fetch catalog schemas at startup: %s' % err)
+        self._shutdown = False
+        self._event.clear()
+        self._refresh_thread = threading.Thread(target=self._periodically_fetch_schemas)
+        self._refresh_thread.daemon = True
+        self._refresh_thread.start()
+
+    def stop_synchronizing_catalog(self):
+        self._shutdown = True
+        self._event.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join()
+            self._refresh_thread = None
+
+    def get_enum(self, schema):
+        """
+        Returns:
+            A tuple of the values in schema's enum, in catalog order.
+        """
+        self._ensure_schema(schema)
+        return self._enums[schema]
+
+    def get_enum_set(self, schema):
+        """
+        Returns:
+            A frozenset of the values in schema's enum. The same frozenset is returned until the enum is fetched again.
+        """
+        self._ensure_schema(schema)
+        return self._enum_sets[schema]
+
+    def get_lowercase_enum_set(self, schema):
+        """
+        Returns:
+            A frozenset of the lowercased values in schema's enum. The same frozenset is returned until the enum is fetched again.
+        """
+        self._ensure_schema(schema)
+        return self._lowercase_enum_sets[schema]
+
+    def _ensure_schema(self, schema):
+        if not self._loaded_cache_file:
+            self._load_cache_file()
+        if schema not in self._enums:
+            self._fetch_schemas([schema])
+        elif self._is_expired(schema):
+            self._refresh_in_background(schema)
+
+    def _is_expired(self, schema):
+        if schema not in self._fetch_times:
+            return True
+        return time.time() - self._fetch_times[schema] >= self._ttl
+
+    def _refresh_in_background(self, schema):
+        self._lock.acquire()
+        try:
+            if schema in self._refreshing:
+                return
+            self._refreshing.add(schema)
+        finally:
+            self._lock.release()
+        thread = threading.Thread(target=self._refresh_schema, args=(schema,))
+        thread.daemon = True
+        thread.start()
+
+    def _refresh_schema(self, schema):
+        try:
+            self._fetch_schemas([schema])
+        except Exception as err:
+            self._LOGGER.warning('Unable to refresh %s from catalog: %s' % (schema, err))
+        finally:
+            self._lock.acquire()
+            self._refreshing.discard(schema)
+            self._lock.release()
+
+    def _fetch_schemas(self, schemas):
+        if not schemas:
+            return
+        with ThreadPoolExecutor(max_workers=len(schemas)) as executor:
+            futures = {schema: executor.submit(self._fetch_from_catalog, self._CATALOG_URL % schema) for schema in schemas}
+        errors = []
+        fetched = {}
+        for schema, future in futures.items():
+            try:
+                fetched[schema] = list(future.result()['enum'])
+            except Exception as err:
+                errors.append((schema, err))
+
+        fetch_time = time.time()
+        self._lock.acquire()
+        try:
+            for schema, enum in fetched.items():
+                self._set_enum(schema, enum, fetch_time)
+        finally:
+            self._lock.release()
+        if fetched:
+            self._write_cache_file()
+
+        for schema, err in errors:
+            if schema in self._enums:
+                self._LOGGER.warning('Unable to fetch %s from catalog. Using cached values: %s' % (schema, err))
+            else:
+                raise err
+
+    def _set_enum(self, schema, enum, fetch_time):
+        self._enums[schema] = tuple(enum)
+        self._enum_sets[schema] = frozenset(enum)
+        self._lowercase_enum_sets[schema] = frozenset(value.lower() for value in enum)
+        self._fetch_times[schema] = fetch_time
+
+    def _load_cache_file(self):
+        self._loaded_cache_file = True
+        if not os.path.exists(self._cache_file):
+            return
+        try:
+            with open(self._cache_file, 'r') as file:
+                cached_schemas = json.load(file)
+        except (OSError, ValueError) as err:
+            self._LOGGER.warning('Unable to read catalog cache from %s: %s' % (self._cache_file, err))
+            return
+
+        self._lock.acquire()
+        try:
+            for schema, cached_schema in cached_schemas.items():
+                if schema in CATALOG_SCHEMAS and schema not in self._enums:
+                    self._set_enum(schema, cached_schema['enum'], cached_schema['fetch_time'])
+        finally:
+            self._lock.release()
+
+    def _write_cache_file(self):
+        self._lock.acquire()
+        cached_schemas = {schema: {'enum': list(enum), 'fetch_time': self._fetch_times[schema]}
+                          for schema, enum in self._enums.items()}
+        self._lock.release()
+        try:
+            file_descriptor, temp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.realpath(self._cache_file)))
+            with os.fdopen(file_descriptor, 'w') as file:
+                json.dump(cached_schemas, file)
+            os.replace(temp_path, self._cache_file)
+        except OSError as err:
+            self._LOGGER.warning('Unable to write catalog cache to %s: %s' % (self._cache_file, err))
+
+    def _periodically_fetch_schemas(self):
+        while True:
+            self._event.wait(self._ttl)
+            if self._shutdown:
+                return
+            try:
+                self._fetch_schemas(CATALOG_SCHEMAS)
+            except Exception as err:
+                self._LOGGER.warning('Unable to refresh catalog schemas: %s' % err)
+
+    def _fetch_from_catalog(self, url):
+        response = urllib.request.urlopen(url, timeout=60)
+        return json.loads(response.read().decode('utf-8'))
+
+CATALOG_REGISTRY = CatalogRegistry()
+
 class CatalogAccessor(object):
     """
     An accessor to get information from sd2e's catalog.
+    Values are served from a CatalogRegistry shared by every accessor in the process.
     """
-    _CHALLENGE_PROBLEM_URL = 'https://schema.catalog.sd2e.org/schemas/challenge_problem_id.json'
-    _CONTROL_TYPE_URL = 'https://schema.catalog.sd2e.org/schemas/control_type.json'
-    _FILE_TYPES_URL = 'https://schema.catalog.sd2e.org/schemas/filetype_label.json'
-    _FLUID_UNITS_URL = 'https://schema.catalog.sd2e.org/schemas/fluid_unit.json'
-    _MEASUREMENT_TYPES_URL = 'https://schema.catalog.sd2e.org/schemas/measurement_type.json'
-    _TEMPERATURE_UNITS_URL = 'https://schema.catalog.sd2e.org/schemas/temperature_unit.json'
-    _TIME_UNITS_URL = 'https://schema.catalog.sd2e.org/schemas/time_unit.json'
-    _VOLUME_UNITS_URL = 'https://schema.catalog.sd2e.org/schemas/volume_unit.json'
-    _LAB_IDS_URL = 'https://schema.catalog.sd2e.org/schemas/lab.json'
-    
-    def __init__(self):
-        self.challenge_problem_ids = None
-        self.control_type = None
-        self.file_types = None
-        self.fluid_units = None
-        self.lab_ids = None
-        self.measurement_types = None
-        self.temperature_units = None
-        self.time_units = None
-        self.volume_units = None
-    
+
+    def __init__(self, registry=None):
+        self._registry = CATALOG_REGISTRY if registry is None else registry
+
     def get_challenge_problem_ids(self):
-        if self.challenge_problem_ids is None:
-            data = self._fetch_from_catalog(self._CHALLENGE_PROBLEM_URL)
-            self.challenge_problem_ids = []
-            for d in data['enum']:
-                self.challenge_problem_ids.append(d)
-        return self.challenge_problem_ids
-    
+        return self._registry.get_enum(CHALLENGE_PROBLEM_IDS)
+
     def get_control_type(self):
-        if self.control_type is None:
-            data = self._fetch_from_catalog(self._CONTROL_TYPE_URL)
-            self.control_types = []
-            for d in data['enum']:
-                self.control_types.append(d)
-        return self.control_types
-    
+        return self._registry.get_enum(CONTROL_TYPES)
+
+    def get_control_type_set(self):
+        return self._registry.get_enum_set(CONTROL_TYPES)
+
     def get_file_types(self):
-        if self.file_types is None:
-            data = self._fetch_from_catalog(self._FILE_TYPES_URL)
-            self.file_types = []
-            for d in data['enum']:
-                self.file_types.append(d)
-        return self.file_types 
-    
+        return self._registry.get_enum(FILE_TYPES)
+
+    def get_file_type_set(self):
+        return self._registry.get_enum_set(FILE_TYPES)
+
     def get_fluid_units(self):
-        if self.fluid_units is None:
-            data = self._fetch_from_catalog(self._FLUID_UNITS_URL)
-            self.fluid_units = []
-            for d in data['enum']:
-                self.fluid_units.append(d)
-        return self.fluid_units
-    
+        return self._registry.get_enum(FLUID_UNITS)
+
     def get_lab_ids(self):
-        if self.lab_ids is None:
-            data = self._fetch_from_catalog(self._LAB_IDS_URL)
-            self.lab_ids = []
-            for d in data['enum']:
-                self.lab_ids.append(d)
-            self.lab_ids.sort()
-        return self.lab_ids
-    
+        return tuple(sorted(self._registry.get_enum(LAB_IDS)))
+
+    def get_lowercase_lab_ids(self):
+        return self._registry.get_lowercase_enum_set(LAB_IDS)
+
     def get_measurement_types(self):
-        if self.measurement_types is None:
-            data = self._fetch_from_catalog(self._MEASUREMENT_TYPES_URL)
-            self.measurement_types = []
-            for d in data['enum']:
-                self.measurement_types.append(d)
-        return self.measurement_types
-    
+        return self._registry.get_enum(MEASUREMENT_TYPES)
+
+    def get_measurement_type_set(self):
+        return self._registry.get_enum_set(MEASUREMENT_TYPES)
+
     def get_temperature_units(self):
-        if self.temperature_units is None:
-            data = self._fetch_from_catalog(self._TEMPERATURE_UNITS_URL)
-            self.temperature_units = []
-            for d in data['enum']:
-                self.temperature_units.append(d)
-        return self.temperature_units
+        return self._registry.get_enum(TEMPERATURE_UNITS)
 
     def get_time_units(self):
-        if self.time_units is None:
-            data = self._fetch_from_catalog(self._TIME_UNITS_URL)
-            self.time_units = []
-            for d in data['enum']:
-                self.time_units.append(d)
-        return self.time_units
-    
-    def get_volume_units(self):
-        if self.volume_units is None:
-            data = self._fetch_from_catalog(self._VOLUME_UNITS_URL)
-            self.volume_units = []
-            for d in data['enum']:
-                self.volume_units.append(d)
-        return self.volume_units
-     
-    def _fetch_from_catalog(self, url):
-        response = urllib.request.urlopen(url,timeout=60)
-        return json.loads(response.read().decode('utf-8'))
+        return self._registry.get_enum(TIME_UNITS)
 
-        
\ No newline at end of file
+    def get_volume_units(self):
+        return self._registry.get_enum(VOLUME_UNITS)
@@ -0,0 +1,161 @@
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+from urllib.parse import urldefrag, urljoin
+import intent_parser.constants.intent_parser_constants as intent_parser_constants
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+
+try:
+    from referencing import Registry, Resource
+    from referencing.jsonschema import DRAFT7
+except ImportError:
+    # jsonschema releases before 4.18 resolve references with RefResolver
+    Registry = None
+    from jsonschema import RefResolver
+
+STRUCTURED_REQUEST_SCHEMA_URL = 'https://schema.catalog.sd2e.org/schemas/structured_request.json'
+
+class CatalogSchemaValidator(object):
+    """
+    Validates documents against a schema from sd2e's catalog without going to the network for each document.
+    The schema and every schema it references are kept as a bundle in a local file.
+    A validator is compiled once from the bundle and rebuilt only when the bundle file changes.
+    The bundle is fetched again in the background once it is older than ttl seconds.
+    """
+    _LOGGER = logging.getLogger('intent_parser_catalog_schema_validator')
+
+    def __init__(self, schema_url, bundle_file=None, ttl=intent_parser_constants.CATALOG_CACHE_TTL_SECONDS):
+        if bundle_file is None:
+            schema_name = os.path.splitext(os.path.basename(schema_url))[0]
+            bundle_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), '%s_bundle.json' % schema_name)
+        self._schema_url = schema_url
+        self._bundle_file = bundle_file
+        self._ttl = ttl
+        self._root_schema = {'$ref': schema_url}
+        self._bundle = None
+        self._bundle_modified_time = None
+        self._validator = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def validate(self, document, collect_all_errors=False):
+        """
+        Validate document against the schema.
+        Args:
+            document: a json object to validate.
+            collect_all_errors: report every error found in document instead of only the most relevant one.
+        Returns:
+            A list of jsonschema ValidationError. The list is empty when document is valid.
+        """
+        validator = self._get_validator()
+        if collect_all_errors:
+            return sorted(validator.iter_errors(document), key=lambda error: list(error.absolute_path))
+        error = best_match(validator.iter_errors(document))
+        if error is None:
+            return []
+        return [error]
+
+    def refresh_bundle(self):
+        """
+        Fetch the schema and the schemas it references from the catalog and replace the bundle file.
+        """
+        bundle = self._fetch_bundle()
+        self._write_bundle_file(bundle)
+
+    def _get_validator(self):
+        if not os.path.exists(self._bundle_file):
+            # fetch without holding the lock so that validations never wait on the catalog while holding it.
+            self.refresh_bundle()
+        self._lock.acquire()
+        try:
+            modified_time = os.path.getmtime(self._bundle_file)
+            if self._validator is None or modified_time != self._bundle_modified_time:
+                with open(self._bundle_file, 'r') as file:
+                    self._bundle = json.load(file)
+                self._bundle_modified_time = modified_time
+                self._validator = self._compile_validator()
+            bundle = self._bundle
+            validator = self._validator
+            start_refresh = time.time() - modified_time >= self._ttl and not self._refreshing
+            if start_refresh:
+                self._refreshing = True
+        finally:
+            self._lock.release()
+        if start_refresh:
+            thread = threading.Thread(target=self._refresh_bundle_in_background)
+            thread.daemon = True
+            thread.start()
+
+        if Registry is None:
+            # RefResolver keeps resolution state while validating so each validation gets its own.
+            return validator_for(self._root_schema)(self._root_schema,
+                                                    resolver=RefResolver(self._schema_url,
+                                                                         self._root_schema,
+                                                                         store=bundle))
+        return validator
+
+    def _compile_validator(self):
+        validator_class = validator_for(self._root_schema)
+        if Registry is None:
+            return validator_class
+        registry = Registry().with_resources([(url, Resource.from_contents(schema, default_specification=DRAFT7))
+                                              for url, schema in self._bundle.items()])
+        return validator_class(self._root_schema, registry=registry)
+
+    def _refresh_bundle_in_background(self):
+        try:
+            self.refresh_bundle()
+        except Exception as err:
+            self._LOGGER.warning('Unable to refresh %s from catalog: %s' % (self._schema_url, err))
+        finally:
+            self._lock.acquire()
+            self._refreshing = False
+            self._lock.release()
+
+    def _fetch_bundle(self):
+        bundle = {}
+        pending_urls = [self._schema_url]
+        while pending_urls:
+            url = pending_urls.pop()
+            if url in bundle:
+                continue
+            schema = self._fetch_from_catalog(url)
+            bundle[url] = schema
+            for ref in self._find_refs(schema):
+                ref_url, _ = urldefrag(urljoin(url, ref))
+                if ref_url and ref_url not in bundle:
+                    pending_urls.append(ref_url)
+        return bundle
+
+    def _find_refs(self, schema):
+        if isinstance(schema, dict):
+            for key, value in schema.items():
+                if key == '$ref' and isinstance(value, str):
+                    yield value
+                else:
+                    yield from self._find_refs(value)
+        elif isinstance(schema, list):
+            for value in schema:
+                yield from self._find_refs(value)
+
+    def _write_bundle_file(self, bundle):
+        file_descriptor, temp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.realpath(self._bundle_file)))
+        try:
+            with os.fdopen(file_descriptor, 'w') as file:
+                json.dump(bundle, file)
+            os.replace(temp_path, self._bundle_file)
+        except:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _fetch_from_catalog(self, url):
+        response = urllib.request.urlopen(url, timeout=60)
+        return json.loads(response.read().decode('utf-8'))
+
+STRUCTURED_REQUEST_VALIDATOR = CatalogSchemaValidator(STRUCTURED_REQUEST_SCHEMA_URL)
@@ -0,0 +1,117 @@
+import bisect
+import copy
+import heapq
+
+class DictionarySearchIndex(object):
+    """
+    An in-memory index over dictionary items that answers the same substring searches as findSimilar.sparql.
+    Terms are matched case insensitively against an item's title and display id.
+    Terms of at least NGRAM_SIZE characters are looked up in a trigram index and shorter terms in a sorted prefix index.
+    """
+
+    NGRAM_SIZE = 3
+
+    def __init__(self, items):
+        """
+        Args:
+            items: a list of (title, sbh_uri) pairs.
+        """
+        unique_items = {}
+        for title, sbh_uri in items:
+            if title and sbh_uri and (title, sbh_uri) not in unique_items:
+                unique_items[(title, sbh_uri)] = None
+        # keep items in the same order that findSimilar.sparql reports them.
+        self._items = sorted(unique_items.keys())
+        self._search_texts = [self._get_search_texts(item) for item in self._items]
+
+        self._ngram_postings = {}
+        self._prefixes = []
+        for item_index, search_texts in enumerate(self._search_texts):
+            item_ngrams = set()
+            for search_text in search_texts:
+                item_ngrams.update(search_text[index:index + self.NGRAM_SIZE] for index in range(len(search_text) - self.NGRAM_SIZE + 1))
+                # every suffix is a prefix of a substring so short terms can be found by prefix lookup.
+                self._prefixes.extend((search_text[index:index + self.NGRAM_SIZE - 1], item_index) for index in range(len(search_text)))
+            for ngram in item_ngrams:
+                self._ngram_postings.setdefault(ngram, []).append(item_index)
+        self._prefixes.sort()
+        # items added after the index was built, in sorted order. They are matched by scanning them.
+        self._added_items = []
+
+    def add_items(self, items):
+        """
+        Create an index that also holds items, without rebuilding this index.
+        Meant for the few entries added to the dictionary between two syncs.
+        Args:
+            items: a list of (title, sbh_uri) pairs.
+        """
+        search_index = copy.copy(self)
+        added_items = set(search_index._added_items)
+        for title, sbh_uri in items:
+            if title and sbh_uri and not self._has_item((title, sbh_uri)):
+                added_items.add((title, sbh_uri))
+        search_index._added_items = sorted(added_items)
+        return search_index
+
+    def search(self, term, offset, limit, filter_uri=None):
+        """
+        Find dictionary items with term in its title or display id.
+        Args:
+            term: text to search.
+            offset: index of the first matching item to return.
+            limit: maximum number of items to return.
+            filter_uri: leave out items with this uri.
+        Returns:
+            A list of matching items, each a dictionary with the item's title and target uri, and the number of matching items.
+        """
+        term = term.lower()
+        matching_items = [self._items[item_index] for item_index in self._find_matching_items(term)]
+        if self._added_items:
+            added_matches = [item for item in self._added_items
+                             if not term or any(term in search_text for search_text in self._get_search_texts(item))]
+            matching_items = list(heapq.merge(matching_items, added_matches))
+        if filter_uri is not None:
+            matching_items = [item for item in matching_items if filter_uri not in item[1]]
+        results = [{'title': title, 'target': sbh_uri} for title, sbh_uri in matching_items[offset:offset + limit]]
+        return results, len(matching_items)
+
+    def _has_item(self, item):
+        index = bisect.bisect_left(self._items, item)
+        return index < len(self._items) and self._items[index] == item
+
+    def _find_matching_items(self, term):
+        if not term:
+            return list(range(len(self._items)))
+
+        if len(term) < self.NGRAM_SIZE:
+            start = bisect.bisect_left(self._prefixes, (term,))
+            candidates = set()
+            for index in range(start, len(self._prefixes)):
+                prefix, item_index = self._prefixes[index]
+                if not prefix.startswith(term):
+                    break
+                candidates.add(item_index)
+            return sorted(candidates)
+
+        postings = []
+        for ngram in set(term[index:index + self.NGRAM_SIZE] for index in range(len(term) - self.NGRAM_SIZE + 1)):
+            if ngram not in self._ngram_postings:
+                return []
+            postings.append(self._ngram_postings[ngram])
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+        return [item_index for item_index in sorted(candidates)
+                if any(term in search_text for search_text in self._search_texts[item_index])]
+
+    def _get_search_texts(self, item):
+        title, sbh_uri = item
+        return title.lower(), self._get_display_id(sbh_uri).lower()
+
+    def _get_display_id(self, sbh_uri):
+        # SynBioHub uris end with <displayId>/<version>
+        parts = sbh_uri.rstrip('/').split('/')
+        if len(parts) >= 2:
+            return parts[-2]
+        return parts[-1]
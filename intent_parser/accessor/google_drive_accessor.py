@@ -22,6 +22,13 @@ class GoogleDriveV3Accessor(object):
                                                   fields='*',
                                                   body=body).execute()
 
+    def get_modified_time(self, file_id):
+        """
+        Get the last time a file was modified, as a RFC 3339 date-time string.
+        """
+        response = self._service.files().get(fileId=file_id, fields='modifiedTime').execute()
+        return response['modifiedTime']
+
     def get_documents_from_folder(self, folder_id):
         """
         Get all Google Docs from a Google Drive folder.
@@ -45,12 +45,34 @@ class GoogleSpreadsheetAccessor:
         time.sleep(len(requests) / self._REQUESTS_PER_SEC)
         return batch_request.execute()
 
+    def get_sheet_ids(self, spreadsheet_id):
+        """
+        Returns:
+            A dictionary where key represents a tab name and value represents the tab's sheet id.
+        """
+        response = self._sheet_service.spreadsheets().get(spreadsheetId=spreadsheet_id,
+                                                          fields='sheets.properties(sheetId,title)').execute()
+        return {sheet['properties']['title']: sheet['properties']['sheetId'] for sheet in response.get('sheets', [])}
+
     def get_tab_data(self, tab, spreadsheet_id):
         """
         Retrieve data from a spreadsheet tab.
         """
         return self._sheet_service.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range=tab).execute()
 
+    def get_tabs_data(self, tab_ranges, spreadsheet_id):
+        """
+        Retrieve data from several spreadsheet ranges in a single request.
+        Args:
+            tab_ranges: a list of ranges in A1 notation.
+            spreadsheet_id: id of spreadsheet.
+        Returns:
+            A list of value ranges, in the same order as tab_ranges.
+        """
+        response = self._sheet_service.spreadsheets().values().batchGet(spreadsheetId=spreadsheet_id,
+                                                                        ranges=tab_ranges).execute()
+        return response.get('valueRanges', [])
+
     def set_tab_data(self, tab, values, spreadsheet_id):
         """
         Write data to a spreadsheet tab.
@@ -1,7 +1,8 @@
 from datetime import datetime
 from http import HTTPStatus
 from intent_parser.accessor.sbh_accessor import SBHAccessor
-from intent_parser.intent_parser_exceptions import DictionaryMaintainerException, IntentParserException
+from intent_parser.accessor.sparql_result_cache import SparqlResultCache
+from intent_parser.intent_parser_exceptions import IntentParserException
 import intent_parser.constants.intent_parser_constants as intent_parser_constants
 import intent_parser.utils.intent_parser_utils as ip_utils
 import logging
@@ -30,6 +31,8 @@ class IntentParserSBH(object):
         self.sbh_uri_prefix = intent_parser_constants.SYNBIOHUB_DESIGN_COLLECTION_PREFIX
         self.sbh_collection_uri = intent_parser_constants.SYNBIOHUB_DESIGN_COLLECTION_URI
         self.sbh_collection_user = intent_parser_constants.SYNBIOHUB_DESIGN_COLLECTION_USER
+        self._query_cache = SparqlResultCache(intent_parser_constants.SPARQL_CACHE_MAX_ENTRIES,
+                                              intent_parser_constants.SPARQL_CACHE_TTL_SECONDS)
 
     def initialize_sbh(self):
         if self.sbh is None:
@@ -179,6 +182,8 @@ class IntentParserSBH(object):
             raise IntentParserException(message)
         sbh_merge_collection_flag = 2
         self.sbh.submit(sbh_document, self.sbh_collection_uri, sbh_merge_collection_flag)
+        # cached search results may be missing the new item
+        self._query_cache.invalidate()
         self.create_dictionary_entry(item_type,
                                      item_name,
                                      item_lab_ids,
@@ -234,6 +239,21 @@ class IntentParserSBH(object):
             raise IntentParserException('SBH response failed: %s' % str(response.status_code))
         return response.json()
 
+    def cached_query(self, cache_key, query):
+        """
+        Run a SPARQL query, reusing a recent response for the same cache_key.
+        Cached responses are dropped when a new item is submitted to SynBioHub.
+        """
+        response = self._query_cache.get(cache_key)
+        if response is None:
+            generation = self._query_cache.get_generation()
+            response = self.query(query)
+            self._query_cache.put(cache_key, response, generation=generation)
+        return response
+
+    def is_query_cached(self, cache_key):
+        return self._query_cache.get(cache_key) is not None
+
     def query_experiments(self, target_collection):
         """
         Search the target collection and return references to all Experiment objects
@@ -268,6 +288,56 @@ class IntentParserSBH(object):
 
         return experiments
     
+    def query_experiments_from_request(self, target_collection, request_url, page_size=1000):
+        """
+        Search the target collection for Experiment objects that were initiated by an experiment request.
+        Results are fetched page_size at a time so that large collections are streamed.
+
+        Parameters
+        ----------
+        target_collection : str
+            A URI for a target collection
+        request_url : str
+            A URL to the experiment request form on Google Docs
+        page_size : int
+            Number of results to fetch per query
+
+        Returns
+        -------
+        A generator of dictionaries with the uri, timestamp, title, request_url, and source of each Experiment.
+        """
+        offset = 0
+        while True:
+            query = """
+            PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+            PREFIX sbol: <http://sbols.org/v2#>
+            PREFIX sd2: <http://sd2e.org#>
+            PREFIX prov: <http://www.w3.org/ns/prov#>
+            PREFIX dcterms: <http://purl.org/dc/terms/>
+            SELECT DISTINCT ?entity ?timestamp ?title ?request_url ?source WHERE {
+                    <%s> sbol:member ?entity .
+                    ?entity rdf:type sbol:Experiment .
+                    ?entity dcterms:created ?timestamp .
+                    ?entity dcterms:title ?title .
+                    ?entity sd2:experimentReferenceURL ?request_url .
+                    ?entity prov:wasDerivedFrom ?source .
+                    FILTER(str(?request_url) = "%s")
+            }
+            ORDER BY ?entity ?source
+            LIMIT %d
+            OFFSET %d
+            """ % (target_collection, request_url, page_size, offset)
+            bindings = self.sbh.sparqlQuery(query).json()['results']['bindings']
+            for m in bindings:
+                yield {'uri': m['entity']['value'],
+                       'timestamp': m['timestamp']['value'],
+                       'title': m['title']['value'],
+                       'request_url': m['request_url']['value'],
+                       'source': m['source']['value']}
+            if len(bindings) < page_size:
+                return
+            offset += page_size
+
     def query_experiment_request(self, experiment_uri):
         """
         Return a URL to the experiment request form on Google Docs that initiated the Experiment
@@ -352,21 +422,7 @@ class IntentParserSBH(object):
                                 item_definition_uri):
         item_uri = document_url
         tab_name = self._sbol_dictionary.get_tab_name_from_item_type(item_type)
-        tab_data = self._sbol_dictionary.get_row_data(tab=tab_name)
-
-        # Get common names
-        item_map = {}
-        for row_data in tab_data:
-            common_name = row_data['Common Name']
-            if common_name is None or len(common_name) == 0:
-                continue
-            item_map[common_name] = row_data
-
-        if item_name in item_map:
-            raise DictionaryMaintainerException('"' + item_name + '" already exists in dictionary spreadsheet')
-
         dictionary_entry = {'tab': tab_name,
-                            'row': len(tab_data) + 3,
                             'Common Name': item_name,
                             'Type': item_type}
         if tab_name == 'Reagent':
@@ -380,5 +436,5 @@ class IntentParserSBH(object):
         dictionary_entry[item_lab_id_tag] = item_lab_ids
         dictionary_entry['SynBioHub URI'] = item_uri
 
-        self._sbol_dictionary.set_row_data(dictionary_entry)
+        self._sbol_dictionary.add_dictionary_entry(dictionary_entry)
 
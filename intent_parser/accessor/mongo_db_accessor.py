@@ -3,17 +3,26 @@ from intent_parser.table.experiment_status_table import ExperimentStatusTablePar
 import intent_parser.utils.intent_parser_utils as ip_util
 import intent_parser.constants.google_api_constants as google_constants
 import intent_parser.constants.ta4_db_constants as ta4_constants
+import hashlib
+import json
 import logging
 import os.path
 import pymongo
+import re
 
 class TA4DBAccessor(object):
     """
     Retrieve job pipeline status for an experiment from TA4 MongoDB.
+    Status queries select structured_requests by experiment_reference_url, which ensure_indexes indexes.
     """
 
     _LOGGER = logging.getLogger('intent_parser_mongo_db_accessor')
     _MONGODB_ACCESSOR = None
+    _STATUS_PROJECTION = {ta4_constants.EXPERIMENT_ID: True,
+                          ta4_constants.EXPERIMENT_REFERENCE_URL: True,
+                          ta4_constants.LAB: True,
+                          ta4_constants.PARENT_GIT_PATH: True,
+                          ta4_constants.STATUS: True}
 
     def __init__(self):
         pass
@@ -28,7 +37,18 @@ class TA4DBAccessor(object):
         credential_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'intent_parser_api_keys.json')
         credential = ip_util.load_json_file(credential_file)['dbURI']
         self.database = pymongo.MongoClient(credential).catalog_staging
+        try:
+            self.ensure_indexes()
+        except pymongo.errors.PyMongoError as err:
+            self._LOGGER.warning('Unable to create indexes for structured_requests: %s' % err)
 
+    def ensure_indexes(self):
+        """Create the indexes that status queries rely on.
+
+        get_experiment_status and get_experiment_statuses select structured_requests by
+        experiment_reference_url so that field is indexed. Creating an index that already exists is a no-op.
+        """
+        self.database.structured_requests.create_index([(ta4_constants.EXPERIMENT_REFERENCE_URL, pymongo.ASCENDING)])
 
     def get_experiment_status(self, doc_id, lab_name):
         """Retrieve of Status for an experiment.
@@ -39,26 +59,89 @@ class TA4DBAccessor(object):
         Returns:
             A dictionary. The key represents the experiment_id. The value represents a ExperimentStatusTableParser.
         """
-        experiment_ref = google_constants.GOOGLE_DOC_URL_PREFIX + doc_id
-        db_response = self.database.structured_requests.find({ta4_constants.EXPERIMENT_REFERENCE_URL: experiment_ref,
-                                                              '$where': 'this.derived_from.length > 0'})
+        return self._create_status_tables(self._find_statuses(doc_id, lab_name))
+
+    def get_experiment_status_and_fingerprint(self, doc_id, lab_name):
+        """Retrieve Status for an experiment along with a fingerprint of the status records it was created from.
+
+        Args:
+            doc_id: id of Google Doc.
+            lab_name: name of lab
+        Returns:
+            The dictionary returned by get_experiment_status and the fingerprint returned by get_experiment_status_fingerprint.
+        """
+        statuses = self._find_statuses(doc_id, lab_name)
+        return self._create_status_tables(statuses), self._create_status_fingerprint(statuses)
+
+    def get_experiment_status_fingerprint(self, doc_id, lab_name):
+        """Compute a fingerprint of the status records of an experiment.
+
+        The fingerprint changes whenever a record is derived, removed or has any of its fields changed,
+        whether or not the change has a newer last_updated.
+        Args:
+            doc_id: id of Google Doc.
+            lab_name: name of lab
+        Returns:
+            A string.
+        """
+        return self._create_status_fingerprint(self._find_statuses(doc_id, lab_name))
+
+    def get_experiment_statuses(self, doc_ids, lab_name):
+        """Retrieve Status for experiments from many documents in one aggregation.
+
+        Args:
+            doc_ids: a list of Google Doc ids.
+            lab_name: name of lab
+        Returns:
+            A dictionary. The key represents a doc_id and the value is what
+            get_experiment_status_and_fingerprint returns for that document.
+        """
+        ref_to_doc_id = {google_constants.GOOGLE_DOC_URL_PREFIX + doc_id: doc_id for doc_id in doc_ids}
+        query = self._create_status_query(lab_name)
+        query[ta4_constants.EXPERIMENT_REFERENCE_URL] = {'$in': list(ref_to_doc_id.keys())}
+        db_response = self.database.structured_requests.aggregate([
+            {'$match': query},
+            {'$project': self._STATUS_PROJECTION},
+            {'$group': {'_id': '$' + ta4_constants.EXPERIMENT_REFERENCE_URL, 'statuses': {'$push': '$$ROOT'}}}
+        ])
+
+        doc_id_to_statuses = {doc_id: [] for doc_id in doc_ids}
+        for group in db_response:
+            doc_id_to_statuses[ref_to_doc_id[group['_id']]] = group['statuses']
+        return {doc_id: (self._create_status_tables(statuses), self._create_status_fingerprint(statuses))
+                for doc_id, statuses in doc_id_to_statuses.items()}
+
+    def _create_status_query(self, lab_name):
+        # derived_from.0 exists only for a non-empty derived_from list and, unlike $where, can be evaluated without JavaScript.
+        return {'derived_from.0': {'$exists': True},
+                ta4_constants.LAB: {'$regex': re.escape(lab_name), '$options': 'i'}}
+
+    def _find_statuses(self, doc_id, lab_name):
+        query = self._create_status_query(lab_name)
+        query[ta4_constants.EXPERIMENT_REFERENCE_URL] = google_constants.GOOGLE_DOC_URL_PREFIX + doc_id
+        return list(self.database.structured_requests.find(query, self._STATUS_PROJECTION))
+
+    def _create_status_fingerprint(self, statuses):
+        records = sorted(json.dumps(status, sort_keys=True, default=str) for status in statuses)
+        return hashlib.sha256(json.dumps(records).encode('utf-8')).hexdigest()
+
+    def _create_status_tables(self, statuses):
         result = {}
         status_table = ExperimentStatusTableParser()
-        for status in db_response:
-            if lab_name.lower() in status[ta4_constants.LAB].lower():
-                if ta4_constants.STATUS not in status:
-                    return {}
-                for status_type, status_values in status[ta4_constants.STATUS].items():
-                    status_last_updated = status_values[ta4_constants.LAST_UPDATED] if ta4_constants.LAST_UPDATED in status_values else datetime.now()
-                    status_state = status_values[ta4_constants.STATE] if ta4_constants.STATE in status_values else False
-                    status_path = status_values[ta4_constants.PATH] if ta4_constants.PATH in status_values else 'no data'
-                    if status_type == ta4_constants.XPLAN_REQUEST_SUBMITTED:
-                        status_path = status[ta4_constants.PARENT_GIT_PATH]
-
-                    status_table.add_status(status_type,
-                                            status_last_updated,
-                                            status_state,
-                                            status_path)
-
-                result[status[ta4_constants.EXPERIMENT_ID]] = status_table
+        for status in statuses:
+            if ta4_constants.STATUS not in status:
+                return {}
+            for status_type, status_values in status[ta4_constants.STATUS].items():
+                status_last_updated = status_values[ta4_constants.LAST_UPDATED] if ta4_constants.LAST_UPDATED in status_values else datetime.now()
+                status_state = status_values[ta4_constants.STATE] if ta4_constants.STATE in status_values else False
+                status_path = status_values[ta4_constants.PATH] if ta4_constants.PATH in status_values else 'no data'
+                if status_type == ta4_constants.XPLAN_REQUEST_SUBMITTED:
+                    status_path = status[ta4_constants.PARENT_GIT_PATH]
+
+                status_table.add_status(status_type,
+                                        status_last_updated,
+                                        status_state,
+                                        status_path)
+
+            result[status[ta4_constants.EXPERIMENT_ID]] = status_table
         return result
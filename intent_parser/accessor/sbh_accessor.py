@@ -1,22 +1,43 @@
 from sbol2 import SBOLError
 from intent_parser.intent_parser_exceptions import IntentParserException
 import logging
+import queue
 import sbol2 as sbol
 import tenacity
 import threading
+import time
 import traceback
 
 class SBHAccessor:
+    """
+    Accessor to a SynBioHub instance that keeps a pool of authenticated PartShop sessions
+    so that SynBioHub calls from different request threads run concurrently.
+    """
     _LOGGER = logging.getLogger('sbh_accessor')
 
-    def __init__(self, sbh_url):
+    DEFAULT_POOL_SIZE = 4
+    # Log when a call waits this many seconds for a free session.
+    SLOW_CHECKOUT_SECONDS = 1
+
+    def __init__(self, sbh_url, pool_size=DEFAULT_POOL_SIZE):
         self.shutdownThread = False
         self.event = threading.Event()
-        self.lock = threading.Lock()
-        self.sbh = sbol.PartShop(sbh_url)
         self.sbh_username = None
         self.sbh_password = None
 
+        self._pool_size = pool_size
+        self._sessions = queue.Queue()
+        for _ in range(pool_size):
+            self._sessions.put(_SBHSession(sbol.PartShop(sbh_url)))
+        self._login_generation = 0
+        # only one caller at a time checks out every session so that two callers never each hold part of the pool.
+        self._checkout_all_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._checkouts = 0
+        self._waited_checkouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
         self.housekeeping_thread = threading.Thread(target=self.housekeeping)
         self.housekeeping_thread.start()
 
@@ -28,30 +49,35 @@ class SBHAccessor:
                     wait=tenacity.wait_fixed(3),
                     reraise=True)
     def login(self, sbh_username, sbh_password):
-        self.lock.acquire()
+        sessions = self._checkout_all()
         try:
-            fret = self.sbh.login(sbh_username, sbh_password)
+            fret = None
+            for session in sessions:
+                fret = session.get_part_shop().login(sbh_username, sbh_password)
+                session.set_login_generation(self._login_generation + 1)
             self.sbh_username = sbh_username
             self.sbh_password = sbh_password
+            self._login_generation += 1
             return fret
         except SBOLError as e:
             message = 'Failed logging into SynBioHub.'
             self._LOGGER.error(message)
             raise IntentParserException(message)
         finally:
-            self.lock.release()
+            self._checkin_all(sessions)
 
     def set_spoof_uri(self, spoof_uri):
         # Spoof URI can only be set when running on test server, not production server
-        self.lock.acquire()
+        sessions = self._checkout_all()
         try:
-            self.sbh.spoof(spoof_uri)
+            for session in sessions:
+                session.get_part_shop().spoof(spoof_uri)
         except SBOLError as e:
             message = 'Failed set spoof URI.'
             self._LOGGER.error(message)
             raise IntentParserException(message)
         finally:
-            self.lock.release()
+            self._checkin_all(sessions)
 
     # * Stop after trying 3 times
     # * Wait 3 seconds between retries
@@ -61,36 +87,36 @@ class SBHAccessor:
                     wait=tenacity.wait_fixed(3),
                     reraise=True)
     def sparqlQuery(self, sparql_query):
-        self.lock.acquire()
+        session = self._checkout()
         try:
-            fret = self.sbh.sparqlQuery(sparql_query)
+            fret = session.get_part_shop().sparqlQuery(sparql_query)
             return fret
         except SBOLError as e:
             message = 'Failed to perform sparql query.'
             self._LOGGER.error(message)
             raise IntentParserException(message)
         finally:
-            self.lock.release()
+            self._checkin(session)
 
     def exists(self, document, targeted_uri, run_recursive=True):
-        self.lock.acquire()
+        session = self._checkout()
         try:
             # a github issue has been requested to support sbh.exists()
             # for now, sbh.pull is a temporary solution used to check the existence of a collection in sbh.
-            self.sbh.pull(targeted_uri, document, run_recursive)
+            session.get_part_shop().pull(targeted_uri, document, run_recursive)
             return True
         except SBOLError:
             self._LOGGER.warning('URI %s does not exist in SynBioHub' % targeted_uri)
             return False
         finally:
-            self.lock.release()
+            self._checkin(session)
 
     def submit(self, document, collection, flags):
-        self.lock.acquire()
+        session = self._checkout()
         try:
-            fret = self.sbh.submit(document,
-                                   collection,
-                                   flags)
+            fret = session.get_part_shop().submit(document,
+                                                  collection,
+                                                  flags)
             return fret
         except SBOLError as e:
             self._LOGGER.error(''.join(traceback.format_exception(etype=type(e),
@@ -98,7 +124,23 @@ class SBHAccessor:
                                                                   tb=e.__traceback__)))
             raise IntentParserException('Failed to submit to SynBioHub')
         finally:
-            self.lock.release()
+            self._checkin(session)
+
+    def get_pool_metrics(self):
+        """
+        Report how long calls waited for a free SynBioHub session.
+        Returns:
+            A dictionary with the number of checkouts, the number of checkouts that had to wait,
+            and the total and maximum wait in seconds.
+        """
+        self._metrics_lock.acquire()
+        metrics = {'pool_size': self._pool_size,
+                   'checkouts': self._checkouts,
+                   'waited_checkouts': self._waited_checkouts,
+                   'total_wait_seconds': self._total_wait,
+                   'max_wait_seconds': self._max_wait}
+        self._metrics_lock.release()
+        return metrics
 
     def stop(self):
         self.shutdownThread = True
@@ -110,13 +152,77 @@ class SBHAccessor:
             if self.shutdownThread:
                 return
 
-            self.lock.acquire()
+            # sessions log in again the next time they are checked out.
+            if self.sbh_username is not None and self.sbh_password is not None:
+                self._login_generation += 1
+            self._LOGGER.info('SynBioHub session pool: %s' % self.get_pool_metrics())
+
+    def _checkout(self):
+        start = time.monotonic()
+        try:
+            session = self._sessions.get_nowait()
+            waited = False
+        except queue.Empty:
+            session = self._sessions.get()
+            waited = True
+        wait = time.monotonic() - start
+        self._record_checkout(waited, wait)
+
+        if session.get_login_generation() < self._login_generation:
             try:
-                if self.sbh_username is not None and self.sbh_password is not None:
-                    self.sbh.login(self.sbh_username,
-                                   self.sbh_password)
-            except SBOLError as ex:
-                self._LOGGER.error(''.join(traceback.format_exception(etype=type(ex),
-                                                                      value=ex,
-                                                                      tb=ex.__traceback__)))
-            self.lock.release()
+                self._relogin(session)
+            except:
+                self._checkin(session)
+                raise
+        return session
+
+    def _checkin(self, session):
+        self._sessions.put(session)
+
+    def _checkout_all(self):
+        self._checkout_all_lock.acquire()
+        try:
+            return [self._sessions.get() for _ in range(self._pool_size)]
+        finally:
+            self._checkout_all_lock.release()
+
+    def _checkin_all(self, sessions):
+        for session in sessions:
+            self._sessions.put(session)
+
+    def _relogin(self, session):
+        login_generation = self._login_generation
+        try:
+            session.get_part_shop().login(self.sbh_username, self.sbh_password)
+            session.set_login_generation(login_generation)
+        except Exception as ex:
+            # the session stays at its old login generation so that the next checkout tries again.
+            self._LOGGER.error(''.join(traceback.format_exception(etype=type(ex),
+                                                                  value=ex,
+                                                                  tb=ex.__traceback__)))
+
+    def _record_checkout(self, waited, wait):
+        self._metrics_lock.acquire()
+        self._checkouts += 1
+        if waited:
+            self._waited_checkouts += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        self._metrics_lock.release()
+        if wait >= self.SLOW_CHECKOUT_SECONDS:
+            self._LOGGER.warning('Waited %.2f seconds for a SynBioHub session.' % wait)
+
+class _SBHSession(object):
+
+    def __init__(self, part_shop):
+        self._part_shop = part_shop
+        self._login_generation = 0
+
+    def get_part_shop(self):
+        return self._part_shop
+
+    def get_login_generation(self):
+        return self._login_generation
+
+    def set_login_generation(self, login_generation):
+        self._login_generation = login_generation
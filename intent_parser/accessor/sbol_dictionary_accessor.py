@@ -1,12 +1,13 @@
 from datetime import timedelta
 from googleapiclient import errors
-from intent_parser.intent.sbol_dictionary_strain_intent import SBOLDictionaryStrainIntent
 from intent_parser.accessor.google_accessor import GoogleAccessor
+from intent_parser.accessor.sbol_dictionary_snapshot import SBOLDictionarySnapshot
 from intent_parser.intent_parser_exceptions import DictionaryMaintainerException
-import intent_parser.table.cell_parser as cell_parser
+import intent_parser.accessor.sbol_dictionary_snapshot as sbol_dictionary_snapshot
 import intent_parser.constants.sbol_dictionary_constants as dictionary_constants
 import logging
 import os
+import sqlite3
 import time
 import threading
 
@@ -27,23 +28,36 @@ class SBOLDictionaryAccessor(object):
     curr_path = os.path.dirname(os.path.realpath(__file__))
     ITEM_MAP_FILE = os.path.join(curr_path, 'item-map.json')
 
-    ANALYZE_TABS = [dictionary_constants.TAB_ATTRIBUTE,
-                    dictionary_constants.TAB_GENETIC_CONSTRUCTS,
-                    dictionary_constants.TAB_PROTEIN,
-                    dictionary_constants.TAB_REAGENT,
-                    dictionary_constants.TAB_STRAIN]
+    ANALYZE_TABS = sbol_dictionary_snapshot.ANALYZE_TABS
 
     SYNC_PERIOD = timedelta(minutes=30)
+    FLUSH_DELAY = timedelta(seconds=5)
+    # Number of failed writes in a row after which callers adding entries are told that the spreadsheet rejects them.
+    FLUSH_FAILURE_LIMIT = 3
 
-    def __init__(self, spreadsheet_id, sbh):
+    def __init__(self, spreadsheet_id, sbh, snapshot_file=None):
         self.google_accessor = GoogleAccessor().get_google_spreadsheet_accessor()
+        self.drive_accessor = GoogleAccessor().get_google_drive_accessor(version=3)
         self.sbh = sbh
 
-        self.analyze_terms = {}
-        self.analyze_lock = threading.Lock()
-        self.spreadsheet_lock = threading.Lock()
-        self.spreadsheet_tab_data = {}
         self.spreadsheet_thread = threading.Thread(target=self._periodically_fetch_spreadsheet)
+        self._fetch_lock = threading.Lock()
+        self._publish_lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._pending_entries = []
+        # Rows written to the spreadsheet that a sync has not fetched yet
+        self._written_entries = []
+        self._flush_timer = None
+        self._flush_failures = 0
+        self._flush_error = None
+        self._sheet_ids = None
+        self._sync_listeners = []
+        self._notify_lock = threading.Lock()
+        self._notified_version = None
+        self._snapshot = SBOLDictionarySnapshot(0, {})
+        self._snapshot_file = snapshot_file
+        if self._snapshot_file is None:
+            self._snapshot_file = os.path.join(self.curr_path, 'sbol_dictionary_%s.db' % spreadsheet_id)
 
         self._spreadsheet_id = spreadsheet_id
         self._tab_headers = dict()
@@ -67,6 +81,7 @@ class SBOLDictionaryAccessor(object):
                                     'Definition URI',
                                     'Definition URI / CHEBI ID',
                                     'Status']
+        self._type_to_tab = self.load_type2tab()
 
         self.mapping_failures_headers = ['Experiment/Run',
                                          'Lab',
@@ -84,88 +99,168 @@ class SBOLDictionaryAccessor(object):
                      'PennState (Salis)']
 
     def initial_fetch(self):
-        self._fetch_spreadsheet_data()
+        self._load_snapshot_file()
+        self._fetch_spreadsheet_data_if_modified()
+
+    def get_snapshot(self):
+        """
+        Retrieve the latest published snapshot of the dictionary.
+        A reader should hold on to one snapshot to get consistent results across several lookups.
+        """
+        return self._snapshot
+
+    def get_dictionary_version(self):
+        """
+        Retrieve the version of the latest published snapshot.
+        The version increases each time the dictionary is updated so it can be used to invalidate cached results.
+        """
+        return self._snapshot.get_version()
 
     def get_spreadsheet_data(self):
-        self.spreadsheet_lock.acquire()
-        sheet_data = self.spreadsheet_tab_data.copy()
-        self.spreadsheet_lock.release()
-        return sheet_data
+        """
+        Returns:
+            A read-only dictionary where key represents a tab name and value represents the tab's row data.
+        """
+        return self._snapshot.get_spreadsheet_data()
 
     def get_analyzed_terms(self):
         """
         Retrieve terms from the dictionary with its corresponding SBH URI.
         Returns:
-            A dictionary where key represents a dictionary term and value represents a SBH uri.
+            A read-only dictionary where key represents a dictionary term and value represents a SBH uri.
         """
-        self.analyze_lock.acquire()
-        dictionary_terms = self.analyze_terms.copy()
-        self.analyze_lock.release()
-        return dictionary_terms
+        return self._snapshot.get_analyzed_terms()
 
-    def get_tab_name_from_item_type(self, targeted_item_type):
-        result = None
-        for tab_name, item_types in self.type_tabs.items():
-            if targeted_item_type in item_types:
-                result = tab_name
+    def add_sync_listener(self, listener):
+        """
+        Call listener with the analyzed terms and version of each new snapshot of the dictionary,
+        after a sync with the spreadsheet and after entries are added to the dictionary.
+        Listeners run on the synchronizing thread or the flush timer thread, never on a request that adds dictionary entries.
+        """
+        self._sync_listeners.append(listener)
 
-        if result is None:
+    def _notify_sync_listeners(self):
+        # Notify one snapshot at a time so that listeners never end up with an older snapshot than the latest one.
+        self._notify_lock.acquire()
+        try:
+            snapshot = self._snapshot
+            if snapshot.get_version() == self._notified_version:
+                return
+            self._notified_version = snapshot.get_version()
+            for listener in self._sync_listeners:
+                try:
+                    listener(snapshot.get_analyzed_terms(), snapshot.get_version())
+                except Exception as err:
+                    self.logger.warning('SBOL Dictionary sync listener failed: %s' % err)
+        finally:
+            self._notify_lock.release()
+
+    def get_tab_name_from_item_type(self, targeted_item_type):
+        if targeted_item_type not in self._type_to_tab:
             raise DictionaryMaintainerException('Unable to locate tab name in SBOL Dictionary for item type: %s' % targeted_item_type)
-        return result
+        return self._type_to_tab[targeted_item_type]
 
     def start_synchronizing_spreadsheet(self):
-        self._fetch_spreadsheet_data()
+        """
+        Serve the dictionary from the local snapshot file when one exists and refresh it in the background.
+        Otherwise, fetch the dictionary before returning.
+        """
+        if not self._load_snapshot_file():
+            self._fetch_spreadsheet_data_if_modified()
         self.spreadsheet_thread.start()
 
     def stop_synchronizing_spreadsheet(self):
+        self.flush_dictionary_entries()
         self.spreadsheet_thread.join()
 
     def _periodically_fetch_spreadsheet(self):
         while True:
+            self._fetch_spreadsheet_data_if_modified()
             time.sleep(self.SYNC_PERIOD.total_seconds())
-            self._fetch_spreadsheet_data()
-
-    def _fetch_spreadsheet_data(self):
-        self.logger.info('Fetching SBOL Dictionary spreadsheet')
-
-        self.spreadsheet_lock.acquire()
-        self._fetch_tabs()
-        self.spreadsheet_lock.release()
 
-        self.analyze_lock.acquire()
-        self._fetch_analyze_terms()
-        self.analyze_lock.release()
-
-    def _fetch_tabs(self):
-        spreadsheet_tabs = self.type_tabs.keys()
-        update_spreadsheet_data = {}
+    def _fetch_spreadsheet_data_if_modified(self):
         try:
-            for tab in spreadsheet_tabs:
-                update_spreadsheet_data[tab] = self.get_row_data(tab=tab)
-                self.logger.info('Fetched data from tab ' + tab)
-            self.spreadsheet_tab_data = update_spreadsheet_data
+            modified_time = self.drive_accessor.get_modified_time(self._spreadsheet_id)
         except errors.HttpError:
-            self.logger.info('Reached spreadsheet fetch quota limit!')
+            self.logger.info('Unable to get modified time of SBOL Dictionary spreadsheet.')
+            modified_time = None
+
+        if modified_time is not None and modified_time == self._snapshot.get_modified_time():
+            self.logger.info('SBOL Dictionary spreadsheet has not changed since %s' % modified_time)
+            return
+        # another process sharing the snapshot file may have already fetched this revision.
+        if modified_time is None or not self._load_snapshot_file(modified_time=modified_time):
+            self._fetch_spreadsheet_data(modified_time)
+        self._notify_sync_listeners()
+
+    def _fetch_spreadsheet_data(self, modified_time=None):
+        self.logger.info('Fetching SBOL Dictionary spreadsheet')
 
-    def _fetch_analyze_terms(self):
-        dictionary_terms = {}
+        self._fetch_lock.acquire()
         try:
-            for tab in self.ANALYZE_TABS:
-                dictionary_terms.update(self._get_dictionary_terms_from_tab(tab))
-            self.analyze_terms = dictionary_terms
+            update_spreadsheet_data = self._fetch_tabs(list(self.type_tabs.keys()))
+            self._publish_snapshot(update_spreadsheet_data, modified_time)
         except errors.HttpError:
             self.logger.info('Reached spreadsheet fetch quota limit!')
+        finally:
+            self._fetch_lock.release()
+
+    def _publish_snapshot(self, spreadsheet_tab_data, modified_time, write_file=True):
+        # Build the new snapshot before taking the lock and publish it with a single reference assignment
+        # so that readers and added entries never wait on a sync or see a partially updated dictionary.
+        # Only the rows added since are merged while holding the lock.
+        synced_snapshot = SBOLDictionarySnapshot(None, spreadsheet_tab_data, modified_time=modified_time)
+        self._publish_lock.acquire()
+        try:
+            self._written_entries = [entry for entry in self._written_entries if not self._has_entry(synced_snapshot, entry)]
+            self._snapshot = synced_snapshot.add_rows(self._snapshot.get_version() + 1, self._written_entries + self._pending_entries)
+        finally:
+            self._publish_lock.release()
+
+        # Only syncs write the file, after publishing, so that adding entries never waits on the write.
+        # Queued rows are left out of the file because they are not in this revision of the spreadsheet yet.
+        if write_file:
+            try:
+                sbol_dictionary_snapshot.write_snapshot_file(spreadsheet_tab_data, modified_time, self._snapshot_file)
+            except (OSError, sqlite3.Error) as err:
+                self.logger.warning('Unable to write SBOL Dictionary snapshot to %s: %s' % (self._snapshot_file, err))
+
+    def _load_snapshot_file(self, modified_time=None):
+        """
+        Publish the snapshot stored in the local snapshot file.
+        Args:
+            modified_time: if given, only load the file when it was fetched from this revision of the spreadsheet.
+        Returns:
+            True if a snapshot was loaded from file.
+        """
+        if modified_time is not None and sbol_dictionary_snapshot.read_snapshot_modified_time(self._snapshot_file) != modified_time:
+            return False
+        snapshot_data = sbol_dictionary_snapshot.read_snapshot_file(self._snapshot_file)
+        if snapshot_data is None:
+            return False
+        spreadsheet_tab_data, file_modified_time = snapshot_data
+        self.logger.info('Loaded SBOL Dictionary snapshot from %s' % self._snapshot_file)
+        self._publish_snapshot(spreadsheet_tab_data, file_modified_time, write_file=False)
+        return True
+
+    def _fetch_tabs(self, tabs):
+        """
+        Fetch the header and rows of each tab in one batch request.
+        Returns:
+            A dictionary where key represents a tab name and value represents the tab's row data.
+        """
+        tab_ranges = []
+        for tab in tabs:
+            tab_ranges.append(tab + '!2:2')
+            tab_ranges.append(tab + '!3:9999')
+        value_ranges = self.google_accessor.get_tabs_data(tab_ranges, self._spreadsheet_id)
 
-    def _get_dictionary_terms_from_tab(self, tab):
-        dictionary_terms = {}
-        tab_data = self.get_row_data(tab=tab)
-        for common_name, strain in self._create_strain_intents_from_spreadsheet_tab(tab_data).items():
-            for name in strain.get_lab_strain_names():
-                if len(name) > 2:
-                    dictionary_terms[name] = strain.get_strain_reference_link()
-            if len(common_name) > 2:
-                dictionary_terms[strain.get_strain_common_name()] = strain.get_strain_reference_link()
-        return dictionary_terms
+        update_spreadsheet_data = {}
+        for index, tab in enumerate(tabs):
+            self._set_tab_headers(tab, value_ranges[2 * index])
+            update_spreadsheet_data[tab] = self._create_row_data(tab, value_ranges[2 * index + 1], 3)
+            self.logger.info('Fetched data from tab ' + tab)
+        return update_spreadsheet_data
 
     def create_dictionary_entry(self, data, document_url, item_definition_uri):
         item_type = data['itemType']
@@ -174,27 +269,9 @@ class SBOLDictionaryAccessor(object):
         item_lab_id_tag = data['labIdSelect']
 
         item_uri = document_url
-        type2tab = self.load_type2tab()
-        tab_name = type2tab[item_type]
-
-        try:
-            tab_data = self.get_row_data(tab=tab_name)
-        except:
-            raise Exception('Failed to access dictionary spreadsheet')
-
-        # Get common names
-        item_map = {}
-        for row_data in tab_data:
-            common_name = row_data['Common Name']
-            if common_name is None or len(common_name) == 0:
-                continue
-            item_map[common_name] = row_data
-
-        if item_name in item_map:
-            raise Exception('"' + item_name + '" already exists in dictionary spreadsheet')
+        tab_name = self._type_to_tab[item_type]
 
         dictionary_entry = {'tab': tab_name,
-                            'row': len(tab_data) + 3,
                             'Common Name': item_name,
                             'Type': item_type}
         if tab_name == 'Reagent':
@@ -207,32 +284,127 @@ class SBOLDictionaryAccessor(object):
 
         dictionary_entry[item_lab_id_tag] = item_lab_ids
         dictionary_entry['SynBioHub URI'] = item_uri
+        self.add_dictionary_entry(dictionary_entry)
 
+    def add_dictionary_entry(self, entry):
+        """
+        Queue a new row to append to a tab and add it to the dictionary right away.
+        Queued rows are written to the spreadsheet together in one batch request after FLUSH_DELAY.
+        Args:
+            entry: a map that maps column headers to values, with an additional key to specify the tab.
+        Raises:
+            DictionaryMaintainerException if the tab already has a row with the entry's common name.
+            The entry is queued but DictionaryMaintainerException is also raised when
+            the last FLUSH_FAILURE_LIMIT writes to the spreadsheet failed.
+        """
+        tab = entry['tab']
+        common_name = entry[dictionary_constants.COLUMN_COMMON_NAME]
+        self._publish_lock.acquire()
         try:
-            self.set_row_data(dictionary_entry)
-        except:
-            raise Exception('Failed to add entry to the dictionary spreadsheet')
-    
+            if self._snapshot.has_common_name(tab, common_name):
+                raise DictionaryMaintainerException('"' + common_name + '" already exists in dictionary spreadsheet')
+            self._pending_entries.append(entry)
+            self._snapshot = self._snapshot.add_rows(self._snapshot.get_version() + 1, [entry])
+            self._schedule_flush()
+            flush_error = self.get_flush_error()
+        finally:
+            self._publish_lock.release()
+        if flush_error is not None:
+            raise DictionaryMaintainerException('"%s" is queued for the dictionary spreadsheet but %s' % (common_name, flush_error))
+
+    def get_flush_error(self):
+        """
+        Report queued rows that the spreadsheet keeps rejecting.
+        Returns:
+            A message describing the failure if the last FLUSH_FAILURE_LIMIT writes failed. Otherwise, None.
+        """
+        self._publish_lock.acquire()
+        try:
+            if self._flush_failures < self.FLUSH_FAILURE_LIMIT:
+                return None
+            return 'the last %d writes to the spreadsheet failed: %s' % (self._flush_failures, self._flush_error)
+        finally:
+            self._publish_lock.release()
+
+    def _schedule_flush(self):
+        self._publish_lock.acquire()
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.FLUSH_DELAY.total_seconds(), self._flush_on_timer)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+        self._publish_lock.release()
+
+    def _flush_on_timer(self):
+        # hand the added entries to listeners here rather than on the requests that added them.
+        self._notify_sync_listeners()
+        self.flush_dictionary_entries()
+
+    def flush_dictionary_entries(self):
+        """
+        Append all queued rows to the spreadsheet in one batchUpdate request.
+        Rows stay in the dictionary after they are written until a sync fetches them from the spreadsheet.
+        """
+        # One flush at a time so that the timer and stop_synchronizing_spreadsheet never write the same rows twice.
+        self._flush_lock.acquire()
+        try:
+            self._publish_lock.acquire()
+            entries = list(self._pending_entries)
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._publish_lock.release()
+            if not entries:
+                return
+
+            try:
+                self.google_accessor.execute_requests(self._create_append_requests(entries), self._spreadsheet_id)
+                self.logger.info('Added %d entries to the SBOL Dictionary spreadsheet.' % len(entries))
+            except Exception as err:
+                # keep the rows queued and try again so that they are not lost when this runs on the timer thread.
+                self.logger.warning('Failed to add entries to the dictionary spreadsheet: %s' % err)
+                self._publish_lock.acquire()
+                self._flush_failures += 1
+                self._flush_error = err
+                self._publish_lock.release()
+                self._schedule_flush()
+                return
+
+            self._publish_lock.acquire()
+            flushed_entries = set(id(entry) for entry in entries)
+            self._pending_entries = [entry for entry in self._pending_entries if id(entry) not in flushed_entries]
+            self._written_entries.extend(entries)
+            self._flush_failures = 0
+            self._flush_error = None
+            self._publish_lock.release()
+        finally:
+            self._flush_lock.release()
+
+    def _create_append_requests(self, entries):
+        if self._sheet_ids is None:
+            self._sheet_ids = self.google_accessor.get_sheet_ids(self._spreadsheet_id)
+        tab_rows = {}
+        for entry in entries:
+            row_values = [{'userEnteredValue': {'stringValue': value}} for value in self.gen_row_data(entry=entry, tab=entry['tab'])]
+            tab_rows.setdefault(entry['tab'], []).append({'values': row_values})
+        return [{'appendCells': {'sheetId': self._sheet_ids[tab],
+                                 'rows': rows,
+                                 'fields': 'userEnteredValue'}}
+                for tab, rows in tab_rows.items()]
+
+    def _has_entry(self, snapshot, entry):
+        tab = entry['tab']
+        return tab in snapshot.get_spreadsheet_data() and snapshot.has_common_name(tab, entry[dictionary_constants.COLUMN_COMMON_NAME])
+
     def get_tab_sheet(self, tab_name):
         """Retrieve contents from a spreadsheet tab.
         Args:
             tab_name: name of tab.
         Returns:
-            A spreadsheet tab.
+            A read-only spreadsheet tab.
         Raises:
             DictionaryMaintainerException to indicate if a tab does not exist within a spreadsheet.
         """
-        self.spreadsheet_lock.acquire()
-        sheet_data = self.spreadsheet_tab_data.copy()
-        self.spreadsheet_lock.release()
-        target_tab = None
-        for tab in sheet_data:
-            if tab == tab_name:
-                target_tab = sheet_data[tab]
-                break 
-        if target_tab is None:
-            raise DictionaryMaintainerException('Unable to locate %s tab in spreadsheet.' % tab_name)
-        return target_tab
+        return self._snapshot.get_tab_sheet(tab_name)
         
     def load_type2tab(self):
         # Inverse map of typeTabs
@@ -286,7 +458,9 @@ class SBOLDictionaryAccessor(object):
         returns a map that maps headers to column indexes
         """
         tab_data = self.google_accessor.get_tab_data(tab + "!2:2", self._spreadsheet_id)
+        self._set_tab_headers(tab, tab_data)
 
+    def _set_tab_headers(self, tab, tab_data):
         if 'values' not in tab_data:
             raise Exception('No header values found in tab "' +
                             tab + '"')
@@ -336,21 +510,22 @@ class SBOLDictionaryAccessor(object):
         if tab not in self._tab_headers.keys():
             self._cache_tab_headers(tab)
 
-        header_value = self._inverse_tab_headers[tab]
-
         if row is None:
             value_range = tab + '!3:9999'
         else:
             value_range = tab + '!' + str(row) + ":" + str(row)
 
         tab_data = self.google_accessor.get_tab_data(value_range, self._spreadsheet_id)
+        return self._create_row_data(tab, tab_data, 3)
 
+    def _create_row_data(self, tab, tab_data, start_row):
+        header_value = self._inverse_tab_headers[tab]
         row_data = []
         if 'values' not in tab_data:
             return row_data
 
         values = tab_data['values']
-        row_index = 3
+        row_index = start_row
         for row_values in values:
             this_row_data = {}
             for i in range(len(header_value)):
@@ -423,15 +598,11 @@ class SBOLDictionaryAccessor(object):
         return row_data
 
     def map_common_names_and_tacc_id(self):
-        result = {}
-        attribute_tab = self.get_tab_sheet(dictionary_constants.TAB_ATTRIBUTE)
-        for row in attribute_tab:
-            if dictionary_constants.COLUMN_COMMON_NAME in row and dictionary_constants.COLUMN_TACC_UID in row:
-                common_name = row[dictionary_constants.COLUMN_COMMON_NAME]
-                tacc_id = row[dictionary_constants.COLUMN_TACC_UID]
-                if tacc_id:
-                    result[tacc_id] = common_name
-        return result
+        """
+        Returns:
+            A read-only dictionary where key represents a TACC UID and value represents its common name.
+        """
+        return self._snapshot.get_tacc_id_to_common_name()
 
     def get_mapped_strain(self, lab_name):
         """Create a mapping for strains from the Strains tab.
@@ -439,58 +610,20 @@ class SBOLDictionaryAccessor(object):
             lab_name: A string to represent the name of a Lab.
 
         Returns:
-            A Dict of StrainIntent objects. The key represents the sbh uri.
+            A read-only Dict of StrainIntent objects. The key represents the sbh uri.
             The value is a StrainIntent object
         """
-        mapped_strains = {}
         if lab_name not in dictionary_constants.MAPPED_LAB_UID:
             message = 'Unable to map %s to a LAB_UID in the SBOL Dictionary for processing strains.' % lab_name
             raise DictionaryMaintainerException(message)
-        lab_uid = dictionary_constants.MAPPED_LAB_UID[lab_name]
-
-        strain_tab = self.get_tab_sheet(dictionary_constants.TAB_STRAIN)
-        for row in strain_tab:
-            if (dictionary_constants.COLUMN_COMMON_NAME in row and
-                    dictionary_constants.COLUMN_SYNBIOHUB_URI in row and
-                    lab_uid in row):
-                sbh_uri = row[dictionary_constants.COLUMN_SYNBIOHUB_URI]
-                common_name = row[dictionary_constants.COLUMN_COMMON_NAME]
-                lab_strain_names = []
-                if row[lab_uid]:
-                    lab_strain_names = [name for name in cell_parser.PARSER.extract_name_value(row[lab_uid])]
-                mapped_strains[sbh_uri] = SBOLDictionaryStrainIntent(sbh_uri, lab_name, common_name, lab_strain_names=lab_strain_names)
-        return mapped_strains
-
-    def _create_strain_intents_from_spreadsheet_tab(self, tab):
-        strain_intents = {}
-        for row in tab:
-            if dictionary_constants.COLUMN_COMMON_NAME in row and dictionary_constants.COLUMN_SYNBIOHUB_URI in row:
-                sbh_uri = row[dictionary_constants.COLUMN_SYNBIOHUB_URI]
-                common_name = row[dictionary_constants.COLUMN_COMMON_NAME]
-                for lab_name, lab_uid in dictionary_constants.MAPPED_LAB_UID.items():
-                    if lab_uid and lab_uid in row:
-                        if row[lab_uid]:
-                            lab_strain_names = [name for name in cell_parser.PARSER.extract_name_value(row[lab_uid])]
-                            strain_intents[common_name] = SBOLDictionaryStrainIntent(sbh_uri, lab_name, common_name, lab_strain_names=lab_strain_names)
-                        else:
-                            strain_intents[common_name] = SBOLDictionaryStrainIntent(sbh_uri, lab_name, common_name)
-        return strain_intents
+        return self._snapshot.get_mapped_strain(lab_name)
 
     def get_common_name_from_transcriptic_id(self, transcriptic_id):
-        mappings = self.map_common_names_and_transcriptic_id()
-        for key, value in mappings.items():
-            if transcriptic_id == value:
-                return key
-        return None
+        return self._snapshot.get_transcriptic_id_to_common_name().get(transcriptic_id)
 
     def map_common_names_and_transcriptic_id(self):
-        result = {}
-        attribute_tab = self.get_tab_sheet(dictionary_constants.TAB_ATTRIBUTE)
-        for row in attribute_tab:
-            if dictionary_constants.COLUMN_COMMON_NAME in row and dictionary_constants.COLUMN_TRANSCRIPT_UID in row:
-                common_name = row[dictionary_constants.COLUMN_COMMON_NAME]
-                strateos_id = row[dictionary_constants.COLUMN_TRANSCRIPT_UID]
-                if strateos_id:
-                    result[common_name] = strateos_id
-        return result
-
+        """
+        Returns:
+            A read-only dictionary where key represents a common name and value represents its Transcriptic UID.
+        """
+        return self._snapshot.get_common_name_to_transcriptic_id()
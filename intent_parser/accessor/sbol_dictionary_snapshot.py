@@ -0,0 +1,289 @@
+from intent_parser.accessor.dictionary_search_index import DictionarySearchIndex
+from intent_parser.intent.sbol_dictionary_strain_intent import SBOLDictionaryStrainIntent
+from intent_parser.intent_parser_exceptions import DictionaryMaintainerException
+import intent_parser.table.cell_parser as cell_parser
+import intent_parser.constants.sbol_dictionary_constants as dictionary_constants
+import copy
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+
+logger = logging.getLogger('intent_parser_sbol_dictionary_snapshot')
+
+ANALYZE_TABS = [dictionary_constants.TAB_ATTRIBUTE,
+                dictionary_constants.TAB_GENETIC_CONSTRUCTS,
+                dictionary_constants.TAB_PROTEIN,
+                dictionary_constants.TAB_REAGENT,
+                dictionary_constants.TAB_STRAIN]
+
+# Files written before this version may hold rows that were never written to the spreadsheet.
+SNAPSHOT_FILE_FORMAT = '2'
+
+class SBOLDictionarySnapshot(object):
+    """
+    An immutable copy of the SBOL Dictionary spreadsheet taken from one dictionary sync.
+    Lookups over the dictionary are built once when the snapshot is created.
+    Data returned from a snapshot is shared between readers and must not be modified.
+    """
+
+    def __init__(self, version, spreadsheet_tab_data, modified_time=None):
+        self._version = version
+        self._modified_time = modified_time
+        self._spreadsheet_tab_data = spreadsheet_tab_data
+        self._analyze_terms = self._create_analyze_terms(spreadsheet_tab_data)
+
+        attribute_tab = spreadsheet_tab_data.get(dictionary_constants.TAB_ATTRIBUTE, [])
+        self._tacc_id_to_common_name = self._map_attribute_ids(attribute_tab, dictionary_constants.COLUMN_TACC_UID)
+        self._common_name_to_transcriptic_id = self._map_attribute_ids(attribute_tab,
+                                                                       dictionary_constants.COLUMN_TRANSCRIPT_UID,
+                                                                       id_as_key=False)
+        self._transcriptic_id_to_common_name = {}
+        for common_name, strateos_id in self._common_name_to_transcriptic_id.items():
+            if strateos_id not in self._transcriptic_id_to_common_name:
+                self._transcriptic_id_to_common_name[strateos_id] = common_name
+        self._common_names = {tab: set(row[dictionary_constants.COLUMN_COMMON_NAME] for row in tab_data
+                                       if row.get(dictionary_constants.COLUMN_COMMON_NAME))
+                              for tab, tab_data in spreadsheet_tab_data.items()}
+        strain_tab = spreadsheet_tab_data.get(dictionary_constants.TAB_STRAIN, [])
+        self._mapped_strains = {lab_name: self._map_strains(strain_tab, lab_name, lab_uid)
+                                for lab_name, lab_uid in dictionary_constants.MAPPED_LAB_UID.items()}
+        self._search_index = DictionarySearchIndex([(row.get(dictionary_constants.COLUMN_COMMON_NAME),
+                                                     row.get(dictionary_constants.COLUMN_SYNBIOHUB_URI))
+                                                    for tab_data in spreadsheet_tab_data.values()
+                                                    for row in tab_data])
+
+    def add_rows(self, version, rows):
+        """
+        Create a snapshot with rows appended to their tab, reusing the lookups of this snapshot instead of rebuilding them.
+        Rows with a common name that is already in their tab are left out.
+        Args:
+            version: version of the new snapshot.
+            rows: a list of maps that map column headers to values, with an additional key to specify the tab.
+        """
+        snapshot = copy.copy(self)
+        snapshot._version = version
+        added_tab_data = {}
+        for row in rows:
+            tab = row['tab']
+            common_name = row[dictionary_constants.COLUMN_COMMON_NAME]
+            if common_name in snapshot._common_names.get(tab, ()):
+                continue
+            if not added_tab_data:
+                snapshot._spreadsheet_tab_data = dict(self._spreadsheet_tab_data)
+                snapshot._common_names = dict(self._common_names)
+            tab_data = snapshot._spreadsheet_tab_data.get(tab, [])
+            row_data = {header: value for header, value in row.items() if header != 'row'}
+            row_data['row'] = max([tab_row['row'] for tab_row in tab_data], default=2) + 1
+            snapshot._spreadsheet_tab_data[tab] = tab_data + [row_data]
+            snapshot._common_names[tab] = snapshot._common_names.get(tab, set()) | {common_name}
+            added_tab_data.setdefault(tab, []).append(row_data)
+        if not added_tab_data:
+            return snapshot
+
+        snapshot._analyze_terms = dict(self._analyze_terms)
+        snapshot._analyze_terms.update(self._create_analyze_terms(added_tab_data))
+        attribute_rows = added_tab_data.get(dictionary_constants.TAB_ATTRIBUTE, [])
+        if attribute_rows:
+            snapshot._tacc_id_to_common_name = dict(self._tacc_id_to_common_name)
+            snapshot._tacc_id_to_common_name.update(self._map_attribute_ids(attribute_rows, dictionary_constants.COLUMN_TACC_UID))
+            added_transcriptic_ids = self._map_attribute_ids(attribute_rows, dictionary_constants.COLUMN_TRANSCRIPT_UID, id_as_key=False)
+            snapshot._common_name_to_transcriptic_id = dict(self._common_name_to_transcriptic_id)
+            snapshot._common_name_to_transcriptic_id.update(added_transcriptic_ids)
+            snapshot._transcriptic_id_to_common_name = dict(self._transcriptic_id_to_common_name)
+            for common_name, strateos_id in added_transcriptic_ids.items():
+                snapshot._transcriptic_id_to_common_name.setdefault(strateos_id, common_name)
+        strain_rows = added_tab_data.get(dictionary_constants.TAB_STRAIN, [])
+        if strain_rows:
+            snapshot._mapped_strains = {}
+            for lab_name, lab_uid in dictionary_constants.MAPPED_LAB_UID.items():
+                snapshot._mapped_strains[lab_name] = dict(self._mapped_strains[lab_name])
+                snapshot._mapped_strains[lab_name].update(self._map_strains(strain_rows, lab_name, lab_uid))
+        snapshot._search_index = self._search_index.add_items([(row.get(dictionary_constants.COLUMN_COMMON_NAME),
+                                                                row.get(dictionary_constants.COLUMN_SYNBIOHUB_URI))
+                                                               for tab_data in added_tab_data.values()
+                                                               for row in tab_data])
+        return snapshot
+
+    def get_version(self):
+        return self._version
+
+    def get_modified_time(self):
+        """
+        Returns:
+            The Drive modifiedTime of the spreadsheet that this snapshot was fetched from, or None if unknown.
+        """
+        return self._modified_time
+
+    def get_spreadsheet_data(self):
+        return self._spreadsheet_tab_data
+
+    def get_analyzed_terms(self):
+        return self._analyze_terms
+
+    def get_tab_sheet(self, tab_name):
+        self._check_tab(tab_name)
+        return self._spreadsheet_tab_data[tab_name]
+
+    def has_common_name(self, tab_name, common_name):
+        self._check_tab(tab_name)
+        return common_name in self._common_names[tab_name]
+
+    def get_tacc_id_to_common_name(self):
+        self._check_tab(dictionary_constants.TAB_ATTRIBUTE)
+        return self._tacc_id_to_common_name
+
+    def get_common_name_to_transcriptic_id(self):
+        self._check_tab(dictionary_constants.TAB_ATTRIBUTE)
+        return self._common_name_to_transcriptic_id
+
+    def get_transcriptic_id_to_common_name(self):
+        self._check_tab(dictionary_constants.TAB_ATTRIBUTE)
+        return self._transcriptic_id_to_common_name
+
+    def get_mapped_strain(self, lab_name):
+        self._check_tab(dictionary_constants.TAB_STRAIN)
+        return self._mapped_strains[lab_name]
+
+    def get_search_index(self):
+        """
+        Returns:
+            A DictionarySearchIndex over the common name and SynBioHub uri of every dictionary entry.
+        """
+        return self._search_index
+
+    def _check_tab(self, tab_name):
+        if tab_name not in self._spreadsheet_tab_data:
+            raise DictionaryMaintainerException('Unable to locate %s tab in spreadsheet.' % tab_name)
+
+    def _create_analyze_terms(self, spreadsheet_tab_data):
+        dictionary_terms = {}
+        for tab in ANALYZE_TABS:
+            if tab not in spreadsheet_tab_data:
+                continue
+            for common_name, strain in self._create_strain_intents_from_spreadsheet_tab(spreadsheet_tab_data[tab]).items():
+                for name in strain.get_lab_strain_names():
+                    if len(name) > 2:
+                        dictionary_terms[name] = strain.get_strain_reference_link()
+                if len(common_name) > 2:
+                    dictionary_terms[strain.get_strain_common_name()] = strain.get_strain_reference_link()
+        return dictionary_terms
+
+    def _create_strain_intents_from_spreadsheet_tab(self, tab):
+        strain_intents = {}
+        for row in tab:
+            if dictionary_constants.COLUMN_COMMON_NAME in row and dictionary_constants.COLUMN_SYNBIOHUB_URI in row:
+                sbh_uri = row[dictionary_constants.COLUMN_SYNBIOHUB_URI]
+                common_name = row[dictionary_constants.COLUMN_COMMON_NAME]
+                for lab_name, lab_uid in dictionary_constants.MAPPED_LAB_UID.items():
+                    if lab_uid and lab_uid in row:
+                        if row[lab_uid]:
+                            lab_strain_names = [name for name in cell_parser.PARSER.extract_name_value(row[lab_uid])]
+                            strain_intents[common_name] = SBOLDictionaryStrainIntent(sbh_uri, lab_name, common_name, lab_strain_names=lab_strain_names)
+                        else:
+                            strain_intents[common_name] = SBOLDictionaryStrainIntent(sbh_uri, lab_name, common_name)
+        return strain_intents
+
+    def _map_attribute_ids(self, attribute_tab, id_column, id_as_key=True):
+        result = {}
+        for row in attribute_tab:
+            if dictionary_constants.COLUMN_COMMON_NAME in row and id_column in row:
+                common_name = row[dictionary_constants.COLUMN_COMMON_NAME]
+                attribute_id = row[id_column]
+                if attribute_id:
+                    if id_as_key:
+                        result[attribute_id] = common_name
+                    else:
+                        result[common_name] = attribute_id
+        return result
+
+    def _map_strains(self, strain_tab, lab_name, lab_uid):
+        mapped_strains = {}
+        for row in strain_tab:
+            if (dictionary_constants.COLUMN_COMMON_NAME in row and
+                    dictionary_constants.COLUMN_SYNBIOHUB_URI in row and
+                    lab_uid in row):
+                sbh_uri = row[dictionary_constants.COLUMN_SYNBIOHUB_URI]
+                common_name = row[dictionary_constants.COLUMN_COMMON_NAME]
+                lab_strain_names = []
+                if row[lab_uid]:
+                    lab_strain_names = [name for name in cell_parser.PARSER.extract_name_value(row[lab_uid])]
+                mapped_strains[sbh_uri] = SBOLDictionaryStrainIntent(sbh_uri, lab_name, common_name, lab_strain_names=lab_strain_names)
+        return mapped_strains
+
+def write_snapshot_file(spreadsheet_tab_data, modified_time, file_path):
+    """
+    Write the tab data of a spreadsheet revision to a SQLite file, one database row per dictionary row.
+    The file is written to a temporary path and then moved into place so that
+    other processes reading file_path never see a partially written snapshot.
+    """
+    file_descriptor, temp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.realpath(file_path)))
+    os.close(file_descriptor)
+    try:
+        connection = sqlite3.connect(temp_path)
+        try:
+            connection.execute('CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT)')
+            connection.execute('CREATE TABLE tabs (tab TEXT PRIMARY KEY)')
+            connection.execute('CREATE TABLE tab_rows (tab TEXT, row_index INTEGER, row_data TEXT, PRIMARY KEY (tab, row_index))')
+            connection.execute('INSERT INTO metadata VALUES (?, ?)', ('format', SNAPSHOT_FILE_FORMAT))
+            connection.execute('INSERT INTO metadata VALUES (?, ?)', ('modified_time', modified_time))
+            for tab, tab_data in spreadsheet_tab_data.items():
+                connection.execute('INSERT INTO tabs VALUES (?)', (tab,))
+                connection.executemany('INSERT INTO tab_rows VALUES (?, ?, ?)',
+                                       [(tab, row_index, json.dumps(row)) for row_index, row in enumerate(tab_data)])
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(temp_path, file_path)
+    except:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def read_snapshot_modified_time(file_path):
+    """
+    Read the modified time of the spreadsheet revision stored in a file written by write_snapshot_file, without loading its rows.
+    Returns:
+        The modified time or None if file_path does not hold a readable snapshot.
+    """
+    if not os.path.exists(file_path):
+        return None
+    try:
+        connection = sqlite3.connect(file_path)
+        try:
+            metadata = dict(connection.execute('SELECT key, value FROM metadata'))
+        finally:
+            connection.close()
+    except sqlite3.Error as err:
+        logger.warning('Unable to read SBOL Dictionary snapshot from %s: %s' % (file_path, err))
+        return None
+    if metadata.get('format') != SNAPSHOT_FILE_FORMAT:
+        return None
+    return metadata.get('modified_time')
+
+def read_snapshot_file(file_path):
+    """
+    Read the tab data written by write_snapshot_file.
+    Returns:
+        A tuple of the tab data and the modified time of its spreadsheet revision or None if file_path does not hold a readable snapshot.
+    """
+    if not os.path.exists(file_path):
+        return None
+    try:
+        connection = sqlite3.connect(file_path)
+        try:
+            metadata = dict(connection.execute('SELECT key, value FROM metadata'))
+            if metadata.get('format') != SNAPSHOT_FILE_FORMAT:
+                logger.info('Ignoring SBOL Dictionary snapshot in old format from %s' % file_path)
+                return None
+            modified_time = metadata.get('modified_time')
+            spreadsheet_tab_data = {tab: [] for (tab,) in connection.execute('SELECT tab FROM tabs')}
+            for tab, row_data in connection.execute('SELECT tab, row_data FROM tab_rows ORDER BY tab, row_index'):
+                spreadsheet_tab_data[tab].append(json.loads(row_data))
+        finally:
+            connection.close()
+    except (sqlite3.Error, ValueError, KeyError) as err:
+        logger.warning('Unable to read SBOL Dictionary snapshot from %s: %s' % (file_path, err))
+        return None
+    return spreadsheet_tab_data, modified_time
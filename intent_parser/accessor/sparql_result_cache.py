@@ -0,0 +1,59 @@
+from collections import OrderedDict
+import threading
+import time
+
+class SparqlResultCache(object):
+    """
+    A bounded cache of SPARQL responses.
+    Entries expire ttl seconds after they are added and the least recently used entry is evicted once max_entries is reached.
+    """
+
+    def __init__(self, max_entries, ttl):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns:
+            The cached response for key or None if key is not cached or has expired.
+        """
+        self._lock.acquire()
+        try:
+            if key not in self._entries:
+                return None
+            expire_time, value = self._entries[key]
+            if expire_time <= time.monotonic():
+                self._entries.pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+        finally:
+            self._lock.release()
+
+    def get_generation(self):
+        """
+        Get the number of times the cache was invalidated.
+        Pass it to put() to drop responses that were queried before an invalidation.
+        """
+        return self._generation
+
+    def put(self, key, value, generation=None):
+        self._lock.acquire()
+        try:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        finally:
+            self._lock.release()
+
+    def invalidate(self):
+        self._lock.acquire()
+        self._entries.clear()
+        self._generation += 1
+        self._lock.release()
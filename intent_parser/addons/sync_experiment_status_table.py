@@ -1,5 +1,7 @@
 from datetime import timedelta
-from requests.exceptions import HTTPError
+from requests.exceptions import HTTPError, RequestException
+import intent_parser.constants.intent_parser_constants as ip_constants
+import intent_parser.constants.ip_app_script_constants as ip_addon_constants
 import json
 import logging
 import os.path
@@ -9,34 +11,62 @@ import traceback
 
 logger = logging.getLogger('experiment_status_script')
 SYNC_PERIOD = timedelta(minutes=180)
+# The server updates the documents of a batch a bounded number at a time,
+# since every document reads and writes through the same Google API quota.
+BATCH_SIZE = 4 * ip_constants.EXPERIMENT_STATUS_SYNC_WORKERS
+REQUEST_TIMEOUT = 1800
 
 def perform_automatic_run():
+    session = requests.Session()
     try:
-        documents = _get_documents_from_ip()
-        while len(documents) > 0:
-            document_id = documents.pop(0)
-            logger.warning('Processing document id: %s' % document_id)
-            _update_status(document_id)
-            logger.warning('Update complete for document id: %s' % document_id)
-
+        documents = _get_documents_from_ip(session)
+        start = time.monotonic()
+        failed = 0
+        for index in range(0, len(documents), BATCH_SIZE):
+            batch = documents[index:index + BATCH_SIZE]
+            try:
+                results = _update_statuses(session, batch)
+            except RequestException as err:
+                logger.warning('Update failed for document ids %s: %s' % (', '.join(batch), err))
+                failed += len(batch)
+                continue
+            failed += _log_results(results)
+        logger.warning('Processed %d documents in %.1f seconds. %d failed.' % (len(documents),
+                                                                             time.monotonic() - start,
+                                                                             failed))
     except HTTPError as http_err:
         logger.warning(f'HTTP error occurred: {http_err}')
+    finally:
+        session.close()
+
+def _log_results(results):
+    failed = 0
+    for document_id, result in results.items():
+        if result['status'] == 'failed':
+            failed += 1
+            logger.warning('Update failed for document id %s after %.1f seconds' % (document_id, result['seconds']))
+        elif result['status'] == 'unchanged':
+            logger.warning('No new statuses for document id %s, checked in %.1f seconds' % (document_id, result['seconds']))
+        else:
+            logger.warning('Update complete for document id %s in %.1f seconds' % (document_id, result['seconds']))
+        for status_message in result['messages']:
+            logger.warning(status_message)
+    return failed
 
-def _get_documents_from_ip():
-    response = execute_request('experiment_request_documents')
+def _get_documents_from_ip(session):
+    response = execute_request(session, 'experiment_request_documents')
     doc_dict = response.json()
     return doc_dict['docId']
 
-def _update_status(document_id):
-    response = execute_request('update_experiment_status/d/%s' % document_id)
-    content = response.json()
-    for status_message in content['messages']:
-        logger.warning(status_message)
-
+def _update_statuses(session, document_ids):
+    request_url = 'http://intentparser2.sd2e.org/update_experiment_status'
+    response = session.post(request_url, json={ip_addon_constants.DOCUMENT_IDS: document_ids}, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()['results']
 
-def execute_request(request_type):
+def execute_request(session, request_type):
     request_url = 'http://intentparser2.sd2e.org/%s' % (request_type)
-    response = requests.get(request_url)
+    response = session.get(request_url, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
     return response
 
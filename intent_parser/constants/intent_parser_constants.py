@@ -21,6 +21,8 @@ ANALYZE_TERM = 'term'
 ANALYZE_YES = 'process_analyze_yes'
 ANALYZE_YES_TO_ALL = 'process_link_all'
 
+BATCH_DECISIONS = 'process_batch_decisions'
+
 SELECTED_CONTENT_TERM = 'content_term'
 SELECTED_END_OFFSET = 'end_offset'
 SELECTED_PARAGRAPH_INDEX = 'paragraph_index'
@@ -92,6 +94,21 @@ ITEM_TYPES = {
 }
 
 SPARQL_LIMIT = 5
+SPARQL_CACHE_MAX_ENTRIES = 512
+SPARQL_CACHE_TTL_SECONDS = 300
+
+CATALOG_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+# Documents whose experiment status tables are updated at the same time
+EXPERIMENT_STATUS_SYNC_WORKERS = 4
+
+# Serializations of OPIL requests that can be downloaded
+OPIL_FORMAT = 'format'
+OPIL_FORMAT_JSON_LD = 'json-ld'
+OPIL_FORMAT_N_TRIPLES = 'nt'
+OPIL_FORMAT_TURTLE = 'turtle'
+OPIL_SERIALIZATION_CACHE_MAX_ENTRIES = 64
+
 # sbol3 encodings
 MEASUREMENT_TYPE_AUTOMATED_TEST = 'AUTOMATED_TEST'
 MEASUREMENT_TYPE_CFU = 'CFU'
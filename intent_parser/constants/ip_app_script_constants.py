@@ -22,9 +22,13 @@ BUTTON_ID = 'buttonId'
 CHILD_INDEX = 'childIndex'
 CURSOR_CHILD_INDEX = 'cursorChildIndex'
 DATA = 'data'
+DECISIONS = 'decisions'
 DOCUMENT_ID = 'documentId'
+DOCUMENT_IDS = 'documentIds'
 EXPERIMENT_PROTOCOL_NAME = 'experimentalProtocolName'
 LAB_NAME = 'labName'
+RESULT_PAGE_SIZE = 'resultPageSize'
+SEARCH_REMOTE = 'searchRemote'
 USER_ID = 'user_id'
 
 HTML_BATCH = 'batch'
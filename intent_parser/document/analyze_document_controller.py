@@ -14,9 +14,10 @@ class AnalyzeDocumentController(object):
     ANALYZE_IGNORE_TERMS_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)),
                                              'analyze_ignore_terms.json')
 
-    def __init__(self):
+    def __init__(self, document_scanner=None):
         self._ignore_terms = {}
         self.analyzed_documents = {}
+        self._document_scanner = document_scanner
         self._started = False
         self._analyze_processing_lock = threading.Lock()
         self._analyze_thread = threading.Thread(target=self._periodically_write_user_ingored_terms)
@@ -67,6 +68,16 @@ class AnalyzeDocumentController(object):
 
         return results[0]
 
+    def get_analyze_results(self, document_id, page_size):
+        """
+        Get up to page_size of the next results to report for a document, without removing them.
+        """
+        if document_id not in self.analyzed_documents:
+            return []
+
+        analyze_document = self.analyzed_documents[document_id]
+        return analyze_document.get_result()[:page_size]
+
     def add_to_ignore_terms(self, user_id, term):
         self._analyze_processing_lock.acquire()
         if user_id not in self._ignore_terms:
@@ -94,25 +105,56 @@ class AnalyzeDocumentController(object):
         analyze_document = self.analyzed_documents[document_id]
         analyze_document.remove_first_occurrence(paragraph_index, matching_term, sbh_uri, start_offset, end_offset)
 
-    def process_dictionary_terms(self, document_id, ip_document, user_id, doc_location, dictionary_terms={}):
+    def process_dictionary_terms(self, document_id, ip_document, user_id, doc_location, dictionary_terms={}, dictionary_version=None):
+        """
+        Find dictionary terms in a document, starting from doc_location.
+        Set dictionary_version to the version of the dictionary snapshot that dictionary_terms were taken from
+        to scan large documents in the document scanner's worker processes.
+        The document scanner only holds the latest dictionary snapshot, so other dictionaries are analyzed in this process.
+        """
         if not self._started:
             raise IntentParserException('AnalyzeDocumentController was not initialized to load ignored terms from file.')
 
         filtered_dictionary = self._filter_dictionary_terms(user_id, dictionary_terms)
         analyze_document = self._get_or_create_analyze_document(document_id, ip_document, filtered_dictionary)
-        analyze_document.analyze(doc_location)
+        if (dictionary_version is not None
+                and self._document_scanner is not None
+                and self._document_scanner.should_scan(ip_document.get_paragraphs())):
+            analyze_document.analyze_in_parallel(doc_location,
+                                                 self._document_scanner,
+                                                 dictionary_version,
+                                                 self._get_user_ignored_terms(user_id))
+        else:
+            analyze_document.analyze(doc_location)
+
+    def get_document_snapshot(self, document_id):
+        if document_id not in self.analyzed_documents:
+            return None
+        return self.analyzed_documents[document_id].get_ip_document()
+
+    def update_document_snapshot(self, document_id, document_snapshot):
+        if document_id not in self.analyzed_documents:
+            return
+        self.analyzed_documents[document_id].set_ip_document(document_snapshot)
 
     def _get_or_create_analyze_document(self, document_id, ip_document, dictionary_terms={}):
         analyze_document = None
         self._analyze_processing_lock.acquire()
         if document_id in self.analyzed_documents:
             analyze_document = self.analyzed_documents[document_id]
+            analyze_document.set_ip_document(ip_document)
         else:
             analyze_document = _AnalyzeDocument(document_id, ip_document, dictionary_terms)
             self.analyzed_documents[document_id] = analyze_document
         self._analyze_processing_lock.release()
         return analyze_document
 
+    def _get_user_ignored_terms(self, user_id):
+        self._analyze_processing_lock.acquire()
+        ignored_terms = list(self._ignore_terms[user_id]) if user_id in self._ignore_terms else []
+        self._analyze_processing_lock.release()
+        return ignored_terms
+
     def _filter_dictionary_terms(self, user_id, dictionary_terms):
         self._analyze_processing_lock.acquire()
         copied_dictionary = dictionary_terms.copy()
@@ -153,31 +195,47 @@ class _AnalyzeDocument(object):
         self.document_id = document_id
         self.ip_document = ip_document
         self.dictionary_terms = dictionary_terms
-        self.keyword_processor = KeywordProcessor()
-        self.keyword_processor.add_keywords_from_list(list(dictionary_terms.keys()))
+        self.keyword_processor = None
         self.result = []
 
     def analyze(self, doc_location):
+        if self.keyword_processor is None:
+            self.keyword_processor = KeywordProcessor()
+            self.keyword_processor.add_keywords_from_list(list(self.dictionary_terms.keys()))
+
         for ip_paragraph in self.ip_document.get_paragraphs():
             if ip_paragraph.get_paragraph_index() < doc_location.get_paragraph_index():
                 continue
 
             text = ip_paragraph.get_text()
             match_results = self.keyword_processor.extract_keywords(text, span_info=True)
-            if not match_results:
-                continue
-
             for match, start, end in match_results:
-                if doc_location.get_paragraph_index() == ip_paragraph.get_paragraph_index():
-                    if start < doc_location.get_start_offset():
-                        continue
-                sbh_uri = self.dictionary_terms[match]
-                analyze_result = AnalyzeResult(ip_paragraph.get_paragraph_index(),
-                                               match,
-                                               sbh_uri,
-                                               start,
-                                               end-1)
-                self.result.append(analyze_result)
+                self._add_result(ip_paragraph.get_paragraph_index(), match, start, end, doc_location)
+
+    def analyze_in_parallel(self, doc_location, document_scanner, dictionary_version, ignored_terms):
+        paragraphs = [(ip_paragraph.get_paragraph_index(), ip_paragraph.get_text())
+                      for ip_paragraph in self.ip_document.get_paragraphs()
+                      if ip_paragraph.get_paragraph_index() >= doc_location.get_paragraph_index()]
+        scanned_matches = document_scanner.find_dictionary_terms(dictionary_version, ignored_terms, paragraphs)
+        if scanned_matches is None:
+            self.analyze(doc_location)
+            return
+        for paragraph_index, match, start, end in scanned_matches:
+            if match not in self.dictionary_terms:
+                continue
+            self._add_result(paragraph_index, match, start, end, doc_location)
+
+    def _add_result(self, paragraph_index, match, start, end, doc_location):
+        if doc_location.get_paragraph_index() == paragraph_index:
+            if start < doc_location.get_start_offset():
+                return
+        sbh_uri = self.dictionary_terms[match]
+        analyze_result = AnalyzeResult(paragraph_index,
+                                       match,
+                                       sbh_uri,
+                                       start,
+                                       end-1)
+        self.result.append(analyze_result)
 
     def remove_first_occurrence(self, paragraph_index, matching_term, sbh_uri, start_offset, end_offset):
         for index in reversed(range(len(self.result))):
@@ -201,6 +259,12 @@ class _AnalyzeDocument(object):
                 removed_item.append(analyze_result)
         return removed_item
 
+    def get_ip_document(self):
+        return self.ip_document
+
+    def set_ip_document(self, ip_document):
+        self.ip_document = ip_document
+
     def get_result(self):
         return self.result
 
@@ -0,0 +1,34 @@
+class DocumentSnapshot(object):
+    """
+    A compact, read-only copy of a document's paragraph text at a given head revision.
+    Provides the same paragraph lookups as IntentParserDocument so that it can be analyzed and spellchecked directly.
+    """
+
+    def __init__(self, head_revision, ip_document):
+        self._head_revision = head_revision
+        self._paragraphs = [_ParagraphText(paragraph.get_paragraph_index(), paragraph.get_text())
+                            for paragraph in ip_document.get_paragraphs()]
+
+    def get_head_revision(self):
+        return self._head_revision
+
+    def get_paragraph(self, index):
+        if index < 0 or index >= len(self._paragraphs):
+            raise IndexError('Getting a paragraph from Document Snapshot has to be within range %d to %d but got %d.' % (0, len(self._paragraphs)-1, index))
+
+        return self._paragraphs[index]
+
+    def get_paragraphs(self):
+        return self._paragraphs
+
+class _ParagraphText(object):
+
+    def __init__(self, paragraph_index, text):
+        self._paragraph_index = paragraph_index
+        self._text = text
+
+    def get_paragraph_index(self):
+        return self._paragraph_index
+
+    def get_text(self):
+        return self._text
@@ -0,0 +1,166 @@
+from flashtext import KeywordProcessor
+from intent_parser.table.cell_parser import CellParser
+from spellchecker import SpellChecker
+import intent_parser.document.spellcheck_document_controller as spellcheck_controller
+import logging
+import multiprocessing
+import threading
+
+class ParallelDocumentScanner(object):
+    """
+    Scans the paragraphs of large documents for dictionary terms and misspelled words in a pool of worker processes,
+    so that the scan does not hold the GIL of the process serving requests.
+    Each worker preloads the dictionary's keyword automaton and the spelling dictionary once.
+    """
+
+    LOGGER = logging.getLogger('parallel_document_scanner')
+    MIN_PARAGRAPHS = 1000
+    PARAGRAPHS_PER_CHUNK = 250
+
+    def __init__(self, number_of_processes):
+        self._number_of_processes = number_of_processes
+        self._dictionary_terms = {}
+        self._dictionary_version = None
+        self._pool = None
+        # Only guards swapping the pool. Scans run on the pool they picked up, without holding the lock.
+        self._pool_lock = threading.Lock()
+
+    def start(self, dictionary_terms, dictionary_version):
+        self._swap_pool(self._create_pool(dictionary_terms), dictionary_terms, dictionary_version)
+
+    def stop(self):
+        old_pool = self._swap_pool(None, {}, None)
+        if old_pool is not None:
+            old_pool.terminate()
+            old_pool.join()
+
+    def update_dictionary_terms(self, dictionary_terms, dictionary_version):
+        """
+        Restart the worker processes with new dictionary terms, once the scanner was started.
+        Meant to be called from the dictionary's listeners, so that no request waits on the new workers to start.
+        Scans that already picked up the old workers finish on them.
+        Args:
+            dictionary_terms: a dictionary mapping terms to their SynBioHub uri.
+            dictionary_version: the version of the dictionary snapshot that dictionary_terms were taken from.
+        """
+        pool, _, current_version = self._get_pool()
+        if pool is None or dictionary_version == current_version:
+            return
+        self.LOGGER.info('Dictionary terms changed. Restarting document scanner processes.')
+        old_pool = self._swap_pool(self._create_pool(dictionary_terms), dictionary_terms, dictionary_version)
+        if old_pool is not None:
+            old_pool.close()
+            old_pool.join()
+
+    def should_scan(self, paragraphs):
+        return self._pool is not None and len(paragraphs) >= self.MIN_PARAGRAPHS
+
+    def find_dictionary_terms(self, dictionary_version, ignored_terms, paragraphs):
+        """
+        Find dictionary terms in paragraphs, skipping the user's ignored terms.
+        Args:
+            dictionary_version: the version of the dictionary snapshot to find terms from.
+            ignored_terms: a list of terms to not match.
+            paragraphs: a list of (paragraph_index, paragraph_text) to scan.
+        Returns:
+            A list of (paragraph_index, term, start_offset, end_offset) in paragraph order.
+            None if the workers hold another version of the dictionary or were stopped, in which case the caller scans the paragraphs itself.
+        """
+        pool, pool_terms, pool_version = self._get_pool()
+        if pool is None or dictionary_version != pool_version:
+            return None
+        ignored_terms = frozenset(term for term in ignored_terms if term in pool_terms)
+        return self._scan(pool,
+                          _find_dictionary_terms_in_chunk,
+                          [(chunk, ignored_terms) for chunk in self._get_chunks(paragraphs)])
+
+    def find_misspelled_words(self, not_misspelled_terms, paragraphs):
+        """
+        Find words that are not in the spelling dictionary or in the user's list of not misspelled terms.
+        Args:
+            not_misspelled_terms: a list of terms the user accepted as correctly spelled.
+            paragraphs: a list of (paragraph_index, paragraph_text) to scan.
+        Returns:
+            A list of (paragraph_index, word, start_offset, end_offset) in paragraph order.
+            None if the workers were stopped, in which case the caller scans the paragraphs itself.
+        """
+        pool, _, _ = self._get_pool()
+        if pool is None:
+            return None
+        acceptable_terms = frozenset(term.lower() for term in not_misspelled_terms)
+        return self._scan(pool,
+                          _find_misspelled_words_in_chunk,
+                          [(chunk, acceptable_terms) for chunk in self._get_chunks(paragraphs)])
+
+    def _scan(self, pool, chunk_function, chunk_arguments):
+        try:
+            chunk_results = pool.starmap(chunk_function, chunk_arguments)
+        except ValueError:
+            # the pool was closed by a restart or stop after it was picked up
+            return None
+        return [match for chunk_result in chunk_results for match in chunk_result]
+
+    def _get_chunks(self, paragraphs):
+        return [paragraphs[index:index + self.PARAGRAPHS_PER_CHUNK]
+                for index in range(0, len(paragraphs), self.PARAGRAPHS_PER_CHUNK)]
+
+    def _get_pool(self):
+        self._pool_lock.acquire()
+        pool = self._pool
+        dictionary_terms = self._dictionary_terms
+        dictionary_version = self._dictionary_version
+        self._pool_lock.release()
+        return pool, dictionary_terms, dictionary_version
+
+    def _swap_pool(self, pool, dictionary_terms, dictionary_version):
+        self._pool_lock.acquire()
+        old_pool = self._pool
+        self._pool = pool
+        self._dictionary_terms = dictionary_terms
+        self._dictionary_version = dictionary_version
+        self._pool_lock.release()
+        return old_pool
+
+    def _create_pool(self, dictionary_terms):
+        # spawn workers instead of forking a server process that is running other threads.
+        context = multiprocessing.get_context('spawn')
+        return context.Pool(processes=self._number_of_processes,
+                            initializer=_initialize_worker,
+                            initargs=(list(dictionary_terms.keys()),))
+
+_MAX_WORKER_KEYWORD_PROCESSORS = 32
+_worker_dictionary_terms = []
+_worker_keyword_processors = {}
+_worker_spellchecker = None
+
+def _initialize_worker(dictionary_terms):
+    global _worker_dictionary_terms, _worker_spellchecker
+    _worker_dictionary_terms = dictionary_terms
+    _get_keyword_processor(frozenset())
+    _worker_spellchecker = SpellChecker()
+
+def _get_keyword_processor(ignored_terms):
+    if ignored_terms not in _worker_keyword_processors:
+        if len(_worker_keyword_processors) >= _MAX_WORKER_KEYWORD_PROCESSORS:
+            _worker_keyword_processors.clear()
+        keyword_processor = KeywordProcessor()
+        keyword_processor.add_keywords_from_list([term for term in _worker_dictionary_terms if term not in ignored_terms])
+        _worker_keyword_processors[ignored_terms] = keyword_processor
+    return _worker_keyword_processors[ignored_terms]
+
+def _find_dictionary_terms_in_chunk(paragraphs, ignored_terms):
+    keyword_processor = _get_keyword_processor(ignored_terms)
+    results = []
+    for paragraph_index, text in paragraphs:
+        for match, start, end in keyword_processor.extract_keywords(text, span_info=True):
+            results.append((paragraph_index, match, start, end))
+    return results
+
+def _find_misspelled_words_in_chunk(paragraphs, acceptable_terms):
+    cell_parser = CellParser()
+    results = []
+    for paragraph_index, text in paragraphs:
+        matches = spellcheck_controller.find_misspelled_words(_worker_spellchecker, text, cell_parser, acceptable_terms)
+        for match, start, end in matches:
+            results.append((paragraph_index, match, start, end))
+    return results
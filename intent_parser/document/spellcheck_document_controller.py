@@ -16,9 +16,10 @@ class SpellcheckDocumentController(object):
     SPELLCHECK_TERMS_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)),
                                          'spellcheck_terms.json')
 
-    def __init__(self):
+    def __init__(self, document_scanner=None):
         self._spellcheck_not_misspelled_terms = {} # map user_id to list of non misspelled terms
         self.spellcheck_documents = {} # map doc_id to a _SpellcheckDocument
+        self._document_scanner = document_scanner
         self._started = False
         self._spellcheck_lock = threading.Lock()
         self._spellcheck_thread = threading.Thread(target=self._periodically_write_user_spellcheck_terms)
@@ -45,12 +46,25 @@ class SpellcheckDocumentController(object):
 
         return results[0]
 
+    def get_spellchecker_results(self, document_id, page_size):
+        """
+        Get up to page_size of the next results to report for a document, without removing them.
+        """
+        if document_id not in self.spellcheck_documents:
+            return []
+
+        spellchecker_document = self.spellcheck_documents[document_id]
+        return spellchecker_document.get_result()[:page_size]
+
     def process_spellchecker(self, document_id, ip_document, user_id, doc_location):
         if not self._started:
             raise IntentParserException(
                 'Spellchecker was not initialized to load non misspelled terms from file.')
         spellchecker_document = self._get_or_create_spellchecker(document_id, ip_document, user_id)
-        spellchecker_document.spellcheck(doc_location)
+        if self._document_scanner is not None and self._document_scanner.should_scan(ip_document.get_paragraphs()):
+            spellchecker_document.spellcheck_in_parallel(doc_location, self._document_scanner)
+        else:
+            spellchecker_document.spellcheck(doc_location)
 
     def remove_spellcheck_result(self, document_id, paragraph_index, matching_term, start_offset, end_offset):
         if document_id not in self.spellcheck_documents:
@@ -84,11 +98,22 @@ class SpellcheckDocumentController(object):
         self._started = False
         self._spellcheck_thread.join()
 
+    def get_document_snapshot(self, document_id):
+        if document_id not in self.spellcheck_documents:
+            return None
+        return self.spellcheck_documents[document_id].get_ip_document()
+
+    def update_document_snapshot(self, document_id, document_snapshot):
+        if document_id not in self.spellcheck_documents:
+            return
+        self.spellcheck_documents[document_id].set_ip_document(document_snapshot)
+
     def _get_or_create_spellchecker(self, document_id, ip_document, user_id):
         spellcheck_document = None
         self._spellcheck_lock.acquire()
         if document_id in self.spellcheck_documents:
             spellcheck_document = self.spellcheck_documents[document_id]
+            spellcheck_document.set_ip_document(ip_document)
         else:
             if user_id in self._spellcheck_not_misspelled_terms:
                 acceptable_terms = self._spellcheck_not_misspelled_terms[user_id]
@@ -141,6 +166,12 @@ class _SpellcheckDocument(object):
         self.not_misspelled_terms = not_misspelled_terms
         self.result = []
 
+    def get_ip_document(self):
+        return self.ip_document
+
+    def set_ip_document(self, ip_document):
+        self.ip_document = ip_document
+
     def get_result(self):
         return self.result
 
@@ -177,27 +208,28 @@ class _SpellcheckDocument(object):
         for ip_paragraph in self.ip_document.get_paragraphs():
             if ip_paragraph.get_paragraph_index() < doc_location.get_paragraph_index():
                 continue
-            text = ip_paragraph.get_text().strip()
-            if not text:
-                continue
-            cell_parser = CellParser()
-            words = []
-            ignore_single_char = [':', '_', ',']
-            for word in text.split():
-                if len(word) == 1 and word in ignore_single_char:
-                    continue
-                if cell_parser.is_name(word):
-                    words.append(word)
-            # words = [word for word in text.split() if cell_parser.is_name(word)]
-            misspelled_words = list(spellchecker.unknown(words))
-            if not misspelled_words:
-                continue
-            self._processed_misspelled_words(misspelled_words, ip_paragraph, doc_location)
-
-    def _processed_misspelled_words(self, unidentified_words, ip_paragraph, doc_location):
-        keyword_processor = KeywordProcessor()
-        keyword_processor.add_keywords_from_list(unidentified_words)
-        match_results = keyword_processor.extract_keywords(ip_paragraph.get_text().strip(), span_info=True)
+            match_results = find_misspelled_words(spellchecker, ip_paragraph.get_text(), CellParser())
+            self._processed_misspelled_words(match_results, ip_paragraph, doc_location)
+
+    def spellcheck_in_parallel(self, doc_location, document_scanner):
+        paragraphs = [ip_paragraph for ip_paragraph in self.ip_document.get_paragraphs()
+                      if ip_paragraph.get_paragraph_index() >= doc_location.get_paragraph_index()]
+        scanned_matches = document_scanner.find_misspelled_words(self.not_misspelled_terms,
+                                                                 [(ip_paragraph.get_paragraph_index(), ip_paragraph.get_text())
+                                                                  for ip_paragraph in paragraphs])
+        if scanned_matches is None:
+            self.spellcheck(doc_location)
+            return
+        paragraph_matches = {}
+        for paragraph_index, match, start, end in scanned_matches:
+            paragraph_matches.setdefault(paragraph_index, []).append((match, start, end))
+        for ip_paragraph in paragraphs:
+            if ip_paragraph.get_paragraph_index() in paragraph_matches:
+                self._processed_misspelled_words(paragraph_matches[ip_paragraph.get_paragraph_index()],
+                                                 ip_paragraph,
+                                                 doc_location)
+
+    def _processed_misspelled_words(self, match_results, ip_paragraph, doc_location):
         for match, start, end in match_results:
             if doc_location.get_paragraph_index() == ip_paragraph.get_paragraph_index():
                 if start < doc_location.get_start_offset():
@@ -209,3 +241,26 @@ class _SpellcheckDocument(object):
                                                  end-1)
 
             self.result.append(spellcheck_result)
+
+def find_misspelled_words(spellchecker, paragraph_text, cell_parser, acceptable_terms=frozenset()):
+    """
+    Find words in a paragraph that are unknown to spellchecker and not in acceptable_terms.
+    Returns a list of (word, start, end) for each occurrence in the stripped paragraph text.
+    """
+    text = paragraph_text.strip()
+    if not text:
+        return []
+    words = []
+    ignore_single_char = [':', '_', ',']
+    for word in text.split():
+        if len(word) == 1 and word in ignore_single_char:
+            continue
+        if cell_parser.is_name(word):
+            words.append(word)
+    # words = [word for word in text.split() if cell_parser.is_name(word)]
+    misspelled_words = [word for word in spellchecker.unknown(words) if word not in acceptable_terms]
+    if not misspelled_words:
+        return []
+    keyword_processor = KeywordProcessor()
+    keyword_processor.add_keywords_from_list(misspelled_words)
+    return keyword_processor.extract_keywords(text, span_info=True)
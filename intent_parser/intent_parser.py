@@ -40,6 +40,7 @@ class IntentParser(object):
         self.validation_warnings = []
         self.experimental_protocol = None
         self.opil_request = None
+        self.opil_lab_protocol = None
         self.table_info = None
         self.ip_tables = None
         self.tables_with_captions = {}
@@ -228,6 +229,9 @@ class IntentParser(object):
     def get_opil_request(self):
         return self.opil_request
 
+    def get_opil_lab_protocol(self):
+        return self.opil_lab_protocol
+
     def get_structured_request(self):
         return self.structured_request
 
@@ -292,7 +296,9 @@ class IntentParser(object):
                 self.validation_warnings.extend([message])
 
             table = lab_tables[-1]
-            lab_table = LabTable(intent_parser_table=table, lab_names=self.catalog_accessor.get_lab_ids())
+            lab_table = LabTable(intent_parser_table=table,
+                                 lab_names=self.catalog_accessor.get_lab_ids(),
+                                 lowercase_lab_names=self.catalog_accessor.get_lowercase_lab_ids())
             lab_table.process_table()
 
         lab_name = lab_table.get_intent().get_lab_name()
@@ -321,6 +327,7 @@ class IntentParser(object):
         self.validation_errors.extend(opil_processor.get_errors())
         self.validation_warnings.extend(opil_processor.get_warnings())
         self.opil_request = opil_processor.get_intent()
+        self.opil_lab_protocol = opil_processor.get_lab_protocol()
 
     def process_structure_request(self):
         filtered_tables = self.get_tables_by_type()
@@ -370,18 +377,14 @@ class IntentParser(object):
 
         # Search SBH to get data
         target_collection = '%s/user/%s/experiment_test/experiment_test_collection/1' % (self.sbh.get_sbh_url(), self.sbh.get_sbh_collection_user())
-        exp_collection = self.sbh.query_experiments(target_collection)
         data = {}
-        for exp in exp_collection:
+        for exp in self.sbh.query_experiments_from_request(target_collection, source_doc_uri):
             exp_uri = exp['uri']
-            timestamp = exp['timestamp']
-            title = exp['title']
-            request_doc = self.sbh.query_experiment_request(exp_uri)
-            if source_doc_uri == request_doc:
-                source_uri = self.sbh.query_experiment_source(exp_uri)  # Get the reference to the source document with lab data
-                data[exp_uri] = {'timestamp': timestamp,
-                                 'agave': source_uri[0],
-                                 'title': title}
+            if exp_uri in data:
+                continue
+            data[exp_uri] = {'timestamp': exp['timestamp'],
+                             'agave': exp['source'],  # reference to the source document with lab data
+                             'title': exp['title']}
 
         exp_data = []
         exp_links = []
@@ -465,7 +468,9 @@ class IntentParser(object):
             self.validation_warnings.append(message)
 
         table = exp_specification_tables[-1]
-        spec_table_parser = ExperimentSpecificationTable(table, self.catalog_accessor.get_lab_ids())
+        spec_table_parser = ExperimentSpecificationTable(table,
+                                                         self.catalog_accessor.get_lab_ids(),
+                                                         lowercase_lab_ids=self.catalog_accessor.get_lowercase_lab_ids())
         spec_table_parser.process_table()
         self.experiment_specification_tables = spec_table_parser
         return spec_table_parser.experiment_id_to_status_table()
@@ -14,15 +14,15 @@ class IntentParserFactory(object):
         self.sbh = sbh 
         self.sbol_dictionary = sbol_dictionary
        
-    def create_lab_experiment(self, document_id, bookmarks={}, local_file_path=None): 
+    def create_lab_experiment(self, document_id, bookmarks={}, local_file_path=None, head_revision=None): 
         lab_experiment = LabExperiment(document_id, bookmarks)
         if local_file_path:
             pass 
         else:  
-            lab_experiment.load_from_google_doc()
+            lab_experiment.load_from_google_doc(head_revision=head_revision)
         return lab_experiment
     
-    def create_intent_parser(self, document_id, bookmarks={}, local_file_path=None):
-        lab_experiment = self.create_lab_experiment(document_id, bookmarks, local_file_path)
+    def create_intent_parser(self, document_id, bookmarks={}, local_file_path=None, head_revision=None):
+        lab_experiment = self.create_lab_experiment(document_id, bookmarks, local_file_path, head_revision)
         return IntentParser(lab_experiment, self.datacatalog_config, self.sbh, self.sbol_dictionary)
 
@@ -19,12 +19,20 @@ class LabExperiment(object):
         self._document_id = document_id
         self._bookmarks = bookmarks
     
-    def load_from_google_doc(self):
+    def load_from_google_doc(self, head_revision=None):
+        """
+        Load the document's content.
+        Args:
+            head_revision: the document's head revision if the caller already read it.
+                Read it before calling so that the content is never older than the revision it is reported under.
+        """
         try:
             doc_accessor = GoogleAccessor().get_google_doc_accessor()
             drive_accessor = GoogleAccessor().get_google_drive_accessor()
+            if head_revision is None:
+                head_revision = drive_accessor.get_head_revision(self._document_id)
             document = doc_accessor.get_document(document_id=self._document_id)
-            self._head_revision = drive_accessor.get_head_revision(self._document_id)
+            self._head_revision = head_revision
             self._links_info = self._get_links_from_doc(document)
             self._paragraphs = self._get_paragraph_from_doc(document)
             self._parents = drive_accessor.get_document_parents(document_id=self._document_id)
@@ -35,6 +43,15 @@ class LabExperiment(object):
             self.logger.warning(''.join(traceback.format_exception(etype=type(ex), value=ex, tb=ex.__traceback__)))
             raise RequestErrorException(HTTPStatus.NOT_FOUND, errors=['Failed to access document ' + self._document_id])
 
+    def load_head_revision_from_google_doc(self):
+        try:
+            drive_accessor = GoogleAccessor().get_google_drive_accessor()
+            self._head_revision = drive_accessor.get_head_revision(self._document_id)
+            return self._head_revision
+        except Exception as ex:
+            self.logger.warning(''.join(traceback.format_exception(etype=type(ex), value=ex, tb=ex.__traceback__)))
+            raise RequestErrorException(HTTPStatus.NOT_FOUND, errors=['Failed to access document ' + self._document_id])
+
     def load_metadata_from_google_doc(self):
         try:
             google_accessor = GoogleAccessor().get_google_drive_accessor()
@@ -1,7 +1,5 @@
 from intent_parser.intent_parser_exceptions import IntentParserException
-from intent_parser.protocols.parameter_field import ParameterField
 import intent_parser.constants.intent_parser_constants as ip_constants
-import opil
 
 
 class LabProtocolAccessor(object):
@@ -54,17 +52,9 @@ class LabProtocolAccessor(object):
         Returns:
             A string representing a protocol ID. An empty string is returned if no protocol ID is assigned.
         """
-        lab_accessor = self._get_lab_accessor(lab_name)
-        opil_document_template = lab_accessor.get_experimental_protocol(protocol_name)
-        protocol_interfaces = opil_document_template.get_protocol_interfaces()
-        if not protocol_interfaces:
-            raise IntentParserException('No lab ProtocolInterface found with protocol name: %s' % protocol_name)
-        if len(protocol_interfaces) > 1:
-            raise IntentParserException('Expecting 1 ProtocolInterface but %d were found' % len(protocol_interfaces))
-
-        protocol_interface = protocol_interfaces[0]
+        protocol_metadata = self.get_protocol_metadata(protocol_name, lab_name)
         if lab_name == ip_constants.LAB_TRANSCRIPTIC:
-            return protocol_interface.strateos_id
+            return protocol_metadata.get_protocol_id()
         return ''
 
     def map_name_to_parameters(self, protocol_name, lab_name):
@@ -76,41 +66,21 @@ class LabProtocolAccessor(object):
         Returns:
             a dictionary mapping name to its parameter
         """
+        protocol_metadata = self.get_protocol_metadata(protocol_name, lab_name)
+        return protocol_metadata.get_parameter_fields()
+
+    def get_protocol_metadata(self, protocol_name, lab_name):
+        """
+        Get parameter fields and protocol id for a lab protocol.
+        Args:
+            protocol_name: name of protocol
+            lab_name: name of lab
+        Returns:
+            a ProtocolMetadata shared by every request for the same version of the protocol.
+        """
         lab_accessor = self._get_lab_accessor(lab_name)
         opil_document_template = lab_accessor.get_experimental_protocol(protocol_name)
-        protocol_interfaces = opil_document_template.get_protocol_interfaces()
-        if not protocol_interfaces:
-            raise IntentParserException('No lab ProtocolInterface found with protocol name: %s' % protocol_name)
-        if len(protocol_interfaces) > 1:
-            raise IntentParserException('Expecting 1 ProtocolInterface but %d were found' % len(protocol_interfaces))
-
-        parameters = {}
-        protocol_interface = protocol_interfaces[0]
-        for opil_parameter in protocol_interface.has_parameter:
-            parameter_name = opil_parameter.name
-            possible_values = []
-            if opil_parameter.default_value:
-                possible_values.append(opil_parameter.default_value)
-
-            if type(opil_parameter) is opil.EnumeratedParameter and opil_parameter.allowed_value:
-                possible_values.extend(opil_parameter.allowed_value)
-
-            if not opil_parameter.required:
-                ip_parameter_field = ParameterField(parameter_name,
-                                                    opil_parameter,
-                                                    valid_values=possible_values)
-                parameters[parameter_name] = ip_parameter_field
-                if opil_parameter.description:
-                    ip_parameter_field.set_description(opil_parameter.description)
-            else:
-                ip_parameter_field = ParameterField(parameter_name,
-                                                    opil_parameter,
-                                                    required=True,
-                                                    valid_values=possible_values)
-                parameters[parameter_name] = ip_parameter_field
-                if opil_parameter.description:
-                    ip_parameter_field.set_description(opil_parameter.description)
-        return parameters
+        return opil_document_template.get_protocol_metadata(protocol_name)
 
     def _get_lab_accessor(self, lab_name):
         if lab_name not in self._lab_accessors:
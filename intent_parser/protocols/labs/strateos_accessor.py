@@ -5,6 +5,8 @@ from intent_parser.protocols.templates.experimental_request_template import Opil
 from transcriptic import Connection
 import intent_parser.constants.intent_parser_constants as ip_constants
 import intent_parser.utils.opil_utils as opil_utils
+import hashlib
+import json
 import logging
 import opil
 import time
@@ -18,7 +20,7 @@ class StrateosAccessor(OpilLabAccessors):
     SYNC_PERIOD = timedelta(minutes=60)
     logger = logging.getLogger('intent_parser_strateos_accessor')
 
-    def __init__(self, credential_path=None, use_cache=True):
+    def __init__(self, credential_path=None, use_cache=True, prebuild_protocols=False):
         super().__init__()
         if credential_path:
             self.strateos_api = Connection.from_file(credential_path)
@@ -26,24 +28,34 @@ class StrateosAccessor(OpilLabAccessors):
             self.strateos_api = Connection.from_default_config()
 
         self._use_cache = use_cache
+        self._prebuild_protocols = prebuild_protocols
         self.protocol_lock = threading.Lock()
-        self._name_to_json = {}
+        # Maps a protocol name to its JSON and the hash of that JSON.
+        # A sync builds a new dictionary and swaps it in, so readers never see a partially synced one.
+        self._name_to_protocol = {}
+        # Converted OPIL templates keyed by protocol id and the hash of the protocol JSON they were converted from
+        self._template_lock = threading.Lock()
+        self._id_to_template = {}
         self._protocol_thread = threading.Thread(target=self._periodically_fetch_protocols)
 
     def get_experiment_id_from_protocol(self, protocol_name):
-        if protocol_name not in self._name_to_json:
+        name_to_protocol = self._name_to_protocol
+        if protocol_name not in name_to_protocol:
             raise IntentParserException('Protocol not supported by Strateos: %s' % protocol_name)
-        protocol = self._name_to_json[protocol_name]
+        protocol, _ = name_to_protocol[protocol_name]
         return protocol['id']
 
     def get_experimental_protocol(self, experimental_request_name):
-        if experimental_request_name not in self._name_to_json:
+        name_to_protocol = self._name_to_protocol
+        if experimental_request_name not in name_to_protocol:
             raise IntentParserException('Protocol not supported by Strateos: %s' % experimental_request_name)
-        protocol = self._name_to_json[experimental_request_name]
-        return self._convert_protocol_to_opil(protocol)
+        protocol, protocol_hash = name_to_protocol[experimental_request_name]
+        if not self._use_cache:
+            return self._convert_protocol_to_opil(protocol)
+        return self._get_cached_protocol(protocol, protocol_hash)
 
     def get_experimental_protocol_names(self):
-        return list(self._name_to_json.keys())
+        return list(self._name_to_protocol.keys())
 
     def start_synchronize_protocols(self):
         self._fetch_protocols()
@@ -64,18 +76,69 @@ class StrateosAccessor(OpilLabAccessors):
         template.load_from_template(opil_doc)
         return template
 
+    def _get_cached_protocol(self, protocol, protocol_hash):
+        cache_key = (protocol['id'], protocol_hash)
+        self._template_lock.acquire()
+        template = self._id_to_template.get(cache_key)
+        self._template_lock.release()
+        if template is None:
+            template = self._convert_protocol_to_opil(protocol)
+            self._template_lock.acquire()
+            self._id_to_template[cache_key] = template
+            self._template_lock.release()
+        return template
+
+    def _hash_protocol(self, protocol):
+        return hashlib.sha256(json.dumps(protocol, sort_keys=True).encode('utf-8')).hexdigest()
+
     def _fetch_protocols(self):
         self.logger.info('Fetching strateos')
         protocol_list = self.strateos_api.get_protocols()
 
+        # only one sync updates protocols at a time while readers keep using the current dictionary.
         self.protocol_lock.acquire()
-        for protocol in protocol_list:
-            self.logger.info('Fetching protocol %s' % protocol['name'])
-            protocol_name = protocol['name']
-            self._name_to_json[protocol_name] = protocol
-        self.protocol_lock.release()
+        try:
+            old_name_to_protocol = self._name_to_protocol
+            new_name_to_protocol = {}
+            changed_protocols = []
+            for protocol in protocol_list:
+                protocol_name = protocol['name']
+                protocol_hash = self._hash_protocol(protocol)
+                if protocol_name in old_name_to_protocol and old_name_to_protocol[protocol_name][1] == protocol_hash:
+                    new_name_to_protocol[protocol_name] = old_name_to_protocol[protocol_name]
+                else:
+                    self.logger.info('Fetching protocol %s' % protocol_name)
+                    new_name_to_protocol[protocol_name] = (protocol, protocol_hash)
+                    changed_protocols.append(protocol_name)
+            removed_protocols = [name for name in old_name_to_protocol if name not in new_name_to_protocol]
+            for protocol_name in removed_protocols:
+                self.logger.info('Removing protocol %s' % protocol_name)
+            self._name_to_protocol = new_name_to_protocol
+        finally:
+            self.protocol_lock.release()
+
+        # drop templates converted from protocols that have since changed or been removed
+        current_keys = set((protocol['id'], protocol_hash) for protocol, protocol_hash in new_name_to_protocol.values())
+        self._template_lock.acquire()
+        for cache_key in list(self._id_to_template.keys()):
+            if cache_key not in current_keys:
+                self._id_to_template.pop(cache_key)
+        self._template_lock.release()
+
+        if self._use_cache and self._prebuild_protocols and changed_protocols:
+            threading.Thread(target=self._prebuild_protocol_templates, args=(changed_protocols,), daemon=True).start()
+
+    def _prebuild_protocol_templates(self, protocol_names):
+        for protocol_name in protocol_names:
+            try:
+                self.get_experimental_protocol(protocol_name)
+            except Exception as err:
+                self.logger.warning('Unable to convert Strateos protocol %s to OPIL: %s' % (protocol_name, err))
 
     def _periodically_fetch_protocols(self):
         while True:
             time.sleep(self.SYNC_PERIOD.total_seconds())
-            self._fetch_protocols()
\ No newline at end of file
+            try:
+                self._fetch_protocols()
+            except Exception as err:
+                self.logger.warning('Unable to sync Strateos protocols: %s' % err)
\ No newline at end of file
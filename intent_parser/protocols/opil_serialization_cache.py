@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from intent_parser.intent_parser_exceptions import IntentParserException
+import intent_parser.constants.intent_parser_constants as ip_constants
+import gzip
+import sbol3
+import threading
+
+# Maps an OPIL format a client can request to its sbol3 serialization and HTTP content type
+OPIL_FORMATS = {ip_constants.OPIL_FORMAT_JSON_LD: (sbol3.JSONLD, 'application/json'),
+                ip_constants.OPIL_FORMAT_N_TRIPLES: (sbol3.NTRIPLES, 'application/n-triples'),
+                ip_constants.OPIL_FORMAT_TURTLE: (sbol3.TURTLE, 'text/turtle')}
+
+def get_content_type(opil_format):
+    return OPIL_FORMATS[opil_format][1]
+
+def serialize_opil(opil_document, opil_format):
+    """
+    Serialize an opil.Document.
+    Args:
+        opil_document: an opil.Document
+        opil_format: one of OPIL_FORMATS
+    Returns:
+        the serialized document as gzip compressed bytes.
+    """
+    if opil_format not in OPIL_FORMATS:
+        raise IntentParserException('OPIL format not supported: %s' % opil_format)
+    sbol_format, _ = OPIL_FORMATS[opil_format]
+    return gzip.compress(opil_document.write_string(sbol_format).encode('utf-8'))
+
+class OpilSerializationCache(object):
+    """
+    Serialized OPIL requests kept per document revision and format.
+    An entry is only reused while the lab still serves the same version of the protocol template it was generated from.
+    Only the latest revision of a document is kept and the least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entries=ip_constants.OPIL_SERIALIZATION_CACHE_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, document_id, head_revision, opil_format, lab_protocol_accessor):
+        """
+        Get a serialized OPIL request.
+        Args:
+            document_id: id of document the OPIL request was generated from
+            head_revision: revision of the document
+            opil_format: one of OPIL_FORMATS
+            lab_protocol_accessor: a LabProtocolAccessor to check the protocol template against
+        Returns:
+            gzip compressed bytes or None if no valid entry is cached.
+        """
+        key = (document_id, head_revision, opil_format)
+        self._lock.acquire()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        self._lock.release()
+        if entry is None:
+            return None
+
+        (lab_name, protocol_name, lab_template), serialized_opil = entry
+        try:
+            current_template = lab_protocol_accessor.load_protocol_interface_from_lab(protocol_name, lab_name)
+        except IntentParserException:
+            current_template = None
+        if current_template is not lab_template:
+            self._lock.acquire()
+            if self._entries.get(key) is entry:
+                self._entries.pop(key)
+            self._lock.release()
+            return None
+        return serialized_opil
+
+    def put(self, document_id, head_revision, opil_format, lab_protocol, opil_document):
+        """
+        Serialize an OPIL request and cache it.
+        Args:
+            document_id: id of document the OPIL request was generated from
+            head_revision: revision of the document
+            opil_format: one of OPIL_FORMATS
+            lab_protocol: the lab name, protocol name and lab OpilDocumentTemplate the OPIL request was generated from
+            opil_document: an opil.Document
+        Returns:
+            the serialized document as gzip compressed bytes.
+        """
+        serialized_opil = serialize_opil(opil_document, opil_format)
+        key = (document_id, head_revision, opil_format)
+        self._lock.acquire()
+        try:
+            for cached_key in list(self._entries.keys()):
+                if cached_key[0] == document_id and cached_key[1] != head_revision:
+                    self._entries.pop(cached_key)
+            self._entries[key] = (lab_protocol, serialized_opil)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        finally:
+            self._lock.release()
+        return serialized_opil
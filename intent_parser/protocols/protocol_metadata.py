@@ -0,0 +1,55 @@
+from intent_parser.intent_parser_exceptions import IntentParserException
+from intent_parser.protocols.parameter_field import ParameterField
+import opil
+
+class ProtocolMetadata(object):
+    """
+    Parameter fields and protocol id of a lab ProtocolInterface.
+    A ProtocolMetadata is built once per protocol template and shared read-only across requests.
+    """
+
+    def __init__(self, protocol_interface):
+        # only ProtocolInterfaces generated from Strateos protocols have a strateos_id
+        self._protocol_id = getattr(protocol_interface, 'strateos_id', '')
+        self._name_to_parameter = {}
+        for opil_parameter in protocol_interface.has_parameter:
+            self._add_parameter_field(opil_parameter)
+
+    @classmethod
+    def from_template(cls, opil_document_template, protocol_name):
+        protocol_interfaces = opil_document_template.get_protocol_interfaces()
+        if not protocol_interfaces:
+            raise IntentParserException('No lab ProtocolInterface found with protocol name: %s' % protocol_name)
+        if len(protocol_interfaces) > 1:
+            raise IntentParserException('Expecting 1 ProtocolInterface but %d were found' % len(protocol_interfaces))
+        return cls(protocol_interfaces[0])
+
+    def get_protocol_id(self):
+        return self._protocol_id
+
+    def get_parameter_fields(self):
+        """
+        Returns:
+            a new dictionary mapping parameter name to its ParameterField.
+        """
+        return dict(self._name_to_parameter)
+
+    def get_required_parameter_names(self):
+        return [name for name, parameter in self._name_to_parameter.items() if parameter.is_required()]
+
+    def _add_parameter_field(self, opil_parameter):
+        parameter_name = opil_parameter.name
+        possible_values = []
+        if opil_parameter.default_value:
+            possible_values.append(opil_parameter.default_value)
+
+        if type(opil_parameter) is opil.EnumeratedParameter and opil_parameter.allowed_value:
+            possible_values.extend(opil_parameter.allowed_value)
+
+        ip_parameter_field = ParameterField(parameter_name,
+                                            opil_parameter,
+                                            required=bool(opil_parameter.required),
+                                            valid_values=tuple(possible_values))
+        if opil_parameter.description:
+            ip_parameter_field.set_description(opil_parameter.description)
+        self._name_to_parameter[parameter_name] = ip_parameter_field
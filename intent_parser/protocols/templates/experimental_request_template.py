@@ -3,6 +3,7 @@ import sbol3
 from intent_parser.intent.measure_property_intent import ReagentIntent, MediaIntent, NamedStringValue
 from intent_parser.intent.parameter_intent import ParameterIntent
 from intent_parser.intent_parser_exceptions import IntentParserException
+from intent_parser.protocols.protocol_metadata import ProtocolMetadata
 from intent_parser.table.controls_table import ControlsTable
 from intent_parser.table.measurement_table import MeasurementTable
 from intent_parser.utils.id_provider import IdProvider
@@ -25,10 +26,39 @@ class OpilDocumentTemplate(object):
         self.opil_experimental_requests = []
         self.opil_protocol_interfaces = []
         self.opil_unidentifieds = []
+        self._identity_to_component = None
+        self._protocol_metadata = None
 
     def get_components(self):
         return self.opil_components
 
+    def get_component_index(self):
+        """
+        Map the identity of each Component in this template to the Component.
+        The index is built on first use and shared by every ExperimentalRequest created from this template.
+        Raises:
+            IntentParserException if more than one Component has the same identity.
+        """
+        if self._identity_to_component is None:
+            identity_to_component = {}
+            for component in self.opil_components:
+                if component.identity in identity_to_component:
+                    raise IntentParserException('conflict mapping Components with same identity.')
+                identity_to_component[component.identity] = component
+            self._identity_to_component = identity_to_component
+        return self._identity_to_component
+
+    def get_protocol_metadata(self, protocol_name):
+        """
+        Get the ProtocolMetadata of this template's ProtocolInterface.
+        The metadata is built on first use so it is dropped together with the template when a lab's template cache changes.
+        Args:
+            protocol_name: name of protocol, used to report a template without exactly one ProtocolInterface.
+        """
+        if self._protocol_metadata is None:
+            self._protocol_metadata = ProtocolMetadata.from_template(self, protocol_name)
+        return self._protocol_metadata
+
     def get_sample_sets(self):
         return self.opil_sample_sets
 
@@ -163,11 +193,18 @@ class ExperimentalRequest(object):
                  experiment_id: str,
                  experiment_ref: str,
                  experiment_ref_url: str):
-        self.opil_components = [component.copy() for component in template.get_components()]
-        self.opil_sample_sets = [component.copy() for component in template.get_sample_sets()]
-        self.opil_experimental_requests = [component.copy() for component in template.get_experimental_requests()]
+        # Objects from the template are shared with other requests and only copied once this request changes them.
+        self._template = template
+        self.opil_components = list(template.get_components())
+        self.opil_sample_sets = list(template.get_sample_sets())
+        self.opil_experimental_requests = list(template.get_experimental_requests())
         self.opil_measurements = []
-        self.opil_protocol_interfaces = [component.copy() for component in template.get_protocol_interfaces()]
+        self.opil_protocol_interfaces = list(template.get_protocol_interfaces())
+        self._shared_object_ids = set(id(opil_object) for opil_objects in [self.opil_components,
+                                                                          self.opil_sample_sets,
+                                                                          self.opil_experimental_requests,
+                                                                          self.opil_protocol_interfaces]
+                                      for opil_object in opil_objects)
         self.opil_parameter_values = []
         self.opil_experiment_parameter_values = []
         self._experiment_id = experiment_id
@@ -197,7 +234,7 @@ class ExperimentalRequest(object):
     def add_variable_features_from_measurement_intents(self, measurement_intents):
         for index in range(len(measurement_intents)):
             measurement_intent = measurement_intents[index]
-            sample_set = self.opil_sample_sets[index]
+            sample_set = self._get_writable_object(self.opil_sample_sets, index)
             # replicates
             if measurement_intent.size_of_replicates() > 0:
                 replicate_values = measurement_intent.get_replicates()
@@ -227,7 +264,7 @@ class ExperimentalRequest(object):
         """
         if len(self.opil_protocol_interfaces) != 1:
             raise IntentParserException('Expecting 1 but got %d opil.ProtocolInterface(s).' % len(self.opil_protocol_interfaces))
-        opil_protocol_interface = self.opil_protocol_interfaces[0]
+        opil_protocol_interface = self._get_writable_object(self.opil_protocol_interfaces, 0)
 
         if parameter_intent.get_xplan_base_dir() is None:
             raise IntentParserException('%s is missing a value' % ip_constants.PARAMETER_BASE_DIR)
@@ -341,7 +378,7 @@ class ExperimentalRequest(object):
         if len(self.opil_experimental_requests) != 1:
             raise IntentParserException('Expecting 1 ExperimentalRequest but %d were found'
                                         % len(self.opil_experimental_requests))
-        experimental_request = self.opil_experimental_requests[0]
+        experimental_request = self._get_writable_object(self.opil_experimental_requests, 0)
         experimental_request.measurements = self.opil_measurements
         experimental_request.sample_set = self.opil_sample_sets
 
@@ -395,7 +432,8 @@ class ExperimentalRequest(object):
         elif len(self.opil_protocol_interfaces) > 1:
             raise IntentParserException('expecting 1 but got %d opil ProtocolInterface.' % len(self.opil_protocol_interfaces))
 
-        opil_protocol_interface = self.opil_protocol_interfaces[0]
+        # parameters are annotated by update_parameter_values
+        opil_protocol_interface = self._get_writable_object(self.opil_protocol_interfaces, 0)
         for parameter in opil_protocol_interface.has_parameter:
             opil_parameter_template = OpilParameterTemplate()
             opil_parameter_template.parameter = parameter
@@ -467,7 +505,7 @@ class ExperimentalRequest(object):
             raise IntentParserException('No Protocol Interface found')
         if len(self.opil_protocol_interfaces) > 1:
             raise IntentParserException('Expecting 1 ProtocolInterface but %d were found.' % len(self.opil_protocol_interfaces))
-        protocol_interface = self.opil_protocol_interfaces[0]
+        protocol_interface = self._get_writable_object(self.opil_protocol_interfaces, 0)
         opil_measurement_intent_pairs = self._map_opil_measurement_to_intent(measurement_intents,
                                                                              protocol_interface.protocol_measurement_type)
         for opil_measurement, intent in opil_measurement_intent_pairs:
@@ -478,7 +516,7 @@ class ExperimentalRequest(object):
                 opil_measurement.time = timepoint_measures
 
     def load_sample_set(self, number_of_sample_sets):
-        protocol_interface = self.opil_protocol_interfaces[0]
+        protocol_interface = self._get_writable_object(self.opil_protocol_interfaces, 0)
         while len(self.opil_sample_sets) < number_of_sample_sets:
             sample_set = opil.SampleSet(identity=self._id_provider.get_unique_sd2_id(),
                                         template=self.sample_template)
@@ -490,17 +528,19 @@ class ExperimentalRequest(object):
             raise IntentParserException(
                 'Expecting 1 ProtocolInterface but found %d.' % len(self.opil_protocol_interfaces))
 
-        uris_to_components = {}
-        for component in self.opil_components:
-            if component.identity not in uris_to_components:
-                uris_to_components[component.identity] = component
-            else:
-                if uris_to_components[component.identity]:
+        uris_to_components = self._template.get_component_index()
+        num_of_template_components = len(self._template.get_components())
+        if len(self.opil_components) > num_of_template_components:
+            uris_to_components = dict(uris_to_components)
+            for component in self.opil_components[num_of_template_components:]:
+                if component.identity in uris_to_components:
                     raise IntentParserException('conflict mapping Components with same identity.')
+                uris_to_components[component.identity] = component
 
+        allowed_samples = set(str(sample_uri) for sample_uri in self.opil_protocol_interfaces[0].allowed_samples)
         unique_templates = []
         for sample in self.opil_sample_sets:
-            if sample.identity not in self.opil_protocol_interfaces[0].allowed_samples:
+            if sample.identity not in allowed_samples:
                 raise IntentParserException('SampleSet not found in ProtocolInterface: %s' % sample.identity)
             str_template = str(sample.template)
             if not sample.template:
@@ -517,19 +557,39 @@ class ExperimentalRequest(object):
         elif len(unique_templates) > 1:
             raise IntentParserException('Expecting 1 SampleSet.template but found %d.' % len(unique_templates))
 
-        self.sample_template = unique_templates.pop()
+        # features are added to the sample template by create_subcomponents_from_template
+        sample_template = unique_templates.pop()
+        sample_template_index = [component.identity for component in self.opil_components].index(sample_template.identity)
+        self.sample_template = self._get_writable_object(self.opil_components, sample_template_index)
+
+    def _get_writable_object(self, opil_objects, index):
+        """
+        Get an object that this request can change.
+        An object shared with the template is replaced in opil_objects by a copy that belongs to this request.
+        """
+        opil_object = opil_objects[index]
+        if id(opil_object) in self._shared_object_ids:
+            opil_object = opil_object.copy()
+            opil_objects[index] = opil_object
+        return opil_object
 
 
     def to_opil(self):
         opil_doc = opil.Document()
-        for component in self.opil_components:
-            opil_doc.add(component)
-        for component in self.opil_sample_sets:
-            opil_doc.add(component)
-        for component in self.opil_experimental_requests:
-            opil_doc.add(component)
-        for component in self.opil_protocol_interfaces:
-            opil_doc.add(component)
+        shared_objects = []
+        for opil_objects in [self.opil_components,
+                             self.opil_sample_sets,
+                             self.opil_experimental_requests,
+                             self.opil_protocol_interfaces]:
+            for opil_object in opil_objects:
+                if id(opil_object) in self._shared_object_ids:
+                    shared_objects.append(opil_object)
+                else:
+                    opil_doc.add(opil_object)
+        # Document.add assigns an object and its children to the document, so objects shared with the template
+        # are only referenced. The document reads them to serialize them and to resolve references to them.
+        # They are referenced last so that adding this request's objects does not search through them.
+        opil_doc.objects.extend(shared_objects)
         return opil_doc
 
     def update_parameter_values(self, document_parameter_names_to_values):
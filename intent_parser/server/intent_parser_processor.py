@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 from intent_parser.protocols.labs.aquarium_opil_accessor import AquariumOpilAccessor
 from intent_parser.accessor.google_accessor import GoogleAccessor
@@ -6,13 +7,18 @@ from intent_parser.accessor.tacc_go_accessor import TACCGoAccessor
 from intent_parser.document.analyze_document_controller import AnalyzeDocumentController
 from intent_parser.document.spellcheck_document_controller import SpellcheckDocumentController
 from intent_parser.document.document_location import DocumentLocation
+from intent_parser.document.document_snapshot import DocumentSnapshot
+from intent_parser.document.parallel_document_scanner import ParallelDocumentScanner
 from intent_parser.document.intent_parser_document_factory import IntentParserDocumentFactory
 from intent_parser.intent_parser_factory import LabExperiment
 from intent_parser.intent_parser_exceptions import RequestErrorException
-from intent_parser.intent_parser_exceptions import IntentParserException, TableException
+from intent_parser.intent_parser_exceptions import DictionaryMaintainerException, IntentParserException, TableException
 from intent_parser.protocols.lab_protocol_accessor import LabProtocolAccessor
+from intent_parser.protocols.opil_serialization_cache import OpilSerializationCache
 from intent_parser.table.intent_parser_table_type import TableType
 from intent_parser.table.table_creator import TableCreator
+import intent_parser.accessor.catalog_accessor as catalog_accessor
+import intent_parser.protocols.opil_serialization_cache as opil_serialization_cache
 import intent_parser.constants.google_api_constants as google_constants
 import intent_parser.constants.intent_parser_constants as intent_parser_constants
 import intent_parser.constants.ip_app_script_constants as ip_addon_constants
@@ -23,6 +29,8 @@ import intent_parser.utils.intent_parser_view as intent_parser_view
 import json
 import logging.config
 import os
+import threading
+import time
 import traceback
 
 class IntentParserProcessor(object):
@@ -36,7 +44,8 @@ class IntentParserProcessor(object):
                  sbh,
                  sbol_dictionary,
                  strateos_accessor,
-                 intent_parser_factory
+                 intent_parser_factory,
+                 document_process_pool_size=0
                  ):
         self.sbh = sbh
         self.sbol_dictionary = sbol_dictionary
@@ -46,11 +55,22 @@ class IntentParserProcessor(object):
 
         self.sparql_similar_query = intent_parser_utils.load_file(os.path.join(os.path.dirname(os.path.realpath(__file__)), 'findSimilar.sparql'))
         self.sparql_similar_count = intent_parser_utils.load_file(os.path.join(os.path.dirname(os.path.realpath(__file__)), 'findSimilarCount.sparql'))
-        self.sparql_similar_count_cache = {}
+        self._sparql_prefetch_executor = ThreadPoolExecutor(max_workers=2)
+
+        # Per document, the lab name and fingerprint of the TA4 status records written to the document's status tables
+        # and the document revision after they were written
+        self._experiment_status_fingerprints = {}
+        self._experiment_status_lock = threading.Lock()
+
+        # Serialized OPIL requests per document revision and format
+        self.opil_serialization_cache = OpilSerializationCache()
+
+        # Large documents are analyzed and spellchecked in worker processes when a pool size is given
+        self.document_scanner = ParallelDocumentScanner(document_process_pool_size) if document_process_pool_size > 0 else None
 
         # Dictionary per-user that stores analyze associations to ignore
-        self.analyze_controller = AnalyzeDocumentController()
-        self.spellcheck_controller = SpellcheckDocumentController()
+        self.analyze_controller = AnalyzeDocumentController(document_scanner=self.document_scanner)
+        self.spellcheck_controller = SpellcheckDocumentController(document_scanner=self.document_scanner)
         self.initialized = False
 
     def initialize_intent_parser_processor(self):
@@ -58,9 +78,17 @@ class IntentParserProcessor(object):
         Initialize the server.
         """
         self.sbol_dictionary.start_synchronizing_spreadsheet()
+        catalog_accessor.CATALOG_REGISTRY.start_synchronizing_catalog()
         self.analyze_controller.start_analyze_controller()
         self.spellcheck_controller.start_spellcheck_controller()
         self.strateos_accessor.start_synchronize_protocols()
+        if self.document_scanner is not None:
+            dictionary_snapshot = self.sbol_dictionary.get_snapshot()
+            self.document_scanner.start(dictionary_snapshot.get_analyzed_terms(), dictionary_snapshot.get_version())
+            self.sbol_dictionary.add_sync_listener(self.document_scanner.update_dictionary_terms)
+            # pick up a change that was published before the listener was added
+            dictionary_snapshot = self.sbol_dictionary.get_snapshot()
+            self.document_scanner.update_dictionary_terms(dictionary_snapshot.get_analyzed_terms(), dictionary_snapshot.get_version())
 
         self.sbh.initialize_sbh()
         self.sbh.set_sbol_dictionary(self.sbol_dictionary)
@@ -85,9 +113,27 @@ class IntentParserProcessor(object):
             raise RequestErrorException(HTTPStatus.BAD_REQUEST, errors=validation_errors, warnings=validation_warnings)
         return intent_parser.get_table_info()
 
-    def process_opil_get_request(self, document_id):
+    def process_opil_get_request(self, document_id, opil_format=intent_parser_constants.OPIL_FORMAT_JSON_LD):
+        """
+        Generate an OPIL request for a document.
+        Args:
+            document_id: id of document
+            opil_format: serialization to generate. One of json-ld, nt, or turtle.
+        Returns:
+            the serialized OPIL request as gzip compressed bytes.
+        """
+        if opil_format not in opil_serialization_cache.OPIL_FORMATS:
+            raise RequestErrorException(HTTPStatus.BAD_REQUEST,
+                                        errors=['OPIL format not supported: %s. Expecting one of: %s' % (opil_format, ', '.join(opil_serialization_cache.OPIL_FORMATS.keys()))])
+
         lab_protocol_accessor = LabProtocolAccessor(self.strateos_accessor, self.aquarium_accessor)
-        intent_parser = self.intent_parser_factory.create_intent_parser(document_id)
+        head_revision = LabExperiment(document_id).load_head_revision_from_google_doc()
+        serialized_opil = self.opil_serialization_cache.get(document_id, head_revision, opil_format, lab_protocol_accessor)
+        if serialized_opil is not None:
+            return serialized_opil
+
+        # the document is read after its head revision, so a cached entry is never older than its revision
+        intent_parser = self.intent_parser_factory.create_intent_parser(document_id, head_revision=head_revision)
         intent_parser.process_opil_request(lab_protocol_accessor)
         opil_doc = intent_parser.get_opil_request()
         validation_warnings = intent_parser.get_validation_warnings()
@@ -97,8 +143,11 @@ class IntentParserProcessor(object):
             errors.extend(validation_errors)
             raise RequestErrorException(HTTPStatus.BAD_REQUEST, errors=errors, warnings=validation_warnings)
 
-        xml_string = opil_doc.write_string('json-ld')
-        return xml_string
+        return self.opil_serialization_cache.put(document_id,
+                                                 head_revision,
+                                                 opil_format,
+                                                 intent_parser.get_opil_lab_protocol(),
+                                                 opil_doc)
 
     def process_opil_post_request(self, http_host, json_body):
         validation_errors = []
@@ -360,20 +409,48 @@ class IntentParserProcessor(object):
 
     def process_analyze_document(self, json_body):
         document_id = intent_parser_utils.get_document_id_from_json_body(json_body)
-        intent_parser = LabExperiment(document_id)
-        doc_factory = IntentParserDocumentFactory()
-        ip_document = doc_factory.from_google_doc(intent_parser.load_from_google_doc())
+        document_snapshot = self._load_document_snapshot(document_id)
+        dictionary_snapshot = self.sbol_dictionary.get_snapshot()
         self.analyze_controller.process_dictionary_terms(document_id,
-                                                         ip_document,
+                                                         document_snapshot,
                                                          self._get_user_id(json_body),
                                                          self._get_or_create_cursor_location(json_body),
-                                                         self.sbol_dictionary.get_analyzed_terms())
+                                                         dictionary_snapshot.get_analyzed_terms(),
+                                                         dictionary_version=dictionary_snapshot.get_version())
 
-        actions = [intent_parser_view.progress_sidebar_dialog()]
-        search_result_action = self._report_current_analyze_term(document_id)
-        actions.extend(search_result_action)
-        actions = {'actions': search_result_action}
-        return actions
+        return self._report_analyze_page(document_id, [], self._get_result_page_size(json_body))
+
+    def _get_result_page_size(self, json_body):
+        if ip_addon_constants.DATA not in json_body or ip_addon_constants.RESULT_PAGE_SIZE not in json_body[ip_addon_constants.DATA]:
+            return 1
+        try:
+            page_size = int(json_body[ip_addon_constants.DATA][ip_addon_constants.RESULT_PAGE_SIZE])
+        except (TypeError, ValueError):
+            page_size = 0
+        if page_size < 1:
+            raise RequestErrorException(HTTPStatus.BAD_REQUEST,
+                                        errors=['%s must be a positive integer.' % ip_addon_constants.RESULT_PAGE_SIZE])
+        return page_size
+
+    def _report_analyze_page(self, document_id, actions, page_size):
+        """
+        Report the current analyze result after the given actions.
+        When page_size is more than one, the next page_size results are also returned so that the sidebar can
+        present them without a round trip per result.
+        """
+        analyze_results = self.analyze_controller.get_analyze_results(document_id, page_size)
+        actions.extend(self._report_current_analyze_term(document_id))
+        response = {'actions': actions}
+        if page_size > 1:
+            search_results = [{intent_parser_constants.SELECTED_PARAGRAPH_INDEX: result.get_paragraph_index(),
+                               intent_parser_constants.SELECTED_START_OFFSET: result.get_start_offset(),
+                               intent_parser_constants.SELECTED_END_OFFSET: result.get_end_offset(),
+                               intent_parser_constants.SELECTED_CONTENT_TERM: result.get_matching_term(),
+                               intent_parser_constants.ANALYZE_TERM: result.get_matching_term(),
+                               intent_parser_constants.ANALYZE_LINK: result.get_sbh_uri()}
+                              for result in analyze_results]
+            response['results'] = {intent_parser_constants.ANALYZE_SEARCH_RESULTS: search_results}
+        return response
 
     def _report_current_analyze_term(self, document_id):
         actions = []
@@ -438,7 +515,7 @@ class IntentParserProcessor(object):
             end_offset = data['selectionEndOffset']
             link_text_action = intent_parser_view.link_text(paragraph_index, offset, end_offset, document_url)
             actions.append(link_text_action)
-        except IntentParserException as err:
+        except (DictionaryMaintainerException, IntentParserException) as err:
             message = err.get_message()
             result = intent_parser_view.operation_failed(message)
             return result
@@ -460,14 +537,11 @@ class IntentParserProcessor(object):
     def _link_all_terms(self, data):
         actions = []
         document_id = intent_parser_utils.get_document_id_from_json_body(data)
-        intent_parser = LabExperiment(document_id)
-        doc_factory = IntentParserDocumentFactory()
-        ip_document = doc_factory.from_google_doc(intent_parser.load_from_google_doc())
-
+        document_snapshot = self._get_document_snapshot(document_id)
 
         dictionary_term = {data['commonName']: data['extra']['link']}
         self.analyze_controller.process_dictionary_terms(document_id,
-                                                         ip_document,
+                                                         document_snapshot,
                                                          'intent_parser',
                                                          self._get_or_create_cursor_location(data),
                                                          dictionary_term)
@@ -539,28 +613,36 @@ class IntentParserProcessor(object):
         document_id = intent_parser_utils.get_document_id_from_json_body(json_body)
         button_data = data[ip_addon_constants.BUTTON_ID]
         button_id = button_data[ip_addon_constants.BUTTON_ID]
+        page_size = self._get_result_page_size(json_body)
         if button_id == intent_parser_constants.ANALYZE_YES:
-            return self.process_analyze_yes(document_id, button_data)
+            return self.process_analyze_yes(document_id, button_data, page_size)
         elif button_id == intent_parser_constants.ANALYZE_YES_TO_ALL:
-            return self.process_analyze_yes_to_all(document_id, button_data)
+            return self.process_analyze_yes_to_all(document_id, button_data, page_size)
         elif button_id == intent_parser_constants.ANALYZE_NO:
-            return self.process_analyze_no(document_id, button_data)
+            return self.process_analyze_no(document_id, button_data, page_size)
         elif button_id == intent_parser_constants.ANALYZE_NO_TO_ALL:
-            return self.process_analyze_no_to_all(document_id, button_data)
+            return self.process_analyze_no_to_all(document_id, button_data, page_size)
         elif button_id == intent_parser_constants.ANALYZE_NEVER_LINK:
             return self.process_analyze_never_link(document_id,
                                                    self._get_user_id(json_body),
-                                                   button_data)
+                                                   button_data,
+                                                   page_size)
+        elif button_id == intent_parser_constants.BATCH_DECISIONS:
+            return self.process_batch_decisions(document_id,
+                                                self._get_user_id(json_body),
+                                                button_data,
+                                                page_size)
         elif button_id == intent_parser_constants.SPELLCHECK_ADD_IGNORE:
-            return self.process_spellcheck_ignore(document_id, button_data)
+            return self.process_spellcheck_ignore(document_id, button_data, page_size)
         elif button_id == intent_parser_constants.SPELLCHECK_ADD_IGNORE_ALL:
-            return self.process_spellcheck_ignore_all(document_id, button_data)
+            return self.process_spellcheck_ignore_all(document_id, button_data, page_size)
         elif button_id == intent_parser_constants.SPELLCHECK_ADD_DICTIONARY:
             return self.process_spellcheck_add_to_dictionary(document_id,
                                                              self._get_user_id(json_body),
-                                                             button_data)
+                                                             button_data,
+                                                             page_size)
         elif button_id == intent_parser_constants.SPELLCHECK_ADD_SYNBIOHUB:
-            return self.process_spellcheck_add_to_synbiohub(document_id, button_data)
+            return self.process_spellcheck_add_to_synbiohub(document_id, button_data, page_size)
         elif button_id == intent_parser_constants.SPELLCHECK_ADD_SELECT_PREVIOUS:
             return self.process_spellcheck_add_previous_word(document_id, button_data)
         elif button_id == intent_parser_constants.SPELLCHECK_ADD_SELECT_NEXT:
@@ -650,21 +732,96 @@ class IntentParserProcessor(object):
         actions = {'actions': actionList}
         return actions
 
-    def process_analyze_yes(self, document_id, data):
+    def process_analyze_yes(self, document_id, data, page_size=1):
+        actions = self._apply_analyze_yes(document_id, data)
+        return self._report_analyze_page(document_id, actions, page_size)
+
+    def process_analyze_yes_to_all(self, document_id, data, page_size=1):
+        actions = self._apply_analyze_yes_to_all(document_id, data)
+        return self._report_analyze_page(document_id, actions, page_size)
+
+    def process_analyze_no(self, document_id, data, page_size=1):
+        actions = self._apply_analyze_no(document_id, data)
+        return self._report_analyze_page(document_id, actions, page_size)
+
+    def process_analyze_no_to_all(self, document_id, data, page_size=1):
+        actions = self._apply_analyze_no_to_all(document_id, data)
+        return self._report_analyze_page(document_id, actions, page_size)
+
+    def process_analyze_never_link(self, document_id: str, user_id: str, data: dict, page_size=1):
+        actions = self._apply_analyze_never_link(document_id, user_id, data)
+        return self._report_analyze_page(document_id, actions, page_size)
+
+    def process_batch_decisions(self, document_id, user_id, data, page_size=1):
+        """
+        Apply a batch of analyze or spellcheck decisions, then report the next results once.
+        Each decision carries the same data as a single button click, including its buttonId.
+        """
+        if ip_addon_constants.DECISIONS not in data or not data[ip_addon_constants.DECISIONS]:
+            raise RequestErrorException(HTTPStatus.BAD_REQUEST,
+                                        errors=['Expected a list of %s to process.' % ip_addon_constants.DECISIONS])
+
+        analyze_decisions = {intent_parser_constants.ANALYZE_YES: lambda decision: self._apply_analyze_yes(document_id, decision),
+                             intent_parser_constants.ANALYZE_YES_TO_ALL: lambda decision: self._apply_analyze_yes_to_all(document_id, decision),
+                             intent_parser_constants.ANALYZE_NO: lambda decision: self._apply_analyze_no(document_id, decision),
+                             intent_parser_constants.ANALYZE_NO_TO_ALL: lambda decision: self._apply_analyze_no_to_all(document_id, decision),
+                             intent_parser_constants.ANALYZE_NEVER_LINK: lambda decision: self._apply_analyze_never_link(document_id, user_id, decision)}
+        spellcheck_decisions = {intent_parser_constants.SPELLCHECK_ADD_IGNORE: lambda decision: self._apply_spellcheck_ignore(document_id, decision),
+                                intent_parser_constants.SPELLCHECK_ADD_IGNORE_ALL: lambda decision: self._apply_spellcheck_ignore_all(document_id, decision),
+                                intent_parser_constants.SPELLCHECK_ADD_DICTIONARY: lambda decision: self._apply_spellcheck_add_to_dictionary(document_id, user_id, decision)}
+
+        selected_result_keys = [intent_parser_constants.SELECTED_PARAGRAPH_INDEX,
+                                intent_parser_constants.SELECTED_CONTENT_TERM,
+                                intent_parser_constants.SELECTED_START_OFFSET,
+                                intent_parser_constants.SELECTED_END_OFFSET]
+        decision_keys = {intent_parser_constants.ANALYZE_YES: selected_result_keys + [intent_parser_constants.ANALYZE_LINK],
+                         intent_parser_constants.ANALYZE_NO: selected_result_keys + [intent_parser_constants.ANALYZE_LINK],
+                         intent_parser_constants.SPELLCHECK_ADD_IGNORE: selected_result_keys}
+
+        decisions = data[ip_addon_constants.DECISIONS]
+        decision_ids = [decision.get(ip_addon_constants.BUTTON_ID) if isinstance(decision, dict) else None for decision in decisions]
+        unsupported_ids = [decision_id for decision_id in decision_ids
+                           if decision_id not in analyze_decisions and decision_id not in spellcheck_decisions]
+        if unsupported_ids:
+            raise RequestErrorException(HTTPStatus.BAD_REQUEST,
+                                        errors=['Button ID %s cannot be submitted as a batch decision.' % decision_id for decision_id in unsupported_ids])
+        is_analyze = all(decision_id in analyze_decisions for decision_id in decision_ids)
+        if not is_analyze and not all(decision_id in spellcheck_decisions for decision_id in decision_ids):
+            raise RequestErrorException(HTTPStatus.BAD_REQUEST,
+                                        errors=['A batch of decisions must come from either analyze or spellcheck, not both.'])
+        # check every decision before applying any so that a malformed batch leaves the session unchanged.
+        missing_key_errors = []
+        for index, (decision_id, decision) in enumerate(zip(decision_ids, decisions)):
+            missing_keys = [key for key in decision_keys.get(decision_id, [intent_parser_constants.SELECTED_CONTENT_TERM])
+                            if key not in decision]
+            if missing_keys:
+                missing_key_errors.append('Decision %d (%s) is missing %s.' % (index, decision_id, ', '.join(missing_keys)))
+        if missing_key_errors:
+            raise RequestErrorException(HTTPStatus.BAD_REQUEST, errors=missing_key_errors)
+
+        actions = []
+        if is_analyze:
+            for decision_id, decision in zip(decision_ids, decisions):
+                actions.extend(analyze_decisions[decision_id](decision))
+            return self._report_analyze_page(document_id, actions, page_size)
+
+        for decision_id, decision in zip(decision_ids, decisions):
+            actions.extend(spellcheck_decisions[decision_id](decision))
+        return self._report_spellcheck_page(document_id, actions, page_size)
+
+    def _apply_analyze_yes(self, document_id, data):
         self.analyze_controller.remove_analyze_result(document_id,
                                                       data[intent_parser_constants.SELECTED_PARAGRAPH_INDEX],
                                                       data[intent_parser_constants.SELECTED_CONTENT_TERM],
                                                       data[intent_parser_constants.ANALYZE_LINK],
                                                       data[intent_parser_constants.SELECTED_START_OFFSET],
                                                       data[intent_parser_constants.SELECTED_END_OFFSET])
-        actions = [intent_parser_view.link_text(data[intent_parser_constants.SELECTED_PARAGRAPH_INDEX],
-                                                data[intent_parser_constants.SELECTED_START_OFFSET],
-                                                data[intent_parser_constants.SELECTED_END_OFFSET],
-                                                data[intent_parser_constants.ANALYZE_LINK])]
-        actions.extend(self._report_current_analyze_term(document_id))
-        return {'actions': actions}
+        return [intent_parser_view.link_text(data[intent_parser_constants.SELECTED_PARAGRAPH_INDEX],
+                                             data[intent_parser_constants.SELECTED_START_OFFSET],
+                                             data[intent_parser_constants.SELECTED_END_OFFSET],
+                                             data[intent_parser_constants.ANALYZE_LINK])]
 
-    def process_analyze_yes_to_all(self, document_id, data):
+    def _apply_analyze_yes_to_all(self, document_id, data):
         matching_terms = self.analyze_controller.remove_analyze_result_with_term(document_id,
                                                                                  data[intent_parser_constants.SELECTED_CONTENT_TERM])
         actions = []
@@ -673,35 +830,27 @@ class IntentParserProcessor(object):
                                                         term.get_start_offset(),
                                                         term.get_end_offset(),
                                                         term.get_sbh_uri()))
-        actions.extend(self._report_current_analyze_term(document_id))
-        return {'actions': actions}
+        return actions
 
-    def process_analyze_no(self, document_id, data):
+    def _apply_analyze_no(self, document_id, data):
         self.analyze_controller.remove_analyze_result(document_id,
                                                       data[intent_parser_constants.SELECTED_PARAGRAPH_INDEX],
                                                       data[intent_parser_constants.SELECTED_CONTENT_TERM],
                                                       data[intent_parser_constants.ANALYZE_LINK],
                                                       data[intent_parser_constants.SELECTED_START_OFFSET],
                                                       data[intent_parser_constants.SELECTED_END_OFFSET])
-        actions = []
-        actions.extend(self._report_current_analyze_term(document_id))
-        return {'actions': actions}
+        return []
 
-    def process_analyze_no_to_all(self, document_id, data):
+    def _apply_analyze_no_to_all(self, document_id, data):
         self.analyze_controller.remove_analyze_result_with_term(document_id,
                                                                 data[intent_parser_constants.SELECTED_CONTENT_TERM])
-        actions = []
-        actions.extend(self._report_current_analyze_term(document_id))
-        return {'actions': actions}
+        return []
 
-    def process_analyze_never_link(self, document_id: str, user_id: str, data: dict):
+    def _apply_analyze_never_link(self, document_id, user_id, data):
         self.analyze_controller.remove_analyze_result_with_term(document_id,
                                                                 data[intent_parser_constants.SELECTED_CONTENT_TERM])
         self.analyze_controller.add_to_ignore_terms(user_id, data[intent_parser_constants.SELECTED_CONTENT_TERM])
-
-        actions = []
-        actions.extend(self._report_current_analyze_term(document_id))
-        return {'actions': actions}
+        return []
 
     def process_search_syn_bio_hub(self, json_body):
         data = json_body['data']
@@ -712,14 +861,6 @@ class IntentParserProcessor(object):
             # Bounds check offset value
             if offset < 0:
                 offset = 0
-            if data['term'] in self.sparql_similar_count_cache:
-                # Ensure offset isn't past the end of the results
-                if offset > int(self.sparql_similar_count_cache[data['term']]) - intent_parser_constants.SPARQL_LIMIT:
-                    offset = max(0, int(self.sparql_similar_count_cache[data['term']]) - intent_parser_constants.SPARQL_LIMIT)
-            else:
-                # Don't allow a non-zero offset if we haven't cached the size of the query
-                if offset > 0:
-                    offset = 0
 
             if 'analyze' in data:
                 analyze = True
@@ -728,7 +869,22 @@ class IntentParserProcessor(object):
                 analyze = False
                 filter_uri = None
 
-            search_results, results_count = self.simple_syn_bio_hub_search(data['term'], offset, filter_uri)
+            search_remote = bool(data.get(ip_addon_constants.SEARCH_REMOTE, False))
+            results_count = None
+            if not search_remote:
+                results_count = self._get_local_similar_count(data['term'], filter_uri)
+            if results_count is None:
+                results_count = self._get_cached_similar_count(data['term'], filter_uri)
+            if results_count is not None:
+                # Ensure offset isn't past the end of the results
+                if offset > int(results_count) - intent_parser_constants.SPARQL_LIMIT:
+                    offset = max(0, int(results_count) - intent_parser_constants.SPARQL_LIMIT)
+            else:
+                # Don't allow a non-zero offset if we haven't cached the size of the query
+                if offset > 0:
+                    offset = 0
+
+            search_results, results_count = self.simple_syn_bio_hub_search(data['term'], offset, filter_uri, search_remote=search_remote)
 
             table_html = ''
             for search_result in search_results:
@@ -847,6 +1003,24 @@ class IntentParserProcessor(object):
                                                                  document_id,
                                                                  is_spellcheck)
 
+    def _report_spellcheck_page(self, document_id, actions, page_size):
+        """
+        Report the current spellcheck result after the given actions.
+        When page_size is more than one, the next page_size results are also returned so that the sidebar can
+        present them without a round trip per result.
+        """
+        spellcheck_results = self.spellcheck_controller.get_spellchecker_results(document_id, page_size)
+        actions.extend(self._report_current_spellchecker_term(document_id))
+        response = {'actions': actions}
+        if page_size > 1:
+            search_results = [{intent_parser_constants.SELECTED_PARAGRAPH_INDEX: result.get_paragraph_index(),
+                               intent_parser_constants.SELECTED_START_OFFSET: result.get_start_offset(),
+                               intent_parser_constants.SELECTED_END_OFFSET: result.get_end_offset(),
+                               intent_parser_constants.SELECTED_CONTENT_TERM: result.get_matching_term()}
+                              for result in spellcheck_results]
+            response['results'] = {intent_parser_constants.ANALYZE_SEARCH_RESULTS: search_results}
+        return response
+
     def _report_current_spellchecker_term(self, document_id: str):
         actions = []
         current_result = self.spellcheck_controller.get_first_spellchecker_result(document_id)
@@ -878,44 +1052,46 @@ class IntentParserProcessor(object):
         is used instead.
         """
         document_id = intent_parser_utils.get_document_id_from_json_body(json_body)
-        intent_parser = LabExperiment(document_id)
-        doc_factory = IntentParserDocumentFactory()
-        ip_document = doc_factory.from_google_doc(intent_parser.load_from_google_doc())
+        document_snapshot = self._load_document_snapshot(document_id)
         self.spellcheck_controller.process_spellchecker(document_id,
-                                                        ip_document,
+                                                        document_snapshot,
                                                         self._get_user_id(json_body),
                                                         self._get_or_create_cursor_location(json_body))
-        search_result_action = self._report_current_spellchecker_term(document_id)
-        actions = {'actions': search_result_action}
-        return actions
+        return self._report_spellcheck_page(document_id, [], self._get_result_page_size(json_body))
+
+    def process_spellcheck_ignore(self, document_id, data, page_size=1):
+        actions = self._apply_spellcheck_ignore(document_id, data)
+        return self._report_spellcheck_page(document_id, actions, page_size)
 
-    def process_spellcheck_ignore(self, document_id, data):
+    def process_spellcheck_ignore_all(self, document_id, data, page_size=1):
+        actions = self._apply_spellcheck_ignore_all(document_id, data)
+        return self._report_spellcheck_page(document_id, actions, page_size)
+
+    def process_spellcheck_add_to_dictionary(self, document_id, user_id, data, page_size=1):
+        actions = self._apply_spellcheck_add_to_dictionary(document_id, user_id, data)
+        return self._report_spellcheck_page(document_id, actions, page_size)
+
+    def _apply_spellcheck_ignore(self, document_id, data):
         self.spellcheck_controller.remove_spellcheck_result(document_id,
                                                             data[intent_parser_constants.SELECTED_PARAGRAPH_INDEX],
                                                             data[intent_parser_constants.SELECTED_CONTENT_TERM],
                                                             data[intent_parser_constants.SELECTED_START_OFFSET],
                                                             data[intent_parser_constants.SELECTED_END_OFFSET])
-        actions = []
-        actions.extend(self._report_current_spellchecker_term(document_id))
-        return {'actions': actions}
+        return []
 
-    def process_spellcheck_ignore_all(self, document_id, data):
+    def _apply_spellcheck_ignore_all(self, document_id, data):
         self.spellcheck_controller.remove_spellcheck_result_with_term(document_id,
                                                                       data[intent_parser_constants.SELECTED_CONTENT_TERM])
-        actions = self._report_current_spellchecker_term(document_id)
-        return {'actions': actions}
+        return []
 
-    def process_spellcheck_add_to_dictionary(self, document_id, user_id, data):
+    def _apply_spellcheck_add_to_dictionary(self, document_id, user_id, data):
         self.spellcheck_controller.remove_spellcheck_result_with_term(document_id,
                                                                       data[intent_parser_constants.SELECTED_CONTENT_TERM])
         self.spellcheck_controller.add_to_spellcheck_terms(user_id,
                                                            data[intent_parser_constants.SELECTED_CONTENT_TERM])
+        return []
 
-        actions = []
-        actions.extend(self._report_current_spellchecker_term(document_id))
-        return {'actions': actions}
-
-    def process_spellcheck_add_to_synbiohub(self, document_id, data):
+    def process_spellcheck_add_to_synbiohub(self, document_id, data, page_size=1):
         item_type_list = []
         for sbol_type in intent_parser_constants.ITEM_TYPES:
             item_type_list += intent_parser_constants.ITEM_TYPES[sbol_type].keys()
@@ -945,17 +1121,15 @@ class IntentParserProcessor(object):
                                                             selection,
                                                             start_offset,
                                                             end_offset)
-        actions = self._report_current_spellchecker_term(document_id)
-        actions.append(dialog_action)
-        return {'actions': actions}
+        response = self._report_spellcheck_page(document_id, [], page_size)
+        response['actions'].append(dialog_action)
+        return response
 
     def process_spellcheck_add_previous_word(self, document_id, data):
-        intent_parser = LabExperiment(document_id)
-        doc_factory = IntentParserDocumentFactory()
-        ip_document = doc_factory.from_google_doc(intent_parser.load_from_google_doc())
+        document_snapshot = self._get_document_snapshot(document_id)
         start_paragraph_index = data[intent_parser_constants.SELECTED_PARAGRAPH_INDEX]
         end_paragraph_index = data[intent_parser_constants.SELECTED_PARAGRAPH_INDEX]
-        selected_paragraph = ip_document.get_paragraph(start_paragraph_index)
+        selected_paragraph = document_snapshot.get_paragraph(start_paragraph_index)
         paragraph_text = selected_paragraph.get_text()
 
         highlight_start_index = data[intent_parser_constants.SELECTED_START_OFFSET]
@@ -976,12 +1150,10 @@ class IntentParserProcessor(object):
         return {'actions': actions}
 
     def process_spellcheck_add_next_word(self, document_id, data):
-        intent_parser = LabExperiment(document_id)
-        doc_factory = IntentParserDocumentFactory()
-        ip_document = doc_factory.from_google_doc(intent_parser.load_from_google_doc())
+        document_snapshot = self._get_document_snapshot(document_id)
         start_paragraph_index = data[intent_parser_constants.SELECTED_PARAGRAPH_INDEX]
         end_paragraph_index = data[intent_parser_constants.SELECTED_PARAGRAPH_INDEX]
-        selected_paragraph = ip_document.get_paragraph(start_paragraph_index)
+        selected_paragraph = document_snapshot.get_paragraph(start_paragraph_index)
         paragraph_text = selected_paragraph.get_text()
 
         highlight_start_index = data[intent_parser_constants.SELECTED_START_OFFSET]
@@ -1003,12 +1175,10 @@ class IntentParserProcessor(object):
         return {'actions': actions}
 
     def process_spellcheck_drop_previous_word(self, document_id, data):
-        intent_parser = LabExperiment(document_id)
-        doc_factory = IntentParserDocumentFactory()
-        ip_document = doc_factory.from_google_doc(intent_parser.load_from_google_doc())
+        document_snapshot = self._get_document_snapshot(document_id)
         start_paragraph_index = data[intent_parser_constants.SELECTED_PARAGRAPH_INDEX]
         end_paragraph_index = data[intent_parser_constants.SELECTED_PARAGRAPH_INDEX]
-        selected_paragraph = ip_document.get_paragraph(start_paragraph_index)
+        selected_paragraph = document_snapshot.get_paragraph(start_paragraph_index)
         paragraph_text = selected_paragraph.get_text()
 
         highlight_start_index = data[intent_parser_constants.SELECTED_START_OFFSET]
@@ -1030,12 +1200,10 @@ class IntentParserProcessor(object):
         return {'actions': actions}
 
     def process_spellcheck_drop_next_word(self, document_id, data):
-        intent_parser = LabExperiment(document_id)
-        doc_factory = IntentParserDocumentFactory()
-        ip_document = doc_factory.from_google_doc(intent_parser.load_from_google_doc())
+        document_snapshot = self._get_document_snapshot(document_id)
         start_paragraph_index = data[intent_parser_constants.SELECTED_PARAGRAPH_INDEX]
         end_paragraph_index = data[intent_parser_constants.SELECTED_PARAGRAPH_INDEX]
-        selected_paragraph = ip_document.get_paragraph(start_paragraph_index)
+        selected_paragraph = document_snapshot.get_paragraph(start_paragraph_index)
         paragraph_text = selected_paragraph.get_text()
 
         highlight_start_index = data[intent_parser_constants.SELECTED_START_OFFSET]
@@ -1055,6 +1223,32 @@ class IntentParserProcessor(object):
                                                              new_highlighted_term)
         return {'actions': actions}
 
+    def _load_document_snapshot(self, document_id, head_revision=None):
+        lab_experiment = LabExperiment(document_id)
+        # read the revision first so that a snapshot is never reported under a revision newer than its content
+        if head_revision is None:
+            head_revision = lab_experiment.load_head_revision_from_google_doc()
+        doc_factory = IntentParserDocumentFactory()
+        ip_document = doc_factory.from_google_doc(lab_experiment.load_from_google_doc(head_revision=head_revision))
+        return DocumentSnapshot(head_revision, ip_document)
+
+    def _get_document_snapshot(self, document_id):
+        """
+        Get the paragraph text of a document from its active spellcheck or analyze session.
+        The document is only downloaded again when there is no session or its head revision has changed.
+        Each call still reads the head revision from Drive, a metadata request that is much smaller than the document.
+        """
+        head_revision = LabExperiment(document_id).load_head_revision_from_google_doc()
+        for controller in [self.spellcheck_controller, self.analyze_controller]:
+            document_snapshot = controller.get_document_snapshot(document_id)
+            if document_snapshot is not None and document_snapshot.get_head_revision() == head_revision:
+                return document_snapshot
+
+        document_snapshot = self._load_document_snapshot(document_id, head_revision)
+        self.spellcheck_controller.update_document_snapshot(document_id, document_snapshot)
+        self.analyze_controller.update_document_snapshot(document_id, document_snapshot)
+        return document_snapshot
+
     def _trim_highlight_left_one_word(self, highlight_start_index, highlight_end_index, paragraph_text):
         new_highlight_start_index = highlight_start_index
         new_highlight_end_index = highlight_end_index
@@ -1283,15 +1477,102 @@ class IntentParserProcessor(object):
                                                         ip_addon_constants.TABLE_TYPE_CONTROLS,
                                                         column_width)
 
-    def process_update_experiment_status(self, document_id):
+    def process_update_experiment_status(self, document_id, db_status=None):
+        """
+        Update the experiment status tables of a document if TA4 has new statuses for it.
+        Args:
+            document_id: id of document
+            db_status: the lab name, status tables and status fingerprint already read from TA4 for the document, if any.
+        """
         try:
-            self._report_experiment_status(document_id)
+            head_revision = LabExperiment(document_id).load_head_revision_from_google_doc()
+            if not self._has_new_experiment_status(document_id, head_revision, db_status):
+                return {'status': 'unchanged', 'messages': []}
+            self._report_experiment_status(document_id, db_status, head_revision=head_revision)
         except (IntentParserException, TableException) as err:
             all_errors = [err.get_message()]
             return {'status': 'updated', 'messages': all_errors}
 
         return {'status': 'updated', 'messages': []}
 
+    def process_update_experiment_statuses(self, json_body):
+        """
+        Update the experiment status tables of many documents, a bounded number at a time.
+        A document that fails to update does not stop the others.
+        """
+        if ip_addon_constants.DOCUMENT_IDS not in json_body:
+            raise RequestErrorException(HTTPStatus.BAD_REQUEST, errors=['Missing %s' % ip_addon_constants.DOCUMENT_IDS])
+
+        document_ids = json_body[ip_addon_constants.DOCUMENT_IDS]
+        doc_id_to_db_status = self._get_experiment_statuses(document_ids)
+        with ThreadPoolExecutor(max_workers=intent_parser_constants.EXPERIMENT_STATUS_SYNC_WORKERS) as executor:
+            futures = {document_id: executor.submit(self._timed_update_experiment_status,
+                                                    document_id,
+                                                    doc_id_to_db_status.get(document_id))
+                       for document_id in document_ids}
+        return {'results': {document_id: future.result() for document_id, future in futures.items()}}
+
+    def _get_experiment_statuses(self, document_ids):
+        """
+        Read TA4 statuses for documents whose status tables were written before with one aggregation per lab.
+        Documents that were never written are left out because their lab is only known from the document.
+        """
+        lab_to_document_ids = {}
+        self._experiment_status_lock.acquire()
+        for document_id in document_ids:
+            if document_id in self._experiment_status_fingerprints:
+                lab_name, _, _ = self._experiment_status_fingerprints[document_id]
+                lab_to_document_ids.setdefault(lab_name, []).append(document_id)
+        self._experiment_status_lock.release()
+
+        doc_id_to_db_status = {}
+        for lab_name, lab_document_ids in lab_to_document_ids.items():
+            try:
+                db_statuses = TA4DBAccessor().get_experiment_statuses(lab_document_ids, lab_name)
+            except Exception as err:
+                # each document reads its own statuses instead
+                self.logger.warning('Unable to read TA4 statuses for %s documents: %s' % (lab_name, err))
+                continue
+            for document_id, (db_exp_id_to_statuses, fingerprint) in db_statuses.items():
+                doc_id_to_db_status[document_id] = (lab_name, db_exp_id_to_statuses, fingerprint)
+        return doc_id_to_db_status
+
+    def _timed_update_experiment_status(self, document_id, db_status=None):
+        start = time.monotonic()
+        try:
+            result = self.process_update_experiment_status(document_id, db_status)
+        except Exception as err:
+            self.logger.error(''.join(traceback.format_exception(etype=type(err),
+                                                                  value=err,
+                                                                  tb=err.__traceback__)))
+            result = {'status': 'failed', 'messages': ['Failed to update experiment status: %s' % err]}
+        result['seconds'] = time.monotonic() - start
+        return result
+
+    def _has_new_experiment_status(self, document_id, head_revision, db_status=None):
+        """
+        Returns:
+            False only if the document is unchanged since its status tables were last written
+            and TA4 has the same statuses for the document's lab.
+        """
+        self._experiment_status_lock.acquire()
+        written_status = self._experiment_status_fingerprints.get(document_id)
+        self._experiment_status_lock.release()
+        if written_status is None:
+            return True
+        lab_name, fingerprint, written_revision = written_status
+        # an edited document may name another lab
+        if head_revision != written_revision:
+            return True
+        if db_status is not None and db_status[0] == lab_name:
+            return db_status[2] != fingerprint
+        return TA4DBAccessor().get_experiment_status_fingerprint(document_id, lab_name) != fingerprint
+
+    def _set_experiment_status_fingerprint(self, document_id, lab_name, fingerprint, head_revision):
+        self._experiment_status_lock.acquire()
+        self._experiment_status_fingerprints[document_id] = (lab_name, fingerprint, head_revision)
+        self._experiment_status_lock.release()
+
     def _create_experiment_specification_table(self, document_id, experiment_specification_table):
         table_creator = TableCreator()
         table_creator.create_experiment_specification_table(document_id, experiment_specification_table)
@@ -1308,15 +1589,18 @@ class IntentParserProcessor(object):
         table_creator = TableCreator()
         table_creator.create_experiment_status_table(document_id, new_table)
 
-    def _report_experiment_status(self, document_id):
-        intent_parser = self.intent_parser_factory.create_intent_parser(document_id)
+    def _report_experiment_status(self, document_id, db_status=None, head_revision=None):
+        intent_parser = self.intent_parser_factory.create_intent_parser(document_id, head_revision=head_revision)
         intent_parser.process_experiment_status_request()
         experiment_status = intent_parser.get_experiment_status_request()
         lab_name = experiment_status[dc_constants.LAB]
         exp_id_to_ref_table = experiment_status[dc_constants.EXPERIMENT_ID]
         ref_table_to_statuses = experiment_status[dc_constants.STATUS_ELEMENT]
 
-        db_exp_id_to_statuses = TA4DBAccessor().get_experiment_status(document_id, lab_name)
+        if db_status is not None and db_status[0] == lab_name:
+            _, db_exp_id_to_statuses, fingerprint = db_status
+        else:
+            db_exp_id_to_statuses, fingerprint = TA4DBAccessor().get_experiment_status_and_fingerprint(document_id, lab_name)
         if not db_exp_id_to_statuses:
             experiment_ref = google_constants.GOOGLE_DOC_URL_PREFIX + document_id
             raise IntentParserException(
@@ -1325,6 +1609,9 @@ class IntentParserProcessor(object):
         if exp_id_to_ref_table:
             self._delete_experiment_status_from_document(intent_parser, document_id)
         self._process_new_experiment_status(db_exp_id_to_statuses, intent_parser, document_id)
+        # writing the tables creates a new revision of the document
+        written_revision = LabExperiment(document_id).load_head_revision_from_google_doc()
+        self._set_experiment_status_fingerprint(document_id, lab_name, fingerprint, written_revision)
 
     def _delete_experiment_status_from_document(self, intent_parser, document_id):
         ip_tables = intent_parser.get_tables_by_type()
@@ -1432,32 +1719,89 @@ class IntentParserProcessor(object):
         if self.strateos_accessor is not None:
             self.strateos_accessor.stop_synchronizing_protocols()
             self.logger.info('Stopped caching Strateos protocols.')
+        catalog_accessor.CATALOG_REGISTRY.stop_synchronizing_catalog()
+        self.logger.info('Stopped caching catalog schemas.')
+        if self.document_scanner is not None:
+            self.document_scanner.stop()
+            self.logger.info('Stopped document scanner processes.')
+        self._sparql_prefetch_executor.shutdown(wait=False)
 
         self.logger.info('Shutdown complete')
 
-    def simple_syn_bio_hub_search(self, term, offset=0, filter_uri=None):
+    def simple_syn_bio_hub_search(self, term, offset=0, filter_uri=None, search_remote=False):
         """
         Search for similar terms in SynbioHub, using the cached sparql similarity query.
         This query requires the specification of a term, a limit on the number of results, and an offset.
+        Terms found in the local index of the SBOL Dictionary are answered without querying SynBioHub unless search_remote is set.
+        Responses are cached and the next page of results is fetched in the background.
         """
-        if filter_uri is None:
-            extra_filter = ''
-        else:
-            extra_filter = 'FILTER( !regex(?member, "%s"))' % filter_uri
-
-        if offset == 0 or term not in self.sparql_similar_count_cache:
-            sparql_count = self.sparql_similar_count.replace('${TERM}', term).replace('${EXTRA_FILTER}', extra_filter)
-            query_results = self.sbh.query(sparql_count)
-            bindings = query_results['results']['bindings']
-            self.sparql_similar_count_cache[term] = bindings[0]['count']['value']
-
-        sparql_query = self.sparql_similar_query.replace('${TERM}', term).replace('${LIMIT}', str(intent_parser_constants.SPARQL_LIMIT)).replace('${OFFSET}', str(offset)).replace('${EXTRA_FILTER}', extra_filter)
-        query_results = self.sbh.query(sparql_query)
+        if not search_remote:
+            search_index = self._get_local_search_index()
+            if search_index is not None:
+                search_results, results_count = search_index.search(term, offset, intent_parser_constants.SPARQL_LIMIT, filter_uri=filter_uri)
+                if results_count > 0:
+                    return search_results, str(results_count)
+
+        results_count = self._get_similar_count(term, filter_uri)
+        search_results = self._get_similar_page(term, offset, filter_uri)
+        next_offset = offset + intent_parser_constants.SPARQL_LIMIT
+        if next_offset < int(results_count):
+            next_page_key = self._get_similar_page_key(term, next_offset, filter_uri)
+            if not self.sbh.is_query_cached(next_page_key):
+                self._sparql_prefetch_executor.submit(self._prefetch_similar_page, term, next_offset, filter_uri)
+        return search_results, results_count
+
+    def _get_similar_count(self, term, filter_uri):
+        sparql_count = self.sparql_similar_count.replace('${TERM}', term).replace('${EXTRA_FILTER}', self._get_similar_filter(filter_uri))
+        query_results = self.sbh.cached_query(('count', term.lower(), filter_uri), sparql_count)
+        bindings = query_results['results']['bindings']
+        return bindings[0]['count']['value']
+
+    def _get_local_search_index(self):
+        if self.sbol_dictionary is None:
+            return None
+        snapshot = self.sbol_dictionary.get_snapshot()
+        if snapshot is None:
+            return None
+        return snapshot.get_search_index()
+
+    def _get_local_similar_count(self, term, filter_uri):
+        search_index = self._get_local_search_index()
+        if search_index is None:
+            return None
+        _, results_count = search_index.search(term, 0, 0, filter_uri=filter_uri)
+        if results_count == 0:
+            return None
+        return str(results_count)
+
+    def _get_cached_similar_count(self, term, filter_uri):
+        cache_key = ('count', term.lower(), filter_uri)
+        if not self.sbh.is_query_cached(cache_key):
+            return None
+        return self._get_similar_count(term, filter_uri)
+
+    def _get_similar_page(self, term, offset, filter_uri):
+        sparql_query = self.sparql_similar_query.replace('${TERM}', term).replace('${LIMIT}', str(intent_parser_constants.SPARQL_LIMIT)).replace('${OFFSET}', str(offset)).replace('${EXTRA_FILTER}', self._get_similar_filter(filter_uri))
+        query_results = self.sbh.cached_query(self._get_similar_page_key(term, offset, filter_uri), sparql_query)
         bindings = query_results['results']['bindings']
         search_results = []
         for binding in bindings:
             title = binding['title']['value']
             target = binding['member']['value']
             search_results.append({'title': title, 'target': target})
+        return search_results
 
-        return search_results, self.sparql_similar_count_cache[term]
+    def _get_similar_page_key(self, term, offset, filter_uri):
+        # findSimilar matches terms case insensitively
+        return 'page', term.lower(), filter_uri, offset, intent_parser_constants.SPARQL_LIMIT
+
+    def _get_similar_filter(self, filter_uri):
+        if filter_uri is None:
+            return ''
+        return 'FILTER( !regex(?member, "%s"))' % filter_uri
+
+    def _prefetch_similar_page(self, term, offset, filter_uri):
+        try:
+            self._get_similar_page(term, offset, filter_uri)
+        except Exception as err:
+            self.logger.warning('Failed to prefetch SynBioHub search results for %s: %s' % (term, err))
@@ -1,4 +1,4 @@
-from flask import Flask, make_response, request, redirect
+from flask import Flask, Response, make_response, request, redirect
 from flask_restful import Api, Resource
 from flasgger import Swagger
 from http import HTTPStatus
@@ -9,6 +9,8 @@ from intent_parser.accessor.intent_parser_sbh import IntentParserSBH
 from intent_parser.protocols.labs.strateos_accessor import StrateosAccessor
 from intent_parser.server.intent_parser_processor import IntentParserProcessor
 import intent_parser.constants.intent_parser_constants as intent_parser_constants
+import intent_parser.protocols.opil_serialization_cache as opil_serialization_cache
+import gzip
 import logging.config
 import traceback
 
@@ -206,6 +208,8 @@ class GetGenerateStructuredRequest(Resource):
 
 
 class GetOpilRequest(Resource):
+    OPIL_CHUNK_SIZE = 64 * 1024
+
     def __init__(self, ip_processor):
         self._ip_processor = ip_processor
 
@@ -219,15 +223,21 @@ class GetOpilRequest(Resource):
               type: string
               required: true
               description: ID of document
+            - in: query
+              name: format
+              type: string
+              enum: [json-ld, nt, turtle]
+              default: json-ld
+              required: false
+              description: Serialization of OPIL. N-Triples and Turtle are faster to generate than JSON-LD.
         responses:
             200:
-                description: Experiment encoded as OPIL.
+                description: Experiment encoded as OPIL. The response is gzip encoded when the client accepts gzip.
         """
         try:
-            opil_output = self._ip_processor.process_opil_get_request(doc_id)
-            response = make_response(opil_output)
-            response.headers['Content-Type'] = 'application/json'
-            return response
+            opil_format = request.args.get(intent_parser_constants.OPIL_FORMAT, intent_parser_constants.OPIL_FORMAT_JSON_LD)
+            compressed_opil = self._ip_processor.process_opil_get_request(doc_id, opil_format)
+            return self._stream_opil(compressed_opil, opil_format)
         except RequestErrorException as err:
             status_code = err.get_http_status()
             res = {"errors": err.get_errors(),
@@ -236,6 +246,26 @@ class GetOpilRequest(Resource):
         except IntentParserException as err:
             return err.get_message(), HTTPStatus.INTERNAL_SERVER_ERROR
 
+    def _stream_opil(self, compressed_opil, opil_format):
+        """
+        Send a serialized OPIL request that is already in memory, in chunks of OPIL_CHUNK_SIZE.
+        The whole payload is generated before the response starts; chunking only bounds each write to the client.
+        Clients that accept gzip get the cached bytes as they are.
+        Other clients get the payload decompressed in memory on every request.
+        """
+        if request.accept_encodings['gzip']:
+            body = compressed_opil
+            headers = {'Content-Encoding': 'gzip'}
+        else:
+            body = gzip.decompress(compressed_opil)
+            headers = {}
+        headers['Content-Length'] = str(len(body))
+        headers['Vary'] = 'Accept-Encoding'
+        chunks = (body[index:index + self.OPIL_CHUNK_SIZE] for index in range(0, len(body), self.OPIL_CHUNK_SIZE))
+        return Response(chunks,
+                        content_type=opil_serialization_cache.get_content_type(opil_format),
+                        headers=headers)
+
 class GetRunExperiment(Resource):
     def __init__(self, ip_processor):
         self._ip_processor = ip_processor
@@ -311,6 +341,11 @@ class PostAddBySpelling(Resource):
                         type: string
                     userEmail:
                         type: string
+                    data:
+                        properties:
+                            resultPageSize:
+                                type: number
+                                description: number of upcoming results to return in results.search_results.
         responses:
             200:
                 description: Result returned as actions performed on a given document.
@@ -387,6 +422,11 @@ class PostAnalyzeDocument(Resource):
                         type: string
                     userEmail:
                         type: string
+                    data:
+                        properties:
+                            resultPageSize:
+                                type: number
+                                description: number of upcoming results to return in results.search_results.
         responses:
             200:
                 description: Result returned as actions performed on a given document.
@@ -408,6 +448,30 @@ class PostButtonClick(Resource):
         self._ip_processor = ip_processor
 
     def post(self):
+        """
+        Processes a button click from the analyze or spellcheck sidebar.
+        ---
+        parameters:
+            - in: body
+              name: body
+              schema:
+                properties:
+                    doc_id:
+                        type: string
+                    userEmail:
+                        type: string
+                    data:
+                        properties:
+                            buttonId:
+                                type: object
+                                description: the clicked button's data. Use buttonId process_batch_decisions with a list of decisions to submit several at once.
+                            resultPageSize:
+                                type: number
+                                description: number of upcoming results to return in results.search_results.
+        responses:
+            200:
+                description: Result returned as actions performed on a given document.
+        """
         try:
             button_response = self._ip_processor.process_button_click(request.get_json())
             return button_response, HTTPStatus.OK
@@ -737,6 +801,9 @@ class PostSearchSynBioHub(Resource):
                                 type: string
                             offset:
                                 type: number
+                            searchRemote:
+                                type: boolean
+                                description: Query SynBioHub even if the term is found in the local SBOL Dictionary index.
         responses:
             200:
                 description: Result returned as actions performed on a given document.
@@ -798,6 +865,38 @@ class PostUpdateExperimentResult(Resource):
         except IntentParserException as err:
             return err.get_message(), HTTPStatus.INTERNAL_SERVER_ERROR
 
+class PostUpdateExperimentStatuses(Resource):
+    def __init__(self, ip_processor):
+        self._ip_processor = ip_processor
+
+    def post(self):
+        """
+        Updates the status of experiments from many documents.
+        ---
+        parameters:
+            - in: body
+              name: body
+              schema:
+                properties:
+                    documentIds:
+                        type: array
+                        items:
+                            type: string
+        responses:
+            200:
+                description: The update result and time taken for each document, keyed by document ID.
+        """
+        try:
+            status_data = self._ip_processor.process_update_experiment_statuses(request.get_json())
+            return status_data, HTTPStatus.OK
+        except RequestErrorException as err:
+            status_code = err.get_http_status()
+            res = {"errors": err.get_errors(),
+                   "warnings": err.get_warnings()}
+            return res, status_code
+        except IntentParserException as err:
+            return err.get_message(), HTTPStatus.INTERNAL_SERVER_ERROR
+
 class PostValidateStructuredRequest(Resource):
     def __init__(self, ip_processor):
         self._ip_processor = ip_processor
@@ -830,12 +929,13 @@ class PostValidateStructuredRequest(Resource):
 
 
 class IntentParserServer(object):
-    def __init__(self, sbh_username, sbh_password, datacatalog_authn, transcriptic_credential):
+    def __init__(self, sbh_username, sbh_password, datacatalog_authn, transcriptic_credential, document_workers=0):
         self.ip_processor = None
         self._sbh_username = sbh_username
         self._sbh_password = sbh_password
         self._datacatalog_authn = datacatalog_authn
         self._transcriptic_credential = transcriptic_credential
+        self._document_workers = document_workers
 
     def initialize(self):
         if self.ip_processor:
@@ -843,9 +943,13 @@ class IntentParserServer(object):
         sbh = IntentParserSBH(self._sbh_username, self._sbh_password)
         sbol_dictionary = SBOLDictionaryAccessor(intent_parser_constants.SD2_SPREADSHEET_ID, sbh)
         datacatalog_config = {"mongodb": {"database": "catalog_staging", "authn": self._datacatalog_authn}}
-        strateos_accessor = StrateosAccessor(self._transcriptic_credential)
+        strateos_accessor = StrateosAccessor(self._transcriptic_credential, prebuild_protocols=True)
         intent_parser_factory = IntentParserFactory(datacatalog_config, sbh, sbol_dictionary)
-        self.ip_processor = IntentParserProcessor(sbh, sbol_dictionary, strateos_accessor, intent_parser_factory)
+        self.ip_processor = IntentParserProcessor(sbh,
+                                                  sbol_dictionary,
+                                                  strateos_accessor,
+                                                  intent_parser_factory,
+                                                  document_process_pool_size=self._document_workers)
         self.ip_processor.initialize_intent_parser_processor()
         self._setup_api_resources()
 
@@ -951,6 +1055,9 @@ class IntentParserServer(object):
         api.add_resource(PostUpdateExperimentResult,
                          '/updateExperimentalResults',
                          resource_class_kwargs={'ip_processor': self.ip_processor})
+        api.add_resource(PostUpdateExperimentStatuses,
+                         '/update_experiment_status',
+                         resource_class_kwargs={'ip_processor': self.ip_processor})
         api.add_resource(PostValidateStructuredRequest,
                          '/validateStructuredRequest',
                          resource_class_kwargs={'ip_processor': self.ip_processor})
@@ -36,6 +36,9 @@ def cmd_parser():
     cmd_parser.add_argument('-u', '--username', nargs='?',
                             required=True, help='SynBioHub username.')
 
+    cmd_parser.add_argument('-w', '--document-workers', nargs='?', type=int, default=0,
+                            required=False, help='Number of processes for analyzing and spellchecking large documents. 0 disables it.')
+
     input_args = cmd_parser.parse_args()
     return input_args
 
@@ -65,7 +68,11 @@ def _setup_logging(
 def main():
     input_args = cmd_parser()
     _setup_logging()
-    ip_server = IntentParserServer(input_args.username, input_args.password, input_args.authn, input_args.transcriptic)
+    ip_server = IntentParserServer(input_args.username,
+                                   input_args.password,
+                                   input_args.authn,
+                                   input_args.transcriptic,
+                                   document_workers=input_args.document_workers)
     ip_server.initialize()
     ip_server.run_server(input_args.bind_host, input_args.bind_port)
 
@@ -18,7 +18,8 @@ def run():
     intent_parser_server = IntentParserServer(os.environ.get("SBH_USERNAME"),
                                              os.environ.get("SBH_PASSWORD"),
                                              os.environ.get("AUTHN"),
-                                             '')
+                                             '',
+                                             document_workers=int(os.environ.get("DOCUMENT_WORKERS", 0)))
     intent_parser_server.initialize()
     return app
 
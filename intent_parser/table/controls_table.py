@@ -14,8 +14,9 @@ class ControlsTable(object):
     """
     _logger = logging.getLogger('intent_parser')
     
-    def __init__(self, intent_parser_table, control_types={}, fluid_units={}, timepoint_units={}, strain_mapping={}):
+    def __init__(self, intent_parser_table, control_types={}, fluid_units={}, timepoint_units={}, strain_mapping={}, control_type_set=None):
         self._control_types = control_types
+        self._control_type_set = frozenset(control_types) if control_type_set is None else control_type_set
         self._fluid_units = fluid_units
         self._strain_mapping = strain_mapping
         self._timepoint_units = timepoint_units
@@ -165,7 +166,7 @@ class ControlsTable(object):
 
     def _process_control_type(self, cell, control, row_index, column_index):
         control_type = cell.get_text().strip()
-        if control_type not in self._control_types:
+        if control_type not in self._control_type_set:
             err = '%s does not match one of the following control types: \n %s' % (control_type, ' ,'.join((map(str, self._control_types))))
             message = 'Controls table at row %d column %d has invalid %s value: %s' % (row_index,
                                                                                        column_index,
@@ -4,7 +4,7 @@ import intent_parser.table.cell_parser as cell_parser
 
 class ExperimentSpecificationTable(object):
 
-    def __init__(self, intent_parser_table=None, lab_ids={}):
+    def __init__(self, intent_parser_table=None, lab_ids={}, lowercase_lab_ids=None):
         if not intent_parser_table:
             self._intent_parser_table = IntentParserTable()
         else:
@@ -14,6 +14,9 @@ class ExperimentSpecificationTable(object):
         self._table_caption = None
         self._experiment_id_to_table_status = {}
         self._lab_names = lab_ids
+        if lowercase_lab_ids is None:
+            lowercase_lab_ids = frozenset(lab.lower() for lab in lab_ids)
+        self._canonicalized_lab_names = lowercase_lab_ids
 
     def experiment_id_to_status_table(self):
         return self._experiment_id_to_table_status
@@ -65,8 +68,7 @@ class ExperimentSpecificationTable(object):
         self._experiment_id_to_table_status[experiment_id] = experiment_status
 
     def _process_experiment_id(self, cell):
-        canonicalized_lab_name = [lab.lower() for lab in self._lab_names]
-        if cell_parser.PARSER.is_experiment_id(cell.get_text(), canonicalized_lab_name):
+        if cell_parser.PARSER.is_experiment_id(cell.get_text(), self._canonicalized_lab_names):
             return cell.get_text().strip()
         else:
             message = 'Experiment Status Table has invalid %s value: %s must follow experiment.lab_name.experiment_id' \
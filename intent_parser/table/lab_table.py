@@ -12,13 +12,16 @@ class LabTable(object):
 
     _logger = logging.getLogger('intent_parser')
 
-    def __init__(self, intent_parser_table=None, lab_names={}):
+    def __init__(self, intent_parser_table=None, lab_names={}, lowercase_lab_names=None):
         if not intent_parser_table:
             self._intent_parser_table = IntentParserTable()
         else:
             self._intent_parser_table = intent_parser_table
         self.lab_intent = LabIntent()
         self._lab_names = lab_names
+        if lowercase_lab_names is None:
+            lowercase_lab_names = frozenset(lab.lower() for lab in lab_names)
+        self._canonicalize_lab_names = lowercase_lab_names
         self._validation_errors = []
         self._validation_warnings = []
         self._table_caption = None
@@ -55,9 +58,8 @@ class LabTable(object):
     def _process_lab_name(self, cell):
         lab_name = cell_parser.PARSER.process_lab_name(cell.get_text())
         if lab_name:
-            canonicalize_lab_names = [lab.lower() for lab in self._lab_names]
             processed_lab_name = lab_name.lower()
-            if processed_lab_name in canonicalize_lab_names:
+            if processed_lab_name in self._canonicalize_lab_names:
                 self.lab_intent.set_lab_id(lab_name)
             else:
                 err = '%s does not match one of the following lab names: \n %s' % (cell.get_text(), ' ,'.join((map(str, self._lab_names))))
@@ -22,12 +22,16 @@ class MeasurementTable(object):
                  fluid_units={},
                  measurement_types={},
                  file_type={},
-                 strain_mapping={}):
+                 strain_mapping={},
+                 measurement_type_set=None,
+                 file_type_set=None):
         self._temperature_units = temperature_units
         self._timepoint_units = timepoint_units
         self._fluid_units = fluid_units
         self._measurement_types = measurement_types
+        self._measurement_type_set = frozenset(measurement_types) if measurement_type_set is None else measurement_type_set
         self._file_type = file_type
+        self._file_type_set = frozenset(file_type) if file_type_set is None else file_type_set
         self._strain_mapping = strain_mapping
 
         self._processed_reagents_and_medias = []
@@ -421,7 +425,7 @@ class MeasurementTable(object):
     def _process_file_type(self, cell, measurement, row_index, column_index):
         file_types = [value for value in cell_parser.PARSER.extract_name_value(cell.get_text())]
         for file_type in file_types:
-            if file_type not in self._file_type:
+            if file_type not in self._file_type_set:
                 err = '%s does not match one of the following file types: \n %s' % (file_type, ' ,'.join((map(str, self._file_type))))
                 message = 'Measurement table at row %d column %d has invalid %s value: %s' % (row_index,
                                                                                               column_index,
@@ -434,7 +438,7 @@ class MeasurementTable(object):
 
     def _process_measurement_type(self, cell, measurement, row_index, column_index):
         measurement_type = cell.get_text().strip()
-        if measurement_type not in self._measurement_types:
+        if measurement_type not in self._measurement_type_set:
             err = '%s does not match one of the following measurement types: \n %s' % (measurement_type, ' ,'.join((map(str, self._measurement_types))))
             message = 'Measurement table at row %d column %d has invalid %s value: %s' % (row_index,
                                                                                           column_index,
@@ -79,6 +79,7 @@ class OpilProcessor(Processor):
         self.measurement_table = None
         self.processed_parameter = None
         self.opil_document = None
+        self.opil_lab_template = None
 
         self._experiment_ref = experiment_ref
         self._experiment_ref_url = experiment_ref_url
@@ -90,6 +91,13 @@ class OpilProcessor(Processor):
     def get_intent(self):
         return self.opil_document
 
+    def get_lab_protocol(self):
+        """
+        Returns:
+            the lab name, protocol name and lab OpilDocumentTemplate the OPIL request was generated from.
+        """
+        return self.processed_lab_name, self.processed_protocol_name, self.opil_lab_template
+
     def process_intent(self, lab_tables=[], control_tables=[], parameter_tables=[], measurement_tables=[]):
         self._process_tables(lab_tables, control_tables, parameter_tables, measurement_tables)
         try:
@@ -123,6 +131,7 @@ class OpilProcessor(Processor):
 
         opil_lab_template = self._lab_protocol_accessor.load_protocol_interface_from_lab(self.processed_protocol_name,
                                                                                          self.processed_lab_name)
+        self.opil_lab_template = opil_lab_template
         experiment_id = self.processed_lab.to_structured_request()[dc_constants.EXPERIMENT_ID]
         experimental_request = ExperimentalRequest(self._get_namespace_from_lab(),
                                                    opil_lab_template,
@@ -1,11 +1,10 @@
+from intent_parser.accessor.catalog_schema_validator import STRUCTURED_REQUEST_VALIDATOR
 from intent_parser.table.table_processor.processor import Processor
 from intent_parser.intent_parser_exceptions import DictionaryMaintainerException, TableException
 from intent_parser.table.controls_table import ControlsTable
 from intent_parser.table.lab_table import LabTable
 from intent_parser.table.measurement_table import MeasurementTable
 from intent_parser.table.parameter_table import ParameterTable
-from jsonschema import validate
-from jsonschema import ValidationError
 import intent_parser.constants.sd2_datacatalog_constants as dc_constants
 import logging
 
@@ -16,7 +15,6 @@ class StructuredRequestProcessor(Processor):
     """
 
     logger = logging.getLogger('structured_request_processor')
-    schema = {'$ref': 'https://schema.catalog.sd2e.org/schemas/structured_request.json'}
 
     def __init__(self, experiment_ref, experiment_ref_url, cp_id, title, doc_revision_id, bookmark_ids, catalog_accessor, sbol_dictionary):
         super().__init__()
@@ -79,7 +77,8 @@ class StructuredRequestProcessor(Processor):
                                            control_types=self.catalog_accessor.get_control_type(),
                                            fluid_units=self.catalog_accessor.get_fluid_units(),
                                            timepoint_units=self.catalog_accessor.get_time_units(),
-                                           strain_mapping=strain_mapping)
+                                           strain_mapping=strain_mapping,
+                                           control_type_set=self.catalog_accessor.get_control_type_set())
             controls_table.process_table()
             control_intents = controls_table.get_intents()
             table_caption = controls_table.get_table_caption()
@@ -100,7 +99,9 @@ class StructuredRequestProcessor(Processor):
                 self.validation_warnings.extend([message])
 
             table = lab_tables[-1]
-            lab_table = LabTable(intent_parser_table=table, lab_names=self.catalog_accessor.get_lab_ids())
+            lab_table = LabTable(intent_parser_table=table,
+                                 lab_names=self.catalog_accessor.get_lab_ids(),
+                                 lowercase_lab_names=self.catalog_accessor.get_lowercase_lab_ids())
             lab_table.process_table()
 
         self.processed_labs = lab_table.get_structured_request()
@@ -126,7 +127,9 @@ class StructuredRequestProcessor(Processor):
                                           fluid_units=self.catalog_accessor.get_fluid_units(),
                                           measurement_types=self.catalog_accessor.get_measurement_types(),
                                           file_type=self.catalog_accessor.get_file_types(),
-                                          strain_mapping=strain_mapping)
+                                          strain_mapping=strain_mapping,
+                                          measurement_type_set=self.catalog_accessor.get_measurement_type_set(),
+                                          file_type_set=self.catalog_accessor.get_file_type_set())
 
             meas_table.process_table(control_data=self.processed_controls, bookmarks=self.bookmark_ids)
 
@@ -158,8 +161,11 @@ class StructuredRequestProcessor(Processor):
         except (DictionaryMaintainerException, TableException) as err:
             self.validation_errors.extend([err.get_message()])
 
-    def validate_schema(self):
-        try:
-            validate(self.request, self.schema)
-        except ValidationError as err:
+    def validate_schema(self, collect_all_errors=False):
+        """
+        Validate the structured request against the catalog's structured request schema.
+        Args:
+            collect_all_errors: report every schema error instead of only the first one.
+        """
+        for err in STRUCTURED_REQUEST_VALIDATOR.validate(self.request, collect_all_errors=collect_all_errors):
             self.validation_errors.append(format(err).replace('\n', '&#13;&#10;'))
\ No newline at end of file
@@ -0,0 +1,90 @@
+from intent_parser.accessor.catalog_accessor import CatalogAccessor, CatalogRegistry
+from unittest.mock import MagicMock
+import intent_parser.accessor.catalog_accessor as catalog_accessor
+import os
+import tempfile
+import time
+import unittest
+
+class CatalogAccessorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.temp_dir.name, 'catalog_schemas.json')
+        self.fetched_urls = []
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _create_registry(self, ttl=60):
+        registry = CatalogRegistry(cache_file=self.cache_file, ttl=ttl)
+        registry._fetch_from_catalog = self._fetch_from_catalog
+        return registry
+
+    def _fetch_from_catalog(self, url):
+        self.fetched_urls.append(url)
+        schema = url.rsplit('/', 1)[-1][:-len('.json')]
+        return {'enum': ['%s_b' % schema, '%s_a' % schema]}
+
+    def test_control_types_are_cached(self):
+        catalog = CatalogAccessor(registry=self._create_registry())
+        self.assertEqual(('control_type_b', 'control_type_a'), catalog.get_control_type())
+        self.assertEqual(('control_type_b', 'control_type_a'), catalog.get_control_type())
+        self.assertEqual(1, len(self.fetched_urls))
+
+    def test_enum_sets_are_shared(self):
+        registry = self._create_registry()
+        first_catalog = CatalogAccessor(registry=registry)
+        second_catalog = CatalogAccessor(registry=registry)
+        self.assertEqual(frozenset(['measurement_type_a', 'measurement_type_b']), first_catalog.get_measurement_type_set())
+        self.assertIs(first_catalog.get_measurement_type_set(), second_catalog.get_measurement_type_set())
+        self.assertEqual(frozenset(['lab_a', 'lab_b']), first_catalog.get_lowercase_lab_ids())
+        self.assertIs(first_catalog.get_lowercase_lab_ids(), second_catalog.get_lowercase_lab_ids())
+        self.assertEqual(2, len(self.fetched_urls))
+
+    def test_accessors_share_registry(self):
+        registry = self._create_registry()
+        CatalogAccessor(registry=registry).get_fluid_units()
+        self.assertEqual(('lab_a', 'lab_b'), CatalogAccessor(registry=registry).get_lab_ids())
+        CatalogAccessor(registry=registry).get_fluid_units()
+        self.assertEqual(2, len(self.fetched_urls))
+
+    def test_start_fetches_all_schemas_and_persists_them(self):
+        registry = self._create_registry()
+        registry.start_synchronizing_catalog()
+        registry.stop_synchronizing_catalog()
+        self.assertEqual(len(catalog_accessor.CATALOG_SCHEMAS), len(self.fetched_urls))
+        self.assertTrue(os.path.exists(self.cache_file))
+
+        self.fetched_urls = []
+        catalog = CatalogAccessor(registry=self._create_registry())
+        self.assertEqual(('time_unit_b', 'time_unit_a'), catalog.get_time_units())
+        self.assertEqual([], self.fetched_urls)
+
+    def test_start_without_catalog_or_cache(self):
+        registry = self._create_registry()
+        registry._fetch_from_catalog = MagicMock(side_effect=ConnectionError('catalog unreachable'))
+        registry.start_synchronizing_catalog()
+        try:
+            self.assertIsNotNone(registry._refresh_thread)
+            with self.assertRaises(ConnectionError):
+                registry.get_enum(catalog_accessor.TIME_UNITS)
+
+            registry._fetch_from_catalog = self._fetch_from_catalog
+            self.assertEqual(('time_unit_b', 'time_unit_a'), registry.get_enum(catalog_accessor.TIME_UNITS))
+        finally:
+            registry.stop_synchronizing_catalog()
+
+    def test_expired_schema_is_served_while_refreshing(self):
+        registry = self._create_registry(ttl=0)
+        catalog = CatalogAccessor(registry=registry)
+        self.assertEqual(('volume_unit_b', 'volume_unit_a'), catalog.get_volume_units())
+        self.assertEqual(('volume_unit_b', 'volume_unit_a'), catalog.get_volume_units())
+        for _ in range(50):
+            if len(self.fetched_urls) == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(2, len(self.fetched_urls))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+from intent_parser.accessor.catalog_schema_validator import CatalogSchemaValidator
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+class CatalogSchemaValidatorTest(unittest.TestCase):
+
+    SCHEMA_URL = 'https://schema.catalog.sd2e.org/schemas/request.json'
+    SCHEMAS = {SCHEMA_URL: {'type': 'object',
+                            'properties': {'lab': {'$ref': 'lab.json'},
+                                           'version': {'type': 'integer'}},
+                            'required': ['lab']},
+               'https://schema.catalog.sd2e.org/schemas/lab.json': {'type': 'string',
+                                                                    'enum': ['Ginkgo', 'Strateos']}}
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.bundle_file = os.path.join(self.temp_dir.name, 'request_bundle.json')
+        self.fetched_urls = []
+        self.validator = CatalogSchemaValidator(self.SCHEMA_URL, bundle_file=self.bundle_file)
+        self.validator._fetch_from_catalog = self._fetch_from_catalog
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _fetch_from_catalog(self, url):
+        self.fetched_urls.append(url)
+        return self.SCHEMAS[url]
+
+    def test_fetch_referenced_schemas_once(self):
+        self.assertEqual([], self.validator.validate({'lab': 'Ginkgo'}))
+        self.assertEqual(1, len(self.validator.validate({'lab': 'TACC'})))
+        self.assertEqual(sorted(self.SCHEMAS.keys()), sorted(self.fetched_urls))
+        with open(self.bundle_file, 'r') as file:
+            self.assertEqual(self.SCHEMAS, json.load(file))
+
+    def test_collect_all_errors(self):
+        errors = self.validator.validate({'lab': 'TACC', 'version': 'one'}, collect_all_errors=True)
+        self.assertEqual([['lab'], ['version']], [list(error.absolute_path) for error in errors])
+
+    def test_rebuild_when_bundle_changes(self):
+        self.validator.validate({'lab': 'Ginkgo'})
+        bundle = dict(self.SCHEMAS)
+        bundle['https://schema.catalog.sd2e.org/schemas/lab.json'] = {'type': 'string', 'enum': ['TACC']}
+        with open(self.bundle_file, 'w') as file:
+            json.dump(bundle, file)
+        os.utime(self.bundle_file, (os.path.getmtime(self.bundle_file) + 1,) * 2)
+
+        self.assertEqual([], self.validator.validate({'lab': 'TACC'}))
+        self.assertEqual(2, len(self.fetched_urls))
+
+    def test_validate_while_refreshing(self):
+        self.validator.validate({'lab': 'Ginkgo'})
+        self.validator._ttl = 0
+        finish_fetch = threading.Event()
+        def fetch_slowly(url):
+            finish_fetch.wait(5)
+            return self._fetch_from_catalog(url)
+        self.validator._fetch_from_catalog = fetch_slowly
+
+        # the first validation starts one refresh and later ones do not wait on it
+        for _ in range(3):
+            self.assertEqual([], self.validator.validate({'lab': 'Ginkgo'}))
+        self.assertTrue(self.validator._refreshing)
+        self.assertEqual(2, len(self.fetched_urls))
+        finish_fetch.set()
+        for _ in range(50):
+            if not self.validator._refreshing:
+                break
+            time.sleep(0.01)
+        self.assertFalse(self.validator._refreshing)
+        self.assertEqual(4, len(self.fetched_urls))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+from intent_parser.accessor.dictionary_search_index import DictionarySearchIndex
+import unittest
+
+class DictionarySearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.search_index = DictionarySearchIndex([('Kanamycin Sulfate', 'https://hub.sd2e.org/user/sd2e/design/Kanamycin_Sulfate/1'),
+                                                   ('beta-estradiol', 'https://hub.sd2e.org/user/sd2e/design/beta0estradiol/1'),
+                                                   ('IPTG', 'https://hub.sd2e.org/user/sd2e/design/IPTG/1'),
+                                                   ('IPTG', 'https://hub.sd2e.org/user/sd2e/design/IPTG/1'),
+                                                   ('Sulfate', 'https://hub.sd2e.org/user/sd2e/design/sulfate_salt/1'),
+                                                   ('', 'https://hub.sd2e.org/user/sd2e/design/empty/1')])
+
+    def test_search_substring_ignores_case(self):
+        results, count = self.search_index.search('SULFATE', 0, 5)
+        self.assertEqual(2, count)
+        self.assertEqual([{'title': 'Kanamycin Sulfate', 'target': 'https://hub.sd2e.org/user/sd2e/design/Kanamycin_Sulfate/1'},
+                          {'title': 'Sulfate', 'target': 'https://hub.sd2e.org/user/sd2e/design/sulfate_salt/1'}],
+                         results)
+
+    def test_search_display_id(self):
+        results, count = self.search_index.search('0estra', 0, 5)
+        self.assertEqual(1, count)
+        self.assertEqual('beta-estradiol', results[0]['title'])
+
+    def test_search_short_term(self):
+        _, count = self.search_index.search('ip', 0, 5)
+        self.assertEqual(1, count)
+        _, count = self.search_index.search('t', 0, 5)
+        self.assertEqual(4, count)
+
+    def test_search_pages_and_filters(self):
+        results, count = self.search_index.search('a', 1, 1)
+        self.assertEqual(3, count)
+        self.assertEqual([{'title': 'Sulfate', 'target': 'https://hub.sd2e.org/user/sd2e/design/sulfate_salt/1'}], results)
+        _, count = self.search_index.search('sulfate', 0, 5, filter_uri='Kanamycin_Sulfate')
+        self.assertEqual(1, count)
+
+    def test_search_missing_term(self):
+        results, count = self.search_index.search('glucose', 0, 5)
+        self.assertEqual(0, count)
+        self.assertEqual([], results)
+
+if __name__ == "__main__":
+    unittest.main()
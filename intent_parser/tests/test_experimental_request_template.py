@@ -0,0 +1,74 @@
+from intent_parser.protocols.templates.experimental_request_template import ExperimentalRequest, OpilDocumentTemplate
+from unittest.mock import patch
+import intent_parser.constants.intent_parser_constants as ip_constants
+import opil
+import sbol3
+import unittest
+
+class ExperimentalRequestTemplateTest(unittest.TestCase):
+
+    def setUp(self):
+        sbol3.set_namespace('http://aquarium.bio/')
+        self.sample_template = sbol3.Component('htc_design', sbol3.SBO_FUNCTIONAL_ENTITY)
+        self.sample_set = opil.SampleSet('htc_samples', template=self.sample_template)
+        self.protocol_interface = opil.ProtocolInterface('htc')
+        self.protocol_interface.allowed_samples = [self.sample_set]
+        self.opil_document = opil.Document()
+        for opil_object in [self.sample_template, self.sample_set, self.protocol_interface]:
+            self.opil_document.add(opil_object)
+        self.template = OpilDocumentTemplate()
+        self.template.load_from_template(self.opil_document)
+
+    def _create_experimental_request(self):
+        experimental_request = ExperimentalRequest(ip_constants.AQUARIUM_NAMESPACE,
+                                                   self.template,
+                                                   'experiment_id',
+                                                   'experiment_ref',
+                                                   'experiment_ref_url')
+        experimental_request.load_experimental_request()
+        experimental_request.load_sample_template_from_protocol_interface()
+        experimental_request.create_subcomponents_from_template()
+        experimental_request.load_sample_set(2)
+        experimental_request.connect_properties()
+        return experimental_request
+
+    def test_template_is_not_modified_by_requests(self):
+        for _ in range(2):
+            experimental_request = self._create_experimental_request()
+            self.assertIsNot(self.sample_template, experimental_request.sample_template)
+            self.assertEqual(1, len(experimental_request.sample_template.features))
+
+        self.assertEqual(0, len(self.sample_template.features))
+        self.assertEqual([self.sample_set.identity], [str(sample) for sample in self.protocol_interface.allowed_samples])
+
+    def test_template_stays_in_its_document(self):
+        with patch.object(sbol3.Identified, 'copy', autospec=True, side_effect=sbol3.Identified.copy) as mock_copy:
+            first_request = self._create_experimental_request()
+            copy_count = mock_copy.call_count
+            first_document = first_request.to_opil()
+            self.assertEqual(copy_count, mock_copy.call_count)
+        second_document = self._create_experimental_request().to_opil()
+
+        for opil_object in [self.sample_template, self.sample_set, self.protocol_interface]:
+            self.assertIs(self.opil_document, opil_object.document)
+        # the template's sample set is not changed by the requests so both documents reference it
+        self.assertIs(self.sample_set, first_document.find(self.sample_set.identity))
+        self.assertIs(self.sample_set, second_document.find(self.sample_set.identity))
+        self.assertIsNot(first_document.find(self.sample_template.identity), second_document.find(self.sample_template.identity))
+        self.assertIs(first_document, first_document.find(self.sample_template.identity).document)
+
+    def test_shared_objects_are_serialized(self):
+        experimental_request = self._create_experimental_request()
+        copied_document = opil.Document()
+        for opil_object in (experimental_request.opil_components + experimental_request.opil_sample_sets +
+                            experimental_request.opil_experimental_requests + experimental_request.opil_protocol_interfaces):
+            copied_document.add(opil_object.copy())
+        self.assertEqual(copied_document.write_string(sbol3.SORTED_NTRIPLES),
+                         experimental_request.to_opil().write_string(sbol3.SORTED_NTRIPLES))
+
+    def test_component_index_is_built_once(self):
+        self.assertIs(self.template.get_component_index(), self.template.get_component_index())
+        self.assertIs(self.sample_template, self.template.get_component_index()[self.sample_template.identity])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,231 @@
+from http import HTTPStatus
+from intent_parser.document.analyze_document_controller import _AnalyzeDocument
+from intent_parser.document.document_location import DocumentLocation
+from intent_parser.document.document_snapshot import DocumentSnapshot
+from intent_parser.document.intent_parser_document import IntentParserDocument
+from intent_parser.document.spellcheck_document_controller import _SpellcheckDocument
+from intent_parser.intent_parser_exceptions import RequestErrorException
+from intent_parser.server.intent_parser_processor import IntentParserProcessor
+from unittest.mock import MagicMock, patch
+import intent_parser.constants.intent_parser_constants as ip_constants
+import intent_parser.constants.sd2_datacatalog_constants as dc_constants
+import intent_parser.constants.ip_app_script_constants as ip_addon_constants
+import intent_parser.utils.intent_parser_view as intent_parser_view
+import time
+import unittest
+
+class IntentParserProcessorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.intent_parser_factory = MagicMock()
+        self.processor = IntentParserProcessor(MagicMock(), MagicMock(), MagicMock(), self.intent_parser_factory)
+        ta4_patcher = patch('intent_parser.server.intent_parser_processor.TA4DBAccessor')
+        self.ta4_db_accessor = ta4_patcher.start().return_value
+        self.addCleanup(ta4_patcher.stop)
+        lab_experiment_patcher = patch('intent_parser.server.intent_parser_processor.LabExperiment')
+        self.lab_experiment = lab_experiment_patcher.start().return_value
+        self.lab_experiment.load_head_revision_from_google_doc.return_value = 'rev1'
+        self.addCleanup(lab_experiment_patcher.stop)
+
+    def test_unchanged_statuses_are_read_with_one_lookup_per_lab(self):
+        self.processor._set_experiment_status_fingerprint('doc1', 'Ginkgo', 'fingerprint1', 'rev1')
+        self.processor._set_experiment_status_fingerprint('doc2', 'Ginkgo', 'fingerprint2', 'rev1')
+        self.ta4_db_accessor.get_experiment_statuses.return_value = {'doc1': ({'experiment.ginkgo.1': MagicMock()}, 'fingerprint1'),
+                                                                     'doc2': ({'experiment.ginkgo.2': MagicMock()}, 'fingerprint2')}
+        response = self.processor.process_update_experiment_statuses({ip_addon_constants.DOCUMENT_IDS: ['doc1', 'doc2']})
+
+        self.assertEqual('unchanged', response['results']['doc1']['status'])
+        self.assertEqual('unchanged', response['results']['doc2']['status'])
+        self.ta4_db_accessor.get_experiment_statuses.assert_called_once_with(['doc1', 'doc2'], 'Ginkgo')
+        self.ta4_db_accessor.get_experiment_status_fingerprint.assert_not_called()
+        self.intent_parser_factory.create_intent_parser.assert_not_called()
+
+    def test_failed_batch_lookup_falls_back_to_each_document(self):
+        self.processor._set_experiment_status_fingerprint('doc1', 'Ginkgo', 'fingerprint1', 'rev1')
+        self.ta4_db_accessor.get_experiment_statuses.side_effect = ConnectionError('connection reset')
+        self.ta4_db_accessor.get_experiment_status_fingerprint.return_value = 'fingerprint1'
+        response = self.processor.process_update_experiment_statuses({ip_addon_constants.DOCUMENT_IDS: ['doc1']})
+
+        self.assertEqual('unchanged', response['results']['doc1']['status'])
+        self.ta4_db_accessor.get_experiment_status_fingerprint.assert_called_once_with('doc1', 'Ginkgo')
+
+    def test_edited_document_is_updated(self):
+        self.processor._set_experiment_status_fingerprint('doc1', 'Ginkgo', 'fingerprint1', 'rev1')
+        self.ta4_db_accessor.get_experiment_statuses.return_value = {'doc1': ({'experiment.ginkgo.1': MagicMock()}, 'fingerprint1')}
+        self.lab_experiment.load_head_revision_from_google_doc.return_value = 'rev2'
+        self.processor._report_experiment_status = MagicMock()
+        response = self.processor.process_update_experiment_statuses({ip_addon_constants.DOCUMENT_IDS: ['doc1']})
+
+        self.assertEqual('updated', response['results']['doc1']['status'])
+        self.processor._report_experiment_status.assert_called_once_with('doc1',
+                                                                          ('Ginkgo', self.ta4_db_accessor.get_experiment_statuses.return_value['doc1'][0], 'fingerprint1'),
+                                                                          head_revision='rev2')
+
+    def test_written_revision_is_recorded(self):
+        intent_parser = self.intent_parser_factory.create_intent_parser.return_value
+        intent_parser.get_experiment_status_request.return_value = {dc_constants.LAB: 'Transcriptic',
+                                                                   dc_constants.EXPERIMENT_ID: {},
+                                                                   dc_constants.STATUS_ELEMENT: {}}
+        self.ta4_db_accessor.get_experiment_status_and_fingerprint.return_value = ({'experiment.transcriptic.1': MagicMock()}, 'fingerprint1')
+        self.processor._process_new_experiment_status = MagicMock()
+        self.lab_experiment.load_head_revision_from_google_doc.side_effect = ['rev1', 'rev2']
+        self.assertEqual('updated', self.processor.process_update_experiment_status('doc1')['status'])
+
+        self.intent_parser_factory.create_intent_parser.assert_called_once_with('doc1', head_revision='rev1')
+        self.ta4_db_accessor.get_experiment_status_and_fingerprint.assert_called_once_with('doc1', 'Transcriptic')
+        self.assertEqual(('Transcriptic', 'fingerprint1', 'rev2'), self.processor._experiment_status_fingerprints['doc1'])
+
+    def test_failed_document_does_not_stop_others(self):
+        def update_status(document_id, db_status=None):
+            if document_id == 'doc2':
+                raise ConnectionError('connection reset')
+            time.sleep(0.01)
+            return {'status': 'updated', 'messages': []}
+        self.processor.process_update_experiment_status = MagicMock(side_effect=update_status)
+        response = self.processor.process_update_experiment_statuses({ip_addon_constants.DOCUMENT_IDS: ['doc1', 'doc2', 'doc3']})
+
+        results = response['results']
+        self.assertEqual(['doc1', 'doc2', 'doc3'], sorted(results.keys()))
+        self.assertEqual('updated', results['doc1']['status'])
+        self.assertEqual('failed', results['doc2']['status'])
+        self.assertIn('connection reset', results['doc2']['messages'][0])
+        self.assertEqual('updated', results['doc3']['status'])
+        for document_id in ['doc1', 'doc3']:
+            self.assertGreaterEqual(results[document_id]['seconds'], 0.01)
+        self.assertGreaterEqual(results['doc2']['seconds'], 0)
+
+    def test_missing_document_ids(self):
+        with self.assertRaises(RequestErrorException):
+            self.processor.process_update_experiment_statuses({})
+
+    @patch('intent_parser.server.intent_parser_processor.LabProtocolAccessor')
+    @patch('intent_parser.server.intent_parser_processor.LabExperiment')
+    def test_opil_request_reads_head_revision_once(self, mock_lab_experiment, mock_lab_protocol_accessor):
+        mock_lab_experiment.return_value.load_head_revision_from_google_doc.return_value = 'rev1'
+        lab_template = object()
+        mock_lab_protocol_accessor.return_value.load_protocol_interface_from_lab.return_value = lab_template
+        intent_parser = self.intent_parser_factory.create_intent_parser.return_value
+        intent_parser.get_validation_errors.return_value = []
+        intent_parser.get_opil_lab_protocol.return_value = ('Ginkgo', 'Growth Curve', lab_template)
+        intent_parser.get_opil_request.return_value.write_string.return_value = '<opil>'
+
+        first_opil = self.processor.process_opil_get_request('doc1', ip_constants.OPIL_FORMAT_TURTLE)
+        self.intent_parser_factory.create_intent_parser.assert_called_once_with('doc1', head_revision='rev1')
+        self.assertIs(first_opil, self.processor.process_opil_get_request('doc1', ip_constants.OPIL_FORMAT_TURTLE))
+        self.assertEqual(1, self.intent_parser_factory.create_intent_parser.call_count)
+        self.assertEqual(2, mock_lab_experiment.return_value.load_head_revision_from_google_doc.call_count)
+
+    def _create_document_snapshot(self, head_revision, texts):
+        ip_document = IntentParserDocument()
+        for paragraph_index, text in enumerate(texts):
+            paragraph = MagicMock()
+            paragraph.get_paragraph_index.return_value = paragraph_index
+            paragraph.get_text.return_value = text
+            ip_document.add_paragraph(paragraph)
+        return DocumentSnapshot(head_revision, ip_document)
+
+    def _start_analyze_session(self, document_id):
+        dictionary_terms = {'IPTG': 'https://sbh/iptg', 'Kan': 'https://sbh/kan'}
+        document_snapshot = self._create_document_snapshot('rev1', ['Grow with IPTG and Kan\n', 'Add Kan and IPTG\n'])
+        analyze_document = _AnalyzeDocument(document_id, document_snapshot, dictionary_terms)
+        analyze_document.analyze(DocumentLocation())
+        self.processor.analyze_controller.analyzed_documents[document_id] = analyze_document
+        return analyze_document
+
+    def _create_decision(self, button_id, result):
+        return {ip_addon_constants.BUTTON_ID: button_id,
+                ip_constants.SELECTED_PARAGRAPH_INDEX: result.get_paragraph_index(),
+                ip_constants.SELECTED_CONTENT_TERM: result.get_matching_term(),
+                ip_constants.SELECTED_START_OFFSET: result.get_start_offset(),
+                ip_constants.SELECTED_END_OFFSET: result.get_end_offset(),
+                ip_constants.ANALYZE_LINK: result.get_sbh_uri()}
+
+    def test_batch_analyze_decisions(self):
+        analyze_document = self._start_analyze_session('doc1')
+        first_iptg, first_kan, second_kan, second_iptg = list(analyze_document.get_result())
+        decisions = [self._create_decision(ip_constants.ANALYZE_YES, first_iptg),
+                     self._create_decision(ip_constants.ANALYZE_NO_TO_ALL, first_kan)]
+        response = self.processor.process_batch_decisions('doc1', 'user1', {ip_addon_constants.DECISIONS: decisions}, page_size=5)
+
+        self.assertEqual(intent_parser_view.link_text(first_iptg.get_paragraph_index(),
+                                                      first_iptg.get_start_offset(),
+                                                      first_iptg.get_end_offset(),
+                                                      first_iptg.get_sbh_uri()),
+                         response['actions'][0])
+        self.assertEqual([second_iptg], analyze_document.get_result())
+        search_results = response['results'][ip_constants.ANALYZE_SEARCH_RESULTS]
+        self.assertEqual([(1, 'IPTG')], [(result[ip_constants.SELECTED_PARAGRAPH_INDEX], result[ip_constants.SELECTED_CONTENT_TERM])
+                                         for result in search_results])
+
+    def test_batch_decisions_must_come_from_one_sidebar(self):
+        analyze_document = self._start_analyze_session('doc1')
+        analyze_result = analyze_document.get_result()[0]
+        for decisions in [[], [self._create_decision('process_nop', analyze_result)],
+                          [self._create_decision(ip_constants.ANALYZE_YES, analyze_result),
+                           self._create_decision(ip_constants.SPELLCHECK_ADD_IGNORE, analyze_result)]]:
+            with self.assertRaises(RequestErrorException):
+                self.processor.process_batch_decisions('doc1', 'user1', {ip_addon_constants.DECISIONS: decisions})
+        self.assertEqual(4, len(analyze_document.get_result()))
+
+    def test_malformed_batch_is_not_applied(self):
+        analyze_document = self._start_analyze_session('doc1')
+        first_iptg, first_kan, _, _ = list(analyze_document.get_result())
+        malformed_decision = self._create_decision(ip_constants.ANALYZE_NO, first_kan)
+        del malformed_decision[ip_constants.SELECTED_START_OFFSET]
+        for decisions in [[self._create_decision(ip_constants.ANALYZE_YES_TO_ALL, first_iptg), malformed_decision],
+                          [self._create_decision(ip_constants.ANALYZE_YES, first_iptg), 'not a decision']]:
+            with self.assertRaises(RequestErrorException) as context:
+                self.processor.process_batch_decisions('doc1', 'user1', {ip_addon_constants.DECISIONS: decisions})
+            self.assertEqual(HTTPStatus.BAD_REQUEST, context.exception.get_http_status())
+        self.assertEqual(4, len(analyze_document.get_result()))
+
+    def test_result_page_size(self):
+        self._start_analyze_session('doc1')
+        self.assertNotIn('results', self.processor._report_analyze_page('doc1', [], 1))
+        self.assertEqual(2, len(self.processor._report_analyze_page('doc1', [], 2)['results'][ip_constants.ANALYZE_SEARCH_RESULTS]))
+        self.assertEqual(4, len(self.processor._report_analyze_page('doc1', [], 10)['results'][ip_constants.ANALYZE_SEARCH_RESULTS]))
+
+        document_snapshot = self._create_document_snapshot('rev1', ['Teh strian grew\n', 'in teh ploate\n'])
+        spellcheck_document = _SpellcheckDocument('doc1', document_snapshot)
+        spellcheck_document.spellcheck(DocumentLocation())
+        self.processor.spellcheck_controller.spellcheck_documents['doc1'] = spellcheck_document
+        self.assertNotIn('results', self.processor._report_spellcheck_page('doc1', [], 1))
+        search_results = self.processor._report_spellcheck_page('doc1', [], 3)['results'][ip_constants.ANALYZE_SEARCH_RESULTS]
+        self.assertEqual(3, len(search_results))
+        self.assertEqual(['teh', 'strian'], [result[ip_constants.SELECTED_CONTENT_TERM] for result in search_results[:2]])
+
+    def test_result_page_size_must_be_positive(self):
+        self.assertEqual(1, self.processor._get_result_page_size({}))
+        self.assertEqual(5, self.processor._get_result_page_size({ip_addon_constants.DATA: {ip_addon_constants.RESULT_PAGE_SIZE: '5'}}))
+        for page_size in [0, 'five']:
+            with self.assertRaises(RequestErrorException):
+                self.processor._get_result_page_size({ip_addon_constants.DATA: {ip_addon_constants.RESULT_PAGE_SIZE: page_size}})
+
+    @patch('intent_parser.server.intent_parser_processor.IntentParserDocumentFactory')
+    @patch('intent_parser.server.intent_parser_processor.LabExperiment')
+    def test_document_snapshot_is_reused_for_same_revision(self, mock_lab_experiment, mock_document_factory):
+        analyze_document = self._start_analyze_session('doc1')
+        mock_lab_experiment.return_value.load_head_revision_from_google_doc.return_value = 'rev1'
+        self.assertIs(analyze_document.get_ip_document(), self.processor._get_document_snapshot('doc1'))
+        mock_lab_experiment.return_value.load_from_google_doc.assert_not_called()
+
+        mock_lab_experiment.return_value.load_head_revision_from_google_doc.return_value = 'rev2'
+        mock_lab_experiment.return_value.head_revision.return_value = 'rev2'
+        mock_document_factory.return_value.from_google_doc.return_value = IntentParserDocument()
+        document_snapshot = self.processor._get_document_snapshot('doc1')
+        mock_lab_experiment.return_value.load_from_google_doc.assert_called_once_with(head_revision='rev2')
+        self.assertEqual('rev2', document_snapshot.get_head_revision())
+        self.assertIs(document_snapshot, analyze_document.get_ip_document())
+
+    @patch('intent_parser.server.intent_parser_processor.IntentParserDocumentFactory')
+    def test_document_snapshot_reads_revision_before_content(self, mock_document_factory):
+        # a document edited while it is loaded must not be reported under the newer revision
+        self.lab_experiment.head_revision.return_value = 'rev2'
+        document_snapshot = self.processor._load_document_snapshot('doc1')
+        self.assertEqual('rev1', document_snapshot.get_head_revision())
+        self.assertEqual(['load_head_revision_from_google_doc', 'load_from_google_doc'],
+                         [method_call[0] for method_call in self.lab_experiment.method_calls])
+        self.lab_experiment.load_from_google_doc.assert_called_once_with(head_revision='rev1')
+
+if __name__ == "__main__":
+    unittest.main()
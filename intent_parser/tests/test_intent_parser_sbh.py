@@ -0,0 +1,49 @@
+from intent_parser.accessor.intent_parser_sbh import IntentParserSBH
+from unittest.mock import MagicMock
+import re
+import unittest
+
+class IntentParserSBHTest(unittest.TestCase):
+
+    def setUp(self):
+        self.intent_parser_sbh = IntentParserSBH('user', 'password')
+        self.intent_parser_sbh.sbh = MagicMock()
+        self.intent_parser_sbh.sbh.sparqlQuery.side_effect = self._query_experiments
+        self.experiments = []
+        self.pages = []
+
+    def _query_experiments(self, query):
+        limit = int(re.search(r'LIMIT (\d+)', query).group(1))
+        offset = int(re.search(r'OFFSET (\d+)', query).group(1))
+        self.pages.append((limit, offset))
+        bindings = [{'entity': {'value': 'https://sbh/experiment%d' % index},
+                     'timestamp': {'value': '2020-05-0%d' % index},
+                     'title': {'value': 'experiment %d' % index},
+                     'request_url': {'value': 'https://docs.google.com/document/d/doc1'},
+                     'source': {'value': 'https://sbh/source%d' % index}}
+                    for index in self.experiments[offset:offset + limit]]
+        response = MagicMock()
+        response.json.return_value = {'results': {'bindings': bindings}}
+        return response
+
+    def _query_uris(self):
+        return [experiment['uri'] for experiment in self.intent_parser_sbh.query_experiments_from_request('https://sbh/collection',
+                                                                                                       'https://docs.google.com/document/d/doc1',
+                                                                                                       page_size=2)]
+
+    def test_pages_stop_at_partial_page(self):
+        self.experiments = [1, 2, 3, 4, 5]
+        self.assertEqual(['https://sbh/experiment%d' % index for index in self.experiments], self._query_uris())
+        self.assertEqual([(2, 0), (2, 2), (2, 4)], self.pages)
+
+    def test_pages_stop_at_empty_page(self):
+        self.experiments = [1, 2, 3, 4]
+        self.assertEqual(['https://sbh/experiment%d' % index for index in self.experiments], self._query_uris())
+        self.assertEqual([(2, 0), (2, 2), (2, 4)], self.pages)
+
+    def test_no_experiments(self):
+        self.assertEqual([], self._query_uris())
+        self.assertEqual([(2, 0)], self.pages)
+
+if __name__ == "__main__":
+    unittest.main()
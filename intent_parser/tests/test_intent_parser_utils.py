@@ -1,4 +1,6 @@
 import intent_parser.utils.intent_parser_utils as ip_util
+import Levenshtein
+import random
 import unittest
 
 class IntentParserUtilTest(unittest.TestCase):
@@ -14,6 +16,123 @@ class IntentParserUtilTest(unittest.TestCase):
         id = ip_util.get_google_doc_id('https://docs.google.com/document/d/1PzDr_u9H9NUUiW_TVoQwLkfaGXkbvkRkEBhlCzZ5hHU/edit')
         self.assertEqual(id, '1PzDr_u9H9NUUiW_TVoQwLkfaGXkbvkRkEBhlCzZ5hHU')
 
-       
+    def test_analyze_terms_matches_find_text(self):
+        paragraphs = [self._create_paragraph(1, ['Grow MG1655 in M9 media ', 'with arabinose.']),
+                      self._create_paragraph(41, ['Add L-arabinose and IPTG to yeast.']),
+                      self._create_paragraph(75, ['Link to ', 'IPTG'], link_index=1)]
+        dictionary_terms = {'MG1655': 'uri_strain',
+                            'arabinose': 'uri_arabinose',
+                            'IPTG': 'uri_iptg',
+                            'M9 media glucose': 'uri_media',
+                            'kan': 'uri_kan'}
+        expected_results = []
+        for term, uri in dictionary_terms.items():
+            expected_results.extend(ip_util.analyze_term((term, 0, paragraphs, 2, 0.75, uri)))
+        results = ip_util.analyze_terms(dictionary_terms, 0, paragraphs, 2, 0.75)
+        self.assertEqual(expected_results, results)
+        self.assertTrue({'paragraph_index': 2, 'offset': 8, 'end_offset': 11, 'term': 'IPTG', 'uri': 'uri_iptg',
+                         'link': 'https://example.com/iptg', 'text': 'IPTG'} in results)
+
+    def test_analyze_terms_from_start_offset(self):
+        paragraphs = [self._create_paragraph(1, ['yeast yeast'])]
+        results = ip_util.analyze_terms({'yeast': 'uri_yeast'}, 5, paragraphs, 2, 0.75)
+        self.assertEqual(1, len(results))
+        self.assertEqual(6, results[0]['offset'])
+        self.assertEqual(10, results[0]['end_offset'])
+
+    def test_text_match_index_skips_runs_without_shared_ngrams(self):
+        text_runs = ip_util.get_text_runs(0, [self._create_paragraph(1, ['sytox', 'glucose'])])
+        text_index = ip_util.TextMatchIndex(text_runs)
+        self.assertEqual([1], text_index._get_candidate_runs('glucose', 'glucose', 2, 0.75))
+        self.assertEqual([(0, 5, 11, None, 'glucose')], text_index.find_text('glucose', 2, 0.75))
+
+    def test_cull_overlapping_keeps_longest_result(self):
+        search_results = [self._create_search_result(0, 5, 9, 'yeast', 'yeast'),
+                          self._create_search_result(1, 0, 3, 'kan', 'kan'),
+                          self._create_search_result(0, 0, 9, 'MG1655 yeast', 'MG16 yeast'),
+                          self._create_search_result(0, 20, 24, 'yeast', 'yeast')]
+        results = ip_util.cull_overlapping(search_results)
+        self.assertEqual([search_results[2], search_results[1], search_results[3]], results)
+
+    def test_cull_overlapping_ignores_results_in_other_paragraphs(self):
+        search_results = [self._create_search_result(0, 0, 4, 'yeast', 'yeast'),
+                          self._create_search_result(1, 0, 9, 'MG1655 yeast', 'MG16 yeast')]
+        self.assertEqual(search_results, ip_util.cull_overlapping(search_results))
+
+    def test_cull_overlapping_matches_quadratic_scan(self):
+        rand = random.Random(1655)
+        terms = ['yeast', 'kan', 'MG1655', 'MG1655 yeast', 'IPTG', 'glucose']
+        for _ in range(200):
+            search_results = []
+            for _ in range(rand.randint(0, 40)):
+                offset = rand.randint(0, 60)
+                term = rand.choice(terms)
+                search_results.append(self._create_search_result(rand.randint(0, 2),
+                                                                 offset,
+                                                                 offset + rand.randint(0, 12),
+                                                                 term,
+                                                                 rand.choice([term, term.lower(), term[1:]])))
+            self.assertEqual(_quadratic_cull_overlapping(search_results), ip_util.cull_overlapping(search_results))
+
+    def _create_search_result(self, paragraph_index, offset, end_offset, term, text):
+        return {'paragraph_index': paragraph_index,
+                'offset': offset,
+                'end_offset': end_offset,
+                'term': term,
+                'uri': 'uri_%s' % term,
+                'link': None,
+                'text': text}
+
+    def _create_paragraph(self, start_index, contents, link_index=None):
+        elements = []
+        for index, content in enumerate(contents):
+            text_run = {'content': content}
+            if index == link_index:
+                text_run['textStyle'] = {'link': {'url': 'https://example.com/%s' % content.lower()}}
+            elements.append({'startIndex': start_index,
+                             'endIndex': start_index + len(content),
+                             'textRun': text_run})
+            start_index += len(content)
+        return {'elements': elements}
+
+def _quadratic_cull_overlapping(search_results):
+    """
+    cull_overlapping as it was before overlap candidates were looked up by offset: every later result is compared.
+    """
+    new_results = []
+    ignore_idx = set()
+    for idx in range(0, len(search_results)):
+        overlaps, max_idx, overlap_idx = _quadratic_find_overlaps(idx, search_results)
+        if len(overlaps) > 1:
+            if max_idx not in ignore_idx:
+                new_results.append(search_results[max_idx])
+            ignore_idx = ignore_idx.union(overlap_idx)
+        else:
+            if idx not in ignore_idx:
+                new_results.append(search_results[idx])
+    return new_results
+
+def _quadratic_find_overlaps(start_idx, search_results):
+    query = search_results[start_idx]
+    overlaps = [query]
+    overlap_idx = [start_idx]
+    best_overlap_idx = start_idx
+    best_overlap_len = query['end_offset'] - query['offset']
+    best_edit_dist = Levenshtein.distance(query['term'], query['text'])
+    for idx in range(start_idx + 1, len(search_results)):
+        comp = search_results[idx]
+        if not comp['paragraph_index'] == query['paragraph_index']:
+            continue
+        overlap = max(0, min(comp['end_offset'], query['end_offset']) - max(comp['offset'], query['offset'])) > 0
+        if overlap:
+            overlaps.append(comp)
+            overlap_idx.append(idx)
+            dist = Levenshtein.distance(comp['term'], comp['text'])
+            overlap_amount = comp['end_offset'] - comp['offset']
+            if overlap_amount >= best_overlap_len or (overlap_amount == best_overlap_len and dist < best_edit_dist):
+                best_overlap_idx = idx
+                best_overlap_len = dist
+    return overlaps, best_overlap_idx, overlap_idx
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
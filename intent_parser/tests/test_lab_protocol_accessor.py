@@ -0,0 +1,74 @@
+from intent_parser.intent_parser_exceptions import IntentParserException
+from intent_parser.protocols.lab_protocol_accessor import LabProtocolAccessor
+from intent_parser.protocols.templates.experimental_request_template import OpilDocumentTemplate
+from unittest.mock import MagicMock
+import intent_parser.constants.intent_parser_constants as ip_constants
+import opil
+import sbol3
+import unittest
+
+class LabProtocolAccessorTest(unittest.TestCase):
+
+    def setUp(self):
+        sbol3.set_namespace('http://strateos.com/')
+        protocol_interface = opil.ProtocolInterface('growth_curve')
+        protocol_interface.strateos_id = 'pr1'
+        measurement_type = opil.EnumeratedParameter()
+        measurement_type.name = 'measurement_type'
+        measurement_type.required = True
+        measurement_type.allowed_value = ['FLOW', 'PLATE_READER']
+        read_volume = opil.StringParameter()
+        read_volume.name = 'read_volume'
+        read_volume.description = 'volume to read'
+        protocol_interface.has_parameter = [measurement_type, read_volume]
+        opil_document = opil.Document()
+        opil_document.add(protocol_interface)
+
+        self.template = OpilDocumentTemplate()
+        self.template.load_from_template(opil_document)
+        self.strateos_accessor = MagicMock()
+        self.strateos_accessor.get_experimental_protocol.return_value = self.template
+        self.lab_protocol_accessor = LabProtocolAccessor(self.strateos_accessor, MagicMock())
+
+    def test_parameter_fields(self):
+        parameters = self.lab_protocol_accessor.map_name_to_parameters('Growth Curve', ip_constants.LAB_TRANSCRIPTIC)
+        self.assertEqual(['measurement_type', 'read_volume'], sorted(parameters.keys()))
+        self.assertTrue(parameters['measurement_type'].is_required())
+        self.assertEqual(('FLOW', 'PLATE_READER'), parameters['measurement_type'].get_valid_values())
+        self.assertFalse(parameters['read_volume'].is_required())
+        self.assertEqual('volume to read', parameters['read_volume'].get_description())
+
+    def test_metadata_is_shared_across_requests(self):
+        first_parameters = self.lab_protocol_accessor.map_name_to_parameters('Growth Curve', ip_constants.LAB_TRANSCRIPTIC)
+        self.assertEqual('pr1', self.lab_protocol_accessor.get_protocol_id('Growth Curve', ip_constants.LAB_TRANSCRIPTIC))
+        second_parameters = LabProtocolAccessor(self.strateos_accessor, MagicMock()).map_name_to_parameters('Growth Curve', ip_constants.LAB_TRANSCRIPTIC)
+
+        self.assertIsNot(first_parameters, second_parameters)
+        self.assertIs(first_parameters['measurement_type'], second_parameters['measurement_type'])
+        self.assertIs(self.template.get_protocol_metadata('Growth Curve'),
+                      self.lab_protocol_accessor.get_protocol_metadata('Growth Curve', ip_constants.LAB_TRANSCRIPTIC))
+
+    def test_aquarium_protocol_without_strateos_id(self):
+        protocol_interface = opil.ProtocolInterface('htc')
+        plate_count = opil.IntegerParameter()
+        plate_count.name = 'plate_count'
+        protocol_interface.has_parameter = [plate_count]
+        opil_document = opil.Document()
+        opil_document.add(protocol_interface)
+        template = OpilDocumentTemplate()
+        template.load_from_template(opil_document)
+        aquarium_accessor = MagicMock()
+        aquarium_accessor.get_experimental_protocol.return_value = template
+        lab_protocol_accessor = LabProtocolAccessor(self.strateos_accessor, aquarium_accessor)
+
+        parameters = lab_protocol_accessor.map_name_to_parameters('High-Throughput Culturing', ip_constants.LAB_DUKE_HASE)
+        self.assertEqual(['plate_count'], list(parameters.keys()))
+        self.assertEqual('', lab_protocol_accessor.get_protocol_id('High-Throughput Culturing', ip_constants.LAB_DUKE_HASE))
+
+    def test_template_without_protocol_interface(self):
+        self.strateos_accessor.get_experimental_protocol.return_value = OpilDocumentTemplate()
+        with self.assertRaises(IntentParserException):
+            self.lab_protocol_accessor.map_name_to_parameters('Growth Curve', ip_constants.LAB_TRANSCRIPTIC)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+from bson import ObjectId
+from datetime import datetime
+from intent_parser.accessor.mongo_db_accessor import TA4DBAccessor
+from unittest.mock import MagicMock, patch
+import intent_parser.constants.google_api_constants as google_constants
+import unittest
+
+class TA4DBAccessorTest(unittest.TestCase):
+
+    def setUp(self):
+        # skip the singleton so that no credentials are loaded
+        self.db_accessor = object.__new__(TA4DBAccessor)
+        self.db_accessor.database = MagicMock()
+        self.structured_request = {'_id': ObjectId(),
+                                   'experiment_id': 'experiment.ginkgo.123',
+                                   'experiment_reference_url': google_constants.GOOGLE_DOC_URL_PREFIX + 'doc1',
+                                   'lab': 'Ginkgo',
+                                   'parent_git_path': 'path/to/request.json',
+                                   'status': {'xplan_request_submitted': {'state': True},
+                                              'uploaded': {'state': False,
+                                                           'path': 'path/to/upload',
+                                                           'last_updated': datetime(2020, 5, 1)}}}
+
+    def test_status_query_is_indexable(self):
+        self.db_accessor.database.structured_requests.find.return_value = [self.structured_request]
+        result = self.db_accessor.get_experiment_status('doc1', 'ginkgo')
+
+        query, projection = self.db_accessor.database.structured_requests.find.call_args[0]
+        self.assertNotIn('$where', query)
+        self.assertEqual(google_constants.GOOGLE_DOC_URL_PREFIX + 'doc1', query['experiment_reference_url'])
+        self.assertEqual({'$exists': True}, query['derived_from.0'])
+        self.assertEqual({'$regex': 'ginkgo', '$options': 'i'}, query['lab'])
+        self.assertNotIn('derived_from', projection)
+        self.assertEqual(['experiment.ginkgo.123'], list(result.keys()))
+
+    def test_missing_status_returns_no_statuses(self):
+        self.structured_request.pop('status')
+        self.db_accessor.database.structured_requests.find.return_value = [self.structured_request]
+        self.assertEqual({}, self.db_accessor.get_experiment_status('doc1', 'Ginkgo'))
+
+    def test_fingerprint_matches_tables(self):
+        self.db_accessor.database.structured_requests.find.return_value = [self.structured_request]
+        status_tables, fingerprint = self.db_accessor.get_experiment_status_and_fingerprint('doc1', 'Ginkgo')
+        self.assertEqual(['experiment.ginkgo.123'], list(status_tables.keys()))
+        self.assertEqual(fingerprint, self.db_accessor.get_experiment_status_fingerprint('doc1', 'Ginkgo'))
+
+    def test_fingerprint_changes_without_newer_last_updated(self):
+        records = [self.structured_request]
+        self.db_accessor.database.structured_requests.find.side_effect = lambda query, projection: [dict(record) for record in records]
+        fingerprint = self.db_accessor.get_experiment_status_fingerprint('doc1', 'Ginkgo')
+
+        derived_request = dict(self.structured_request, _id=ObjectId(), experiment_id='experiment.ginkgo.124')
+        records = [self.structured_request, derived_request]
+        derived_fingerprint = self.db_accessor.get_experiment_status_fingerprint('doc1', 'Ginkgo')
+        self.assertNotEqual(fingerprint, derived_fingerprint)
+        records = [derived_request, self.structured_request]
+        self.assertEqual(derived_fingerprint, self.db_accessor.get_experiment_status_fingerprint('doc1', 'Ginkgo'))
+
+        for status in [{'xplan_request_submitted': {'state': False}},
+                       {'xplan_request_submitted': {'state': True}, 'new_status_type': {'state': True}}]:
+            records = [dict(self.structured_request, status=dict(self.structured_request['status'], **status))]
+            self.assertNotEqual(fingerprint, self.db_accessor.get_experiment_status_fingerprint('doc1', 'Ginkgo'))
+
+        records = []
+        self.assertNotEqual(fingerprint, self.db_accessor.get_experiment_status_fingerprint('doc1', 'Ginkgo'))
+
+    def test_batch_statuses_by_document(self):
+        self.db_accessor.database.structured_requests.aggregate.return_value = [
+            {'_id': google_constants.GOOGLE_DOC_URL_PREFIX + 'doc1', 'statuses': [self.structured_request]}]
+        result = self.db_accessor.get_experiment_statuses(['doc1', 'doc2'], 'Ginkgo')
+
+        pipeline = self.db_accessor.database.structured_requests.aggregate.call_args[0][0]
+        self.assertEqual({'$in': [google_constants.GOOGLE_DOC_URL_PREFIX + 'doc1', google_constants.GOOGLE_DOC_URL_PREFIX + 'doc2']},
+                         pipeline[0]['$match']['experiment_reference_url'])
+        self.assertEqual(['doc1', 'doc2'], sorted(result.keys()))
+        doc1_tables, doc1_fingerprint = result['doc1']
+        self.assertEqual(['experiment.ginkgo.123'], list(doc1_tables.keys()))
+        self.db_accessor.database.structured_requests.find.return_value = [self.structured_request]
+        self.assertEqual(doc1_fingerprint, self.db_accessor.get_experiment_status_fingerprint('doc1', 'Ginkgo'))
+
+        doc2_tables, doc2_fingerprint = result['doc2']
+        self.assertEqual({}, doc2_tables)
+        self.db_accessor.database.structured_requests.find.return_value = []
+        self.assertEqual(doc2_fingerprint, self.db_accessor.get_experiment_status_fingerprint('doc2', 'Ginkgo'))
+
+    def test_indexes_are_created_on_connect(self):
+        self.db_accessor.ensure_indexes = MagicMock()
+        with patch('intent_parser.accessor.mongo_db_accessor.ip_util.load_json_file', return_value={'dbURI': 'mongodb://localhost'}), \
+             patch('intent_parser.accessor.mongo_db_accessor.pymongo.MongoClient'):
+            self.db_accessor._authenticate_credentials()
+        self.db_accessor.ensure_indexes.assert_called_once_with()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+from intent_parser.protocols.opil_serialization_cache import OpilSerializationCache
+from unittest.mock import MagicMock
+import intent_parser.constants.intent_parser_constants as ip_constants
+import gzip
+import opil
+import sbol3
+import unittest
+
+class OpilSerializationCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        sbol3.set_namespace('http://strateos.com/')
+        self.opil_document = opil.Document()
+        self.opil_document.add(opil.ProtocolInterface('growth_curve'))
+        self.lab_template = object()
+        self.lab_protocol = (ip_constants.LAB_TRANSCRIPTIC, 'Growth Curve', self.lab_template)
+        self.lab_protocol_accessor = MagicMock()
+        self.lab_protocol_accessor.load_protocol_interface_from_lab.return_value = self.lab_template
+        self.opil_cache = OpilSerializationCache(max_entries=2)
+
+    def test_serialize_formats(self):
+        json_ld = self.opil_cache.put('doc1', 'rev1', ip_constants.OPIL_FORMAT_JSON_LD, self.lab_protocol, self.opil_document)
+        n_triples = self.opil_cache.put('doc1', 'rev1', ip_constants.OPIL_FORMAT_N_TRIPLES, self.lab_protocol, self.opil_document)
+        self.assertIn('growth_curve', gzip.decompress(json_ld).decode('utf-8'))
+        self.assertTrue(gzip.decompress(n_triples).decode('utf-8').startswith('<http://strateos.com/growth_curve>'))
+
+    def test_reuse_serialization_of_revision(self):
+        serialized_opil = self.opil_cache.put('doc1', 'rev1', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol, self.opil_document)
+        self.assertIs(serialized_opil, self.opil_cache.get('doc1', 'rev1', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol_accessor))
+        self.assertIsNone(self.opil_cache.get('doc1', 'rev1', ip_constants.OPIL_FORMAT_JSON_LD, self.lab_protocol_accessor))
+        self.assertIsNone(self.opil_cache.get('doc1', 'rev2', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol_accessor))
+
+    def test_changed_protocol_is_not_reused(self):
+        self.opil_cache.put('doc1', 'rev1', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol, self.opil_document)
+        self.lab_protocol_accessor.load_protocol_interface_from_lab.return_value = object()
+        self.assertIsNone(self.opil_cache.get('doc1', 'rev1', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol_accessor))
+
+    def test_new_revision_replaces_old_revision(self):
+        self.opil_cache.put('doc1', 'rev1', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol, self.opil_document)
+        self.opil_cache.put('doc1', 'rev2', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol, self.opil_document)
+        self.assertIsNone(self.opil_cache.get('doc1', 'rev1', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol_accessor))
+        self.assertIsNotNone(self.opil_cache.get('doc1', 'rev2', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol_accessor))
+
+    def test_least_recently_used_is_evicted(self):
+        self.opil_cache.put('doc1', 'rev1', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol, self.opil_document)
+        self.opil_cache.put('doc2', 'rev1', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol, self.opil_document)
+        self.opil_cache.get('doc1', 'rev1', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol_accessor)
+        self.opil_cache.put('doc3', 'rev1', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol, self.opil_document)
+        self.assertIsNotNone(self.opil_cache.get('doc1', 'rev1', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol_accessor))
+        self.assertIsNone(self.opil_cache.get('doc2', 'rev1', ip_constants.OPIL_FORMAT_TURTLE, self.lab_protocol_accessor))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+from intent_parser.document.analyze_document_controller import _AnalyzeDocument
+from intent_parser.document.document_location import DocumentLocation
+from intent_parser.document.document_snapshot import DocumentSnapshot
+from intent_parser.document.intent_parser_document_factory import IntentParserDocumentFactory
+from intent_parser.document.parallel_document_scanner import ParallelDocumentScanner
+from intent_parser.document.spellcheck_document_controller import _SpellcheckDocument
+import intent_parser.constants.google_api_constants as doc_constants
+import unittest
+
+class ParallelDocumentScannerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dictionary_terms = {'IPTG': 'https://hub.sd2e.org/user/sd2e/design/IPTG/1',
+                                'Kan': 'https://hub.sd2e.org/user/sd2e/design/Kan/1',
+                                'MG1655': 'https://hub.sd2e.org/user/sd2e/design/MG1655/1',
+                                'MG1655_WT': 'https://hub.sd2e.org/user/sd2e/design/MG1655_WT/1'}
+        cls.document_scanner = ParallelDocumentScanner(2)
+        cls.document_scanner.PARAGRAPHS_PER_CHUNK = 3
+        cls.dictionary_version = 1
+        cls.document_scanner.start(cls.dictionary_terms, cls.dictionary_version)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.document_scanner.stop()
+
+    def setUp(self):
+        texts = ['Grow MG1655_WT with IPTG and Kan.\n',
+                 'Measure the strian MG1655 every hour.\n',
+                 '\n',
+                 'Kan Kan IPTG reagnet\n',
+                 'No terms in this paragraph.\n',
+                 'MG1655 in a ploate with IPTG\n',
+                 'Kanamycin is not Kan\n']
+        content = []
+        start_index = 1
+        for text in texts:
+            end_index = start_index + len(text)
+            element = {doc_constants.START_INDEX: start_index,
+                       doc_constants.END_INDEX: end_index,
+                       doc_constants.TEXT_RUN: {doc_constants.CONTENT: text}}
+            content.append({doc_constants.START_INDEX: start_index,
+                            doc_constants.END_INDEX: end_index,
+                            doc_constants.PARAGRAPH: {doc_constants.ELEMENTS: [element]}})
+            start_index = end_index
+        ip_document = IntentParserDocumentFactory().from_google_doc({doc_constants.BODY: {doc_constants.CONTENT: content}})
+        self.document_snapshot = DocumentSnapshot('rev1', ip_document)
+        self.doc_location = DocumentLocation()
+        self.doc_location.set_paragraph_index(1)
+        self.doc_location.set_start_offset(5)
+
+    def _analyze_results(self, analyze_document):
+        return [(result.get_paragraph_index(), result.get_matching_term(), result.get_sbh_uri(), result.get_start_offset(), result.get_end_offset())
+                for result in analyze_document.get_result()]
+
+    def _spellcheck_results(self, spellcheck_document):
+        return [(result.get_paragraph_index(), result.get_matching_term(), result.get_start_offset(), result.get_end_offset())
+                for result in spellcheck_document.get_result()]
+
+    def test_parallel_analyze_matches_analyze(self):
+        ignored_terms = ['Kan']
+        filtered_terms = {term: uri for term, uri in self.dictionary_terms.items() if term not in ignored_terms}
+        serial_document = _AnalyzeDocument('doc1', self.document_snapshot, filtered_terms)
+        serial_document.analyze(self.doc_location)
+        parallel_document = _AnalyzeDocument('doc1', self.document_snapshot, filtered_terms)
+        parallel_document.analyze_in_parallel(self.doc_location, self.document_scanner, self.dictionary_version, ignored_terms)
+
+        self.assertIsNotNone(self.document_scanner.find_dictionary_terms(self.dictionary_version, ignored_terms, []))
+        self.assertTrue(self._analyze_results(serial_document))
+        self.assertEqual(self._analyze_results(serial_document), self._analyze_results(parallel_document))
+
+    def test_synced_dictionary_is_scanned_in_parallel(self):
+        dictionary_terms = dict(self.dictionary_terms, Kanamycin='https://hub.sd2e.org/user/sd2e/design/Kanamycin/1')
+        self.document_scanner.update_dictionary_terms(dictionary_terms, 2)
+        try:
+            self.assertIsNone(self.document_scanner.find_dictionary_terms(self.dictionary_version, [], []))
+            scanned_matches = self.document_scanner.find_dictionary_terms(2, [], [(6, 'Kanamycin is not Kan')])
+        finally:
+            self.document_scanner.update_dictionary_terms(self.dictionary_terms, self.dictionary_version)
+        self.assertEqual([(6, 'Kanamycin', 0, 9), (6, 'Kan', 17, 20)], scanned_matches)
+
+    def test_same_dictionary_version_keeps_workers(self):
+        pool, _, _ = self.document_scanner._get_pool()
+        self.document_scanner.update_dictionary_terms(dict(self.dictionary_terms), self.dictionary_version)
+        self.assertIs(pool, self.document_scanner._get_pool()[0])
+
+    def test_parallel_analyze_with_other_dictionary_analyzes_in_process(self):
+        dictionary_terms = dict(self.dictionary_terms, Kanamycin='https://hub.sd2e.org/user/sd2e/design/Kanamycin/1')
+        self.assertIsNone(self.document_scanner.find_dictionary_terms(2, [], []))
+
+        serial_document = _AnalyzeDocument('doc1', self.document_snapshot, dictionary_terms)
+        serial_document.analyze(self.doc_location)
+        parallel_document = _AnalyzeDocument('doc1', self.document_snapshot, dictionary_terms)
+        parallel_document.analyze_in_parallel(self.doc_location, self.document_scanner, 2, [])
+        self.assertIn('Kanamycin', [result[1] for result in self._analyze_results(parallel_document)])
+        self.assertEqual(self._analyze_results(serial_document), self._analyze_results(parallel_document))
+
+    def test_parallel_spellcheck_matches_spellcheck(self):
+        not_misspelled_terms = ['reagnet']
+        serial_document = _SpellcheckDocument('doc1', self.document_snapshot, not_misspelled_terms=not_misspelled_terms)
+        serial_document.spellcheck(self.doc_location)
+        parallel_document = _SpellcheckDocument('doc1', self.document_snapshot, not_misspelled_terms=not_misspelled_terms)
+        parallel_document.spellcheck_in_parallel(self.doc_location, self.document_scanner)
+
+        self.assertIsNotNone(self.document_scanner.find_misspelled_words(not_misspelled_terms, []))
+        self.assertTrue(self._spellcheck_results(serial_document))
+        self.assertEqual(self._spellcheck_results(serial_document), self._spellcheck_results(parallel_document))
+
+if __name__ == "__main__":
+    unittest.main()
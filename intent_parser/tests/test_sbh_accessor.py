@@ -0,0 +1,63 @@
+from intent_parser.accessor.sbh_accessor import SBHAccessor
+from unittest.mock import MagicMock, patch
+import threading
+import unittest
+
+class SBHAccessorTest(unittest.TestCase):
+
+    def setUp(self):
+        part_shop_patcher = patch('intent_parser.accessor.sbh_accessor.sbol.PartShop', side_effect=lambda url: MagicMock())
+        part_shop_patcher.start()
+        self.addCleanup(part_shop_patcher.stop)
+        self.sbh_accessor = SBHAccessor('https://hub.sd2e.org', pool_size=2)
+        self.addCleanup(self._stop_accessor)
+
+    def _stop_accessor(self):
+        self.sbh_accessor.stop()
+        self.sbh_accessor.housekeeping_thread.join()
+
+    def _part_shops(self):
+        sessions = self.sbh_accessor._checkout_all()
+        self.sbh_accessor._checkin_all(sessions)
+        return [session.get_part_shop() for session in sessions]
+
+    def test_queries_run_concurrently(self):
+        both_started = threading.Barrier(3, timeout=5)
+        for part_shop in self._part_shops():
+            part_shop.sparqlQuery.side_effect = lambda query: both_started.wait()
+        threads = [threading.Thread(target=self.sbh_accessor.sparqlQuery, args=('query',)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        both_started.wait()
+        for thread in threads:
+            thread.join()
+
+        metrics = self.sbh_accessor.get_pool_metrics()
+        self.assertEqual(2, metrics['checkouts'])
+        self.assertEqual(0, metrics['waited_checkouts'])
+
+    def test_failed_relogin_keeps_session(self):
+        self.sbh_accessor.login('user', 'password')
+        self.sbh_accessor._login_generation += 1
+        for part_shop in self._part_shops():
+            part_shop.login.side_effect = ConnectionError('connection reset')
+            part_shop.sparqlQuery.return_value = {'results': []}
+
+        for _ in range(3):
+            self.assertEqual({'results': []}, self.sbh_accessor.sparqlQuery('query'))
+        self.assertEqual(2, self.sbh_accessor._sessions.qsize())
+
+    def test_concurrent_logins_do_not_deadlock(self):
+        busy_session = self.sbh_accessor._checkout()
+        threads = [threading.Thread(target=self.sbh_accessor.login, args=('user', 'password')) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        self.sbh_accessor._checkin(busy_session)
+        for thread in threads:
+            thread.join(timeout=5)
+            self.assertFalse(thread.is_alive())
+        self.assertEqual(2, self.sbh_accessor._login_generation)
+        self.assertEqual(2, self.sbh_accessor._sessions.qsize())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,361 @@
+from datetime import timedelta
+from intent_parser.accessor.sbol_dictionary_accessor import SBOLDictionaryAccessor
+from intent_parser.accessor.sbol_dictionary_snapshot import SBOLDictionarySnapshot
+from intent_parser.intent_parser_exceptions import DictionaryMaintainerException
+from unittest.mock import MagicMock, patch
+import intent_parser.constants.sbol_dictionary_constants as dictionary_constants
+import intent_parser.constants.sd2_datacatalog_constants as dc_constants
+import os
+import tempfile
+import threading
+import unittest
+
+class SBOLDictionaryAccessorTest(unittest.TestCase):
+
+    HEADERS = [dictionary_constants.COLUMN_COMMON_NAME,
+               'Type',
+               dictionary_constants.COLUMN_SYNBIOHUB_URI,
+               dictionary_constants.COLUMN_GINKGO_UID,
+               dictionary_constants.COLUMN_TACC_UID,
+               dictionary_constants.COLUMN_TRANSCRIPT_UID]
+
+    @patch('intent_parser.accessor.sbol_dictionary_accessor.GoogleAccessor')
+    def setUp(self, mock_google_accessor):
+        self.mock_spreadsheet_accessor = mock_google_accessor.return_value.get_google_spreadsheet_accessor.return_value
+        self.mock_drive_accessor = mock_google_accessor.return_value.get_google_drive_accessor.return_value
+        self.mock_drive_accessor.get_modified_time.return_value = '2021-01-01T00:00:00.000Z'
+        self.tab_rows = {tab: [] for tab in ['Attribute', 'Reagent', 'Genetic Construct', 'Strain', 'Protein', 'Collections']}
+        self.tab_rows['Attribute'] = [['Kanamycin', 'Attribute', 'https://sbh/kan', ''],
+                                      [],
+                                      ['ab', 'Attribute', 'https://sbh/ab', '']]
+        self.tab_rows['Strain'] = [['NOR00', 'Strain', 'https://sbh/nor00', 'UWBF_6390']]
+        self.mock_spreadsheet_accessor.get_tabs_data.side_effect = self._get_tabs_data
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+        self.snapshot_file = os.path.join(self.snapshot_dir.name, 'sbol_dictionary.db')
+        self.sbol_dictionary = SBOLDictionaryAccessor('spreadsheet_id', None, snapshot_file=self.snapshot_file)
+
+    def tearDown(self):
+        self.snapshot_dir.cleanup()
+
+    def _get_tabs_data(self, tab_ranges, spreadsheet_id):
+        value_ranges = []
+        for tab_range in tab_ranges:
+            tab, row_range = tab_range.split('!')
+            if row_range == '2:2':
+                value_ranges.append({'range': tab_range, 'values': [self.HEADERS]})
+            elif self.tab_rows[tab]:
+                value_ranges.append({'range': tab_range, 'values': self.tab_rows[tab]})
+            else:
+                value_ranges.append({'range': tab_range})
+        return value_ranges
+
+    def test_fetch_spreadsheet_data_in_one_request(self):
+        self.sbol_dictionary.initial_fetch()
+        self.assertEqual(1, self.mock_spreadsheet_accessor.get_tabs_data.call_count)
+        self.mock_spreadsheet_accessor.get_tab_data.assert_not_called()
+
+        attribute_tab = self.sbol_dictionary.get_tab_sheet('Attribute')
+        self.assertEqual(2, len(attribute_tab))
+        self.assertEqual({dictionary_constants.COLUMN_COMMON_NAME: 'Kanamycin',
+                          'Type': 'Attribute',
+                          dictionary_constants.COLUMN_SYNBIOHUB_URI: 'https://sbh/kan',
+                          'Ginkgo UID': '',
+                          'row': 3,
+                          'tab': 'Attribute'}, attribute_tab[0])
+        self.assertEqual(5, attribute_tab[1]['row'])
+        self.assertEqual([], self.sbol_dictionary.get_tab_sheet('Reagent'))
+        self.assertEqual(3, self.sbol_dictionary.get_tab_headers('Strain')[dictionary_constants.COLUMN_GINKGO_UID])
+
+    def test_analyze_terms_from_fetched_tabs(self):
+        self.sbol_dictionary.initial_fetch()
+        self.assertEqual({'Kanamycin': 'https://sbh/kan',
+                          'NOR00': 'https://sbh/nor00',
+                          'UWBF_6390': 'https://sbh/nor00'},
+                         self.sbol_dictionary.get_analyzed_terms())
+
+    def test_lookup_indexes(self):
+        self.tab_rows['Attribute'].append(['Sytox', 'Attribute', 'https://sbh/sytox', '', 'sytox_id', 'sytox_strateos_id'])
+        self.tab_rows['Attribute'].append(['Sytox Green', 'Attribute', 'https://sbh/sytox_green', '', '', 'sytox_strateos_id'])
+        self.sbol_dictionary.initial_fetch()
+
+        self.assertEqual({'sytox_id': 'Sytox'}, self.sbol_dictionary.map_common_names_and_tacc_id())
+        self.assertEqual({'Sytox': 'sytox_strateos_id', 'Sytox Green': 'sytox_strateos_id'},
+                         self.sbol_dictionary.map_common_names_and_transcriptic_id())
+        self.assertEqual('Sytox', self.sbol_dictionary.get_common_name_from_transcriptic_id('sytox_strateos_id'))
+        self.assertIsNone(self.sbol_dictionary.get_common_name_from_transcriptic_id('kan_id'))
+        self.assertEqual('Reagent', self.sbol_dictionary.get_tab_name_from_item_type('Media'))
+        self.assertEqual('Protein', self.sbol_dictionary.get_tab_name_from_item_type('Protein'))
+
+        mapped_strains = self.sbol_dictionary.get_mapped_strain(dc_constants.LAB_GINKGO)
+        self.assertEqual(['https://sbh/nor00'], list(mapped_strains.keys()))
+        self.assertEqual('NOR00', mapped_strains['https://sbh/nor00'].get_strain_common_name())
+        self.assertTrue(mapped_strains['https://sbh/nor00'].has_lab_strain_name('UWBF_6390'))
+        self.assertEqual({}, self.sbol_dictionary.get_mapped_strain(dc_constants.LAB_TRANSCRIPTIC))
+
+    def test_lookup_before_fetch(self):
+        with self.assertRaises(DictionaryMaintainerException):
+            self.sbol_dictionary.map_common_names_and_tacc_id()
+        with self.assertRaises(DictionaryMaintainerException):
+            self.sbol_dictionary.get_mapped_strain(dc_constants.LAB_GINKGO)
+
+    def test_skip_fetch_when_spreadsheet_not_modified(self):
+        self.sbol_dictionary.initial_fetch()
+        self.sbol_dictionary._fetch_spreadsheet_data_if_modified()
+        self.assertEqual(1, self.mock_spreadsheet_accessor.get_tabs_data.call_count)
+
+        self.mock_drive_accessor.get_modified_time.return_value = '2021-01-02T00:00:00.000Z'
+        self.sbol_dictionary._fetch_spreadsheet_data_if_modified()
+        self.assertEqual(2, self.mock_spreadsheet_accessor.get_tabs_data.call_count)
+
+    def test_sync_publishes_new_snapshot(self):
+        self.assertEqual(0, self.sbol_dictionary.get_dictionary_version())
+        self.sbol_dictionary.initial_fetch()
+        snapshot = self.sbol_dictionary.get_snapshot()
+        self.assertEqual(1, snapshot.get_version())
+
+        self.tab_rows['Strain'].append(['NOR01', 'Strain', 'https://sbh/nor01', 'UWBF_6391'])
+        self.mock_drive_accessor.get_modified_time.return_value = '2021-01-02T00:00:00.000Z'
+        self.sbol_dictionary._fetch_spreadsheet_data_if_modified()
+        self.assertEqual(2, self.sbol_dictionary.get_dictionary_version())
+        self.assertEqual(1, len(snapshot.get_tab_sheet('Strain')))
+        self.assertNotIn('UWBF_6391', snapshot.get_analyzed_terms())
+        self.assertEqual('https://sbh/nor01', self.sbol_dictionary.get_analyzed_terms()['UWBF_6391'])
+
+    def test_adding_entries_does_not_wait_on_sync(self):
+        self.sbol_dictionary.initial_fetch()
+        build_started = threading.Event()
+        finish_build = threading.Event()
+        def build_snapshot(*args, **kwargs):
+            build_started.set()
+            finish_build.wait(5)
+            return SBOLDictionarySnapshot(*args, **kwargs)
+        self.tab_rows['Strain'].append(['NOR01', 'Strain', 'https://sbh/nor01', 'UWBF_6391'])
+        self.mock_drive_accessor.get_modified_time.return_value = '2021-01-02T00:00:00.000Z'
+        with patch('intent_parser.accessor.sbol_dictionary_accessor.SBOLDictionarySnapshot', side_effect=build_snapshot):
+            sync = threading.Thread(target=self.sbol_dictionary._fetch_spreadsheet_data_if_modified)
+            sync.start()
+            build_started.wait(5)
+            add_entry = threading.Thread(target=self.sbol_dictionary.add_dictionary_entry,
+                                         args=({'tab': 'Strain', dictionary_constants.COLUMN_COMMON_NAME: 'NOR02', 'Type': 'Strain'},))
+            add_entry.start()
+            add_entry.join(1)
+            self.assertFalse(add_entry.is_alive())
+            finish_build.set()
+            sync.join()
+        self.assertEqual(['NOR00', 'NOR01', 'NOR02'],
+                         [row[dictionary_constants.COLUMN_COMMON_NAME] for row in self.sbol_dictionary.get_tab_sheet('Strain')])
+        self.assertEqual(3, self.sbol_dictionary.get_dictionary_version())
+
+    def test_sync_notifies_listeners(self):
+        listener = MagicMock()
+        self.sbol_dictionary.add_sync_listener(listener)
+        self.sbol_dictionary.initial_fetch()
+        listener.assert_called_once_with(self.sbol_dictionary.get_analyzed_terms(), 1)
+
+        self.mock_spreadsheet_accessor.get_sheet_ids.return_value = {'Attribute': 10, 'Strain': 11}
+        self.sbol_dictionary.FLUSH_DELAY = timedelta(hours=1)
+        self.sbol_dictionary.add_dictionary_entry({'tab': 'Strain',
+                                                   dictionary_constants.COLUMN_COMMON_NAME: 'NOR01',
+                                                   'Type': 'Strain',
+                                                   dictionary_constants.COLUMN_SYNBIOHUB_URI: 'https://sbh/nor01',
+                                                   dictionary_constants.COLUMN_GINKGO_UID: 'UWBF_6391'})
+        self.assertEqual(1, listener.call_count)
+
+        # added entries are passed on from the flush timer
+        self.sbol_dictionary._flush_on_timer()
+        self.assertEqual(2, listener.call_count)
+        listener.assert_called_with(self.sbol_dictionary.get_analyzed_terms(), 2)
+        self.assertIn('UWBF_6391', listener.call_args[0][0])
+        self.sbol_dictionary._flush_on_timer()
+        self.assertEqual(2, listener.call_count)
+
+    def test_add_dictionary_entries(self):
+        self.mock_spreadsheet_accessor.get_sheet_ids.return_value = {'Attribute': 10, 'Strain': 11}
+        self.sbol_dictionary.initial_fetch()
+        self.sbol_dictionary.add_dictionary_entry({'tab': 'Strain',
+                                                   dictionary_constants.COLUMN_COMMON_NAME: 'NOR01',
+                                                   'Type': 'Strain',
+                                                   dictionary_constants.COLUMN_SYNBIOHUB_URI: 'https://sbh/nor01',
+                                                   dictionary_constants.COLUMN_GINKGO_UID: 'UWBF_6391'})
+        self.sbol_dictionary.add_dictionary_entry({'tab': 'Attribute',
+                                                   dictionary_constants.COLUMN_COMMON_NAME: 'Sytox',
+                                                   'Type': 'Attribute',
+                                                   dictionary_constants.COLUMN_SYNBIOHUB_URI: 'https://sbh/sytox'})
+        with self.assertRaises(DictionaryMaintainerException):
+            self.sbol_dictionary.add_dictionary_entry({'tab': 'Strain', dictionary_constants.COLUMN_COMMON_NAME: 'NOR01'})
+
+        strain_tab = self.sbol_dictionary.get_tab_sheet('Strain')
+        self.assertEqual(['NOR00', 'NOR01'], [row[dictionary_constants.COLUMN_COMMON_NAME] for row in strain_tab])
+        self.assertEqual(4, strain_tab[1]['row'])
+        self.assertEqual('https://sbh/nor01', self.sbol_dictionary.get_analyzed_terms()['UWBF_6391'])
+
+        # a sync that has not seen the queued rows yet keeps them in the dictionary
+        self.mock_drive_accessor.get_modified_time.return_value = '2021-01-02T00:00:00.000Z'
+        self.sbol_dictionary._fetch_spreadsheet_data_if_modified()
+        self.assertEqual(2, len(self.sbol_dictionary.get_tab_sheet('Strain')))
+        self.mock_spreadsheet_accessor.execute_requests.assert_not_called()
+
+        self.sbol_dictionary.flush_dictionary_entries()
+        self.mock_spreadsheet_accessor.execute_requests.assert_called_once()
+        requests, spreadsheet_id = self.mock_spreadsheet_accessor.execute_requests.call_args[0]
+        self.assertEqual('spreadsheet_id', spreadsheet_id)
+        self.assertEqual([11, 10], [request['appendCells']['sheetId'] for request in requests])
+        self.assertEqual([{'userEnteredValue': {'stringValue': value}} for value in ['NOR01', 'Strain', 'https://sbh/nor01', 'UWBF_6391', '', '']],
+                         requests[0]['appendCells']['rows'][0]['values'])
+
+        self.sbol_dictionary.flush_dictionary_entries()
+        self.mock_spreadsheet_accessor.execute_requests.assert_called_once()
+
+    def test_written_entries_stay_until_synced(self):
+        self.mock_spreadsheet_accessor.get_sheet_ids.return_value = {'Strain': 11}
+        self.sbol_dictionary.initial_fetch()
+        self.sbol_dictionary.add_dictionary_entry({'tab': 'Strain', dictionary_constants.COLUMN_COMMON_NAME: 'NOR01', 'Type': 'Strain'})
+        self.sbol_dictionary.flush_dictionary_entries()
+        self.sbol_dictionary.add_dictionary_entry({'tab': 'Strain', dictionary_constants.COLUMN_COMMON_NAME: 'NOR02', 'Type': 'Strain'})
+
+        self.assertEqual(['NOR00', 'NOR01', 'NOR02'],
+                         [row[dictionary_constants.COLUMN_COMMON_NAME] for row in self.sbol_dictionary.get_tab_sheet('Strain')])
+        with self.assertRaises(DictionaryMaintainerException):
+            self.sbol_dictionary.add_dictionary_entry({'tab': 'Strain', dictionary_constants.COLUMN_COMMON_NAME: 'NOR01', 'Type': 'Strain'})
+
+        # a sync that fetched the written row replaces it with the spreadsheet's row
+        self.tab_rows['Strain'].append(['NOR01', 'Strain', 'https://sbh/nor01', 'UWBF_6391'])
+        self.mock_drive_accessor.get_modified_time.return_value = '2021-01-02T00:00:00.000Z'
+        self.sbol_dictionary._fetch_spreadsheet_data_if_modified()
+        self.assertEqual([], self.sbol_dictionary._written_entries)
+        self.assertEqual(['NOR00', 'NOR01', 'NOR02'],
+                         [row[dictionary_constants.COLUMN_COMMON_NAME] for row in self.sbol_dictionary.get_tab_sheet('Strain')])
+        self.assertEqual('https://sbh/nor01', self.sbol_dictionary.get_analyzed_terms()['UWBF_6391'])
+
+    def test_concurrent_flushes_write_rows_once(self):
+        self.mock_spreadsheet_accessor.get_sheet_ids.return_value = {'Strain': 11}
+        self.sbol_dictionary.FLUSH_DELAY = timedelta(hours=1)
+        self.sbol_dictionary.initial_fetch()
+        self.sbol_dictionary.add_dictionary_entry({'tab': 'Strain', dictionary_constants.COLUMN_COMMON_NAME: 'NOR01', 'Type': 'Strain'})
+        write_started = threading.Event()
+        finish_write = threading.Event()
+        def execute_requests(requests, spreadsheet_id):
+            write_started.set()
+            finish_write.wait(5)
+        self.mock_spreadsheet_accessor.execute_requests.side_effect = execute_requests
+
+        first_flush = threading.Thread(target=self.sbol_dictionary.flush_dictionary_entries)
+        first_flush.start()
+        write_started.wait(5)
+        second_flush = threading.Thread(target=self.sbol_dictionary.flush_dictionary_entries)
+        second_flush.start()
+        finish_write.set()
+        first_flush.join()
+        second_flush.join()
+        self.mock_spreadsheet_accessor.execute_requests.assert_called_once()
+
+    def test_added_rows_match_rebuilt_snapshot(self):
+        self.mock_spreadsheet_accessor.get_sheet_ids.return_value = {'Attribute': 10, 'Strain': 11}
+        self.sbol_dictionary.initial_fetch()
+        entries = [{'tab': 'Strain',
+                    dictionary_constants.COLUMN_COMMON_NAME: 'NOR01',
+                    'Type': 'Strain',
+                    dictionary_constants.COLUMN_SYNBIOHUB_URI: 'https://sbh/nor01',
+                    dictionary_constants.COLUMN_GINKGO_UID: 'UWBF_6391'},
+                   {'tab': 'Attribute',
+                    dictionary_constants.COLUMN_COMMON_NAME: 'Sytox',
+                    'Type': 'Attribute',
+                    dictionary_constants.COLUMN_SYNBIOHUB_URI: 'https://sbh/sytox',
+                    dictionary_constants.COLUMN_TACC_UID: 'sytox_id',
+                    dictionary_constants.COLUMN_TRANSCRIPT_UID: 'sytox_strateos_id'}]
+        for entry in entries:
+            self.sbol_dictionary.add_dictionary_entry(entry)
+        snapshot = self.sbol_dictionary.get_snapshot()
+        rebuilt_snapshot = SBOLDictionarySnapshot(snapshot.get_version(), snapshot.get_spreadsheet_data())
+
+        self.assertEqual(rebuilt_snapshot.get_analyzed_terms(), snapshot.get_analyzed_terms())
+        self.assertEqual(rebuilt_snapshot.get_tacc_id_to_common_name(), snapshot.get_tacc_id_to_common_name())
+        self.assertEqual(rebuilt_snapshot.get_common_name_to_transcriptic_id(), snapshot.get_common_name_to_transcriptic_id())
+        self.assertEqual(rebuilt_snapshot.get_transcriptic_id_to_common_name(), snapshot.get_transcriptic_id_to_common_name())
+        for lab_name in dictionary_constants.MAPPED_LAB_UID:
+            self.assertEqual(sorted(rebuilt_snapshot.get_mapped_strain(lab_name).keys()), sorted(snapshot.get_mapped_strain(lab_name).keys()))
+        for term in ['', 'no', 'sytox', 'sbh']:
+            self.assertEqual(rebuilt_snapshot.get_search_index().search(term, 0, 10), snapshot.get_search_index().search(term, 0, 10))
+
+    @patch('intent_parser.accessor.sbol_dictionary_accessor.GoogleAccessor')
+    def test_queued_entries_are_not_persisted(self, mock_google_accessor):
+        self.sbol_dictionary.initial_fetch()
+        self.sbol_dictionary.add_dictionary_entry({'tab': 'Strain',
+                                                   dictionary_constants.COLUMN_COMMON_NAME: 'NOR01',
+                                                   'Type': 'Strain'})
+        self.sbol_dictionary._fetch_spreadsheet_data(modified_time='2021-01-01T00:00:00.000Z')
+        mock_google_accessor.return_value.get_google_drive_accessor.return_value.get_modified_time.return_value = '2021-01-01T00:00:00.000Z'
+        other_dictionary = SBOLDictionaryAccessor('spreadsheet_id', None, snapshot_file=self.snapshot_file)
+        other_dictionary.initial_fetch()
+
+        self.assertEqual(['NOR00'], [row[dictionary_constants.COLUMN_COMMON_NAME] for row in other_dictionary.get_tab_sheet('Strain')])
+        other_dictionary.add_dictionary_entry({'tab': 'Strain', dictionary_constants.COLUMN_COMMON_NAME: 'NOR01', 'Type': 'Strain'})
+
+    def test_adding_entries_does_not_write_snapshot_file(self):
+        self.sbol_dictionary.initial_fetch()
+        with patch('intent_parser.accessor.sbol_dictionary_snapshot.write_snapshot_file') as mock_write:
+            self.sbol_dictionary.add_dictionary_entry({'tab': 'Strain', dictionary_constants.COLUMN_COMMON_NAME: 'NOR01', 'Type': 'Strain'})
+            mock_write.assert_not_called()
+
+    def test_snapshot_file_of_other_revision_is_not_loaded(self):
+        self.sbol_dictionary.initial_fetch()
+        self.mock_drive_accessor.get_modified_time.return_value = '2021-01-02T00:00:00.000Z'
+        with patch('intent_parser.accessor.sbol_dictionary_snapshot.read_snapshot_file') as mock_read:
+            self.sbol_dictionary._fetch_spreadsheet_data_if_modified()
+            mock_read.assert_not_called()
+        self.assertEqual(2, self.mock_spreadsheet_accessor.get_tabs_data.call_count)
+
+    def test_failed_writes_stay_queued_and_are_reported(self):
+        self.mock_spreadsheet_accessor.get_sheet_ids.return_value = {'Strain': 11}
+        self.mock_spreadsheet_accessor.execute_requests.side_effect = ConnectionError('connection reset')
+        self.sbol_dictionary.FLUSH_DELAY = timedelta(hours=1)
+        self.sbol_dictionary.initial_fetch()
+        self.sbol_dictionary.add_dictionary_entry({'tab': 'Strain', dictionary_constants.COLUMN_COMMON_NAME: 'NOR01', 'Type': 'Strain'})
+
+        for _ in range(self.sbol_dictionary.FLUSH_FAILURE_LIMIT):
+            self.assertIsNone(self.sbol_dictionary.get_flush_error())
+            self.sbol_dictionary.flush_dictionary_entries()
+            self.assertIsNotNone(self.sbol_dictionary._flush_timer)
+        self.assertIn('connection reset', self.sbol_dictionary.get_flush_error())
+        with self.assertRaises(DictionaryMaintainerException):
+            self.sbol_dictionary.add_dictionary_entry({'tab': 'Strain', dictionary_constants.COLUMN_COMMON_NAME: 'NOR02', 'Type': 'Strain'})
+
+        self.mock_spreadsheet_accessor.execute_requests.side_effect = None
+        self.sbol_dictionary.flush_dictionary_entries()
+        requests, _ = self.mock_spreadsheet_accessor.execute_requests.call_args[0]
+        self.assertEqual(2, len(requests[0]['appendCells']['rows']))
+        self.assertIsNone(self.sbol_dictionary.get_flush_error())
+
+    @patch('intent_parser.accessor.sbol_dictionary_accessor.GoogleAccessor')
+    def test_load_snapshot_from_file(self, mock_google_accessor):
+        self.sbol_dictionary.initial_fetch()
+        mock_drive_accessor = mock_google_accessor.return_value.get_google_drive_accessor.return_value
+        mock_drive_accessor.get_modified_time.return_value = '2021-01-01T00:00:00.000Z'
+        mock_spreadsheet_accessor = mock_google_accessor.return_value.get_google_spreadsheet_accessor.return_value
+        other_dictionary = SBOLDictionaryAccessor('spreadsheet_id', None, snapshot_file=self.snapshot_file)
+
+        other_dictionary.initial_fetch()
+        mock_spreadsheet_accessor.get_tabs_data.assert_not_called()
+        self.assertEqual(self.sbol_dictionary.get_spreadsheet_data(), other_dictionary.get_spreadsheet_data())
+        self.assertEqual(self.sbol_dictionary.get_analyzed_terms(), other_dictionary.get_analyzed_terms())
+        self.assertEqual([], other_dictionary.get_tab_sheet('Reagent'))
+
+    @patch('intent_parser.accessor.sbol_dictionary_accessor.GoogleAccessor')
+    def test_snapshot_file_is_built_once(self, mock_google_accessor):
+        self.sbol_dictionary.initial_fetch()
+        other_dictionary = SBOLDictionaryAccessor('spreadsheet_id', None, snapshot_file=self.snapshot_file)
+        with patch('intent_parser.accessor.sbol_dictionary_accessor.SBOLDictionarySnapshot', wraps=SBOLDictionarySnapshot) as mock_snapshot:
+            self.assertTrue(other_dictionary._load_snapshot_file(modified_time='2021-01-01T00:00:00.000Z'))
+        mock_snapshot.assert_called_once()
+        self.assertEqual('2021-01-01T00:00:00.000Z', other_dictionary.get_snapshot().get_modified_time())
+        self.assertEqual(self.sbol_dictionary.get_spreadsheet_data(), other_dictionary.get_spreadsheet_data())
+
+    def test_ignore_unreadable_snapshot_file(self):
+        with open(self.snapshot_file, 'w') as file:
+            file.write('not a snapshot')
+        self.sbol_dictionary.initial_fetch()
+        self.assertEqual(1, self.mock_spreadsheet_accessor.get_tabs_data.call_count)
+        self.assertEqual(2, len(self.sbol_dictionary.get_tab_sheet('Attribute')))
+
+if __name__ == "__main__":
+    unittest.main()
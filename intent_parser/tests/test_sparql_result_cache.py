@@ -0,0 +1,39 @@
+from intent_parser.accessor.sparql_result_cache import SparqlResultCache
+from unittest.mock import patch
+import unittest
+
+class SparqlResultCacheTest(unittest.TestCase):
+
+    def test_evict_least_recently_used(self):
+        cache = SparqlResultCache(2, 60)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(1, cache.get('a'))
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(3, cache.get('c'))
+
+    @patch('intent_parser.accessor.sparql_result_cache.time.monotonic')
+    def test_expire_entries(self, mock_monotonic):
+        cache = SparqlResultCache(2, 60)
+        mock_monotonic.return_value = 100
+        cache.put('a', 1)
+        mock_monotonic.return_value = 159
+        self.assertEqual(1, cache.get('a'))
+        mock_monotonic.return_value = 160
+        self.assertIsNone(cache.get('a'))
+
+    def test_invalidate_drops_stale_responses(self):
+        cache = SparqlResultCache(2, 60)
+        cache.put('a', 1)
+        generation = cache.get_generation()
+        cache.invalidate()
+        self.assertIsNone(cache.get('a'))
+        cache.put('b', 2, generation=generation)
+        self.assertIsNone(cache.get('b'))
+        cache.put('b', 2, generation=cache.get_generation())
+        self.assertEqual(2, cache.get('b'))
+
+if __name__ == "__main__":
+    unittest.main()
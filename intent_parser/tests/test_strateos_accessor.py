@@ -0,0 +1,50 @@
+from intent_parser.intent_parser_exceptions import IntentParserException
+from intent_parser.protocols.labs.strateos_accessor import StrateosAccessor
+from unittest.mock import patch
+import unittest
+
+class StrateosAccessorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.protocols = [{'id': 'pr1', 'name': 'Growth Curve', 'inputs': {'a': 1}},
+                          {'id': 'pr2', 'name': 'Obstacle Course', 'inputs': {'b': 2}}]
+        connection_patcher = patch('intent_parser.protocols.labs.strateos_accessor.Connection')
+        self.mock_connection = connection_patcher.start()
+        self.addCleanup(connection_patcher.stop)
+        self.mock_connection.from_default_config.return_value.get_protocols.side_effect = lambda: [dict(protocol) for protocol in self.protocols]
+
+        convert_patcher = patch.object(StrateosAccessor, '_convert_protocol_to_opil', side_effect=lambda protocol: object())
+        self.mock_convert = convert_patcher.start()
+        self.addCleanup(convert_patcher.stop)
+
+        self.strateos_accessor = StrateosAccessor()
+        self.strateos_accessor._fetch_protocols()
+
+    def test_reuse_converted_protocol(self):
+        template = self.strateos_accessor.get_experimental_protocol('Growth Curve')
+        self.assertIs(template, self.strateos_accessor.get_experimental_protocol('Growth Curve'))
+        self.assertEqual(1, self.mock_convert.call_count)
+
+    def test_unchanged_protocol_survives_sync(self):
+        template = self.strateos_accessor.get_experimental_protocol('Growth Curve')
+        self.strateos_accessor._fetch_protocols()
+        self.assertIs(template, self.strateos_accessor.get_experimental_protocol('Growth Curve'))
+
+    def test_changed_protocol_is_converted_again(self):
+        template = self.strateos_accessor.get_experimental_protocol('Growth Curve')
+        self.protocols[0]['inputs'] = {'a': 3}
+        self.strateos_accessor._fetch_protocols()
+        self.assertIsNot(template, self.strateos_accessor.get_experimental_protocol('Growth Curve'))
+        self.assertEqual(2, self.mock_convert.call_count)
+
+    def test_removed_protocol_is_dropped(self):
+        self.strateos_accessor.get_experimental_protocol('Obstacle Course')
+        self.protocols.pop(1)
+        self.strateos_accessor._fetch_protocols()
+        self.assertEqual(['Growth Curve'], self.strateos_accessor.get_experimental_protocol_names())
+        with self.assertRaises(IntentParserException):
+            self.strateos_accessor.get_experimental_protocol('Obstacle Course')
+        self.assertEqual({}, self.strateos_accessor._id_to_template)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ from collections import namedtuple as _namedtuple
 from intent_parser.intent_parser_exceptions import IntentParserException, RequestErrorException
 from difflib import Match
 from http import HTTPStatus
+import bisect
 import json
 import Levenshtein
 import opil
@@ -92,19 +93,53 @@ def cull_overlapping(search_results):
     """
     Find any results that overlap and take the one with the largest term.
     """
+    paragraph_offsets = _sort_results_by_paragraph(search_results)
     new_results = []
     ignore_idx = set()
     for idx in range(0, len(search_results)):
-        overlaps, max_idx, overlap_idx = find_overlaps(idx, search_results)
+        candidate_idx = _find_overlap_candidates(idx, search_results, paragraph_offsets)
+        overlaps, max_idx, overlap_idx = find_overlaps(idx, search_results, candidate_idx=candidate_idx)
         if len(overlaps) > 1:
             if max_idx not in ignore_idx:
                 new_results.append(search_results[max_idx])
-            ignore_idx = ignore_idx.union(overlap_idx)
+            ignore_idx.update(overlap_idx)
         else:
             if idx not in ignore_idx:
                 new_results.append(search_results[idx])
     return new_results
 
+def _sort_results_by_paragraph(search_results):
+    """
+    Sort result indices by (paragraph, offset).
+    Returns a map of paragraph index to a tuple of (sorted offsets, result indices in the same order, longest result span).
+    """
+    sorted_idx = sorted(range(len(search_results)),
+                        key=lambda idx: (search_results[idx]['paragraph_index'], search_results[idx]['offset']))
+    paragraph_offsets = {}
+    for idx in sorted_idx:
+        result = search_results[idx]
+        if result['paragraph_index'] not in paragraph_offsets:
+            paragraph_offsets[result['paragraph_index']] = ([], [], 0)
+        offsets, result_idx, max_span = paragraph_offsets[result['paragraph_index']]
+        offsets.append(result['offset'])
+        result_idx.append(idx)
+        span = result['end_offset'] - result['offset']
+        if span > max_span:
+            paragraph_offsets[result['paragraph_index']] = (offsets, result_idx, span)
+    return paragraph_offsets
+
+def _find_overlap_candidates(start_idx, search_results, paragraph_offsets):
+    """
+    Return indices after start_idx, in increasing order, of results in the same paragraph that may overlap it.
+    A result overlapping the query has to start before the query ends and within the paragraph's longest span before
+    the query starts, so only that window of the sorted offsets is swept.
+    """
+    query = search_results[start_idx]
+    offsets, result_idx, max_span = paragraph_offsets[query['paragraph_index']]
+    window_start = bisect.bisect_right(offsets, query['offset'] - max_span)
+    window_end = bisect.bisect_left(offsets, query['end_offset'])
+    return sorted(idx for idx in result_idx[window_start:window_end] if idx > start_idx)
+
 def get_document_id_from_json_body(json_body):
     if 'documentId' not in json_body:
         raise RequestErrorException(HTTPStatus.BAD_REQUEST, errors=['Missing documentId'])
@@ -133,6 +168,24 @@ def analyze_term(entry):
     partial_match_thresh = entry[4]
     uri = entry[5]
     results = find_text(term, start_offset, paragraphs, partial_match_min_size, partial_match_thresh)
+    return _to_search_results(term, uri, results)
+
+def analyze_terms(dictionary_terms, start_offset, paragraphs, partial_match_min_size, partial_match_thresh):
+    """
+    Search the document for every term in dictionary_terms, a map of term to uri.
+    Returns the same search results as calling analyze_term on each term in turn.
+    The document's text runs are collected and indexed once, but find_common_substrings still runs for each term on
+    the text runs that share an n-gram with it.
+    The add-on's analyze requests find exact dictionary terms with the AnalyzeDocumentController instead.
+    """
+    text_index = TextMatchIndex(get_text_runs(start_offset, paragraphs))
+    search_results = []
+    for term, uri in dictionary_terms.items():
+        results = text_index.find_text(term, partial_match_min_size, partial_match_thresh)
+        search_results.extend(_to_search_results(term, uri, results))
+    return search_results
+
+def _to_search_results(term, uri, results):
     search_results = []
     for result in results:
         search_results.append(
@@ -212,6 +265,16 @@ def find_text(text, abs_start_offset, paragraphs, partial_match_min_size, partia
     Search through the whole document and return a collection of matches, including partial, to the search term.
     """
     results = []
+    for text_run in get_text_runs(abs_start_offset, paragraphs):
+        results.extend(find_text_in_run(text, text_run, partial_match_min_size, partial_match_thresh))
+    return results
+
+def get_text_runs(abs_start_offset, paragraphs):
+    """
+    Collect the searchable text runs of a document, trimmed to start after abs_start_offset.
+    Each text run is a tuple of (paragraph_index, content, offset of content within its paragraph, link).
+    """
+    text_runs = []
     for paragraph_index in range( len(paragraphs )):
         paragraph = paragraphs[ paragraph_index ]
         elements = paragraph['elements']
@@ -236,48 +299,115 @@ def find_text(text, abs_start_offset, paragraphs, partial_match_min_size, partia
             if start_offset > 0:
                 content = content[start_offset:]
 
-            matches = find_common_substrings(content.lower(), text.lower(), partial_match_min_size, partial_match_thresh)
-            for match in matches:
-                # Need to exceed partial match threshold - content word length
-                if match.size < int(match.content_word_length * partial_match_thresh):
-                    continue
+            first_index = elements[0]['startIndex']
+            paragraph_offset = (start_index + start_offset) - first_index
+
+            link = None
+
+            if 'textStyle' in text_run:
+                text_style = text_run['textStyle']
+                if 'link' in text_style:
+                    link = text_style['link']
+                    if 'url' in link:
+                        link = link['url']
+
+            text_runs.append((paragraph_index, content, paragraph_offset, link))
+    return text_runs
 
-                # Need to exceed partial match threshold - dictionary term length
-                if match.size < int(len(text) * partial_match_thresh):
-                    continue
+def find_text_in_run(text, text_run, partial_match_min_size, partial_match_thresh, lower_content=None, lower_text=None):
+    """
+    Return all matches, including partial, of a search term within a single text run from get_text_runs.
+    """
+    paragraph_index, content, paragraph_offset, link = text_run
+    if lower_content is None:
+        lower_content = content.lower()
+    if lower_text is None:
+        lower_text = text.lower()
 
-                offset = match.a
+    results = []
+    matches = find_common_substrings(lower_content, lower_text, partial_match_min_size, partial_match_thresh)
+    for match in matches:
+        # Need to exceed partial match threshold - content word length
+        if match.size < int(match.content_word_length * partial_match_thresh):
+            continue
 
-                # Require whitespace before found text
-                if offset > 0 and content[offset-1].isalpha():
-                    continue
+        # Need to exceed partial match threshold - dictionary term length
+        if match.size < int(len(text) * partial_match_thresh):
+            continue
 
-                # Require whitespace after found text
-                next_offset = offset + match.size
-                if next_offset < len(content) and content[next_offset].isalpha():
-                    continue
+        offset = match.a
 
-                content_text = content[offset:(offset + match.size)]
+        # Require whitespace before found text
+        if offset > 0 and content[offset-1].isalpha():
+            continue
 
-                first_index = elements[0]['startIndex']
-                offset += (start_index + start_offset) - first_index
+        # Require whitespace after found text
+        next_offset = offset + match.size
+        if next_offset < len(content) and content[next_offset].isalpha():
+            continue
 
-                link = None
+        content_text = content[offset:(offset + match.size)]
 
-                if 'textStyle' in text_run:
-                    text_style = text_run['textStyle']
-                    if 'link' in text_style:
-                        link = text_style['link']
-                        if 'url' in link:
-                            link = link['url']
+        offset += paragraph_offset
 
-                # If the text is linked, we must have an exact match, otherwise ignore
-                if link is not None and (not match.size == len(content) or not match.size == len(text)):
-                    continue
+        # If the text is linked, we must have an exact match, otherwise ignore
+        if link is not None and (not match.size == len(content) or not match.size == len(text)):
+            continue
 
-                results.append((paragraph_index, offset, offset + match.size - 1, link, content_text))
+        results.append((paragraph_index, offset, offset + match.size - 1, link, content_text))
     return results
 
+class TextMatchIndex(object):
+    """
+    Index of a document's text runs by their character n-grams.
+
+    Once the smallest accepted match for a term is at least NGRAM_SIZE characters long, any partial match
+    has to share an n-gram with the term, so only the text runs posted under the term's n-grams are scanned.
+    """
+
+    NGRAM_SIZE = 3
+
+    def __init__(self, text_runs):
+        self.text_runs = text_runs
+        self.lower_contents = [text_run[1].lower() for text_run in text_runs]
+        self.postings = {}
+        for run_index, content in enumerate(self.lower_contents):
+            for ngram in _get_ngrams(content, self.NGRAM_SIZE):
+                self.postings.setdefault(ngram, []).append(run_index)
+
+    def find_text(self, text, partial_match_min_size, partial_match_thresh):
+        """
+        Return the same matches as find_text over the indexed text runs.
+        """
+        lower_text = text.lower()
+        results = []
+        for run_index in self._get_candidate_runs(text, lower_text, partial_match_min_size, partial_match_thresh):
+            results.extend(find_text_in_run(text,
+                                            self.text_runs[run_index],
+                                            partial_match_min_size,
+                                            partial_match_thresh,
+                                            lower_content=self.lower_contents[run_index],
+                                            lower_text=lower_text))
+        return results
+
+    def _get_candidate_runs(self, text, lower_text, partial_match_min_size, partial_match_thresh):
+        len_term = len(lower_text)
+        if len_term <= partial_match_min_size:
+            min_match_size = len_term
+        else:
+            min_match_size = int(len_term * partial_match_thresh)
+        min_match_size = max(min_match_size, int(len(text) * partial_match_thresh))
+        if min_match_size < self.NGRAM_SIZE:
+            return range(len(self.text_runs))
+
+        run_indices = set()
+        for ngram in _get_ngrams(lower_text, self.NGRAM_SIZE):
+            run_indices.update(self.postings.get(ngram, []))
+        return sorted(run_indices)
+
+def _get_ngrams(text, size):
+    return {text[index:index + size] for index in range(len(text) - size + 1)}
+
 def find_common_substrings(content, dict_term, partial_match_min_size, partial_match_thresh):
     """
     Scan dict_term finding any common substrings from dict_term.  For each possible common substring, only the first one is found.
@@ -339,18 +469,29 @@ def find_common_substrings(content, dict_term, partial_match_min_size, partial_m
     return results_mod
 
 
-def find_overlaps(start_idx, search_results, ignore_idx=set()):
+def find_overlaps(start_idx, search_results, ignore_idx=set(), candidate_idx=None):
     """
     Given a start index, find any entries in the results that overlap with the result at the start index
     In the case where the amount of overlap is equal, we pick the one that has the lowest Levenshtein (edit) distance between the matched text and the dictionary term.
+    Only the indices in candidate_idx are checked when given, otherwise every result after the start index is.
+    Edit distances are only computed for results that win the comparison.
     """
+    edit_distances = {}
+    def get_edit_distance(idx):
+        if idx not in edit_distances:
+            result = search_results[idx]
+            edit_distances[idx] = Levenshtein.distance(result['term'], result['text'])
+        return edit_distances[idx]
+
+    if candidate_idx is None:
+        candidate_idx = range(start_idx + 1, len(search_results))
+
     query = search_results[start_idx]
     overlaps = [query]
     overlap_idx = [start_idx]
     best_overlap_idx = start_idx
     best_overlap_len = query['end_offset'] - query['offset']
-    best_edit_dist = Levenshtein.distance(query['term'], query['text'])
-    for idx in range(start_idx + 1, len(search_results)):
+    for idx in candidate_idx:
 
         if idx in ignore_idx:
             continue
@@ -362,11 +503,9 @@ def find_overlaps(start_idx, search_results, ignore_idx=set()):
         if overlap:
             overlaps.append(comp)
             overlap_idx.append(idx)
-            dist = Levenshtein.distance(comp['term'], comp['text'])
             overlap_amount = comp['end_offset'] - comp['offset']
-            if overlap_amount >= best_overlap_len or (overlap_amount == best_overlap_len and dist < best_edit_dist):
+            if overlap_amount >= best_overlap_len or (overlap_amount == best_overlap_len and get_edit_distance(idx) < get_edit_distance(start_idx)):
                 best_overlap_idx = idx
-                best_overlap_len = dist
+                best_overlap_len = get_edit_distance(idx)
 
     return overlaps, best_overlap_idx, overlap_idx
-
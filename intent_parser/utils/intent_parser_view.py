@@ -94,7 +94,7 @@ def create_experimental_protocol_dialog(cursor_index, lab_names, aquarium_protoc
 
 def create_measurement_table_dialog(cursor_child_index):
     catalog_accessor = CatalogAccessor()
-    local_file_types = catalog_accessor.get_file_types().copy()
+    local_file_types = list(catalog_accessor.get_file_types())
     local_file_types.insert(0, '---------------')
     local_file_types.insert(0, 'CSV')
     local_file_types.insert(0, 'PLAIN')